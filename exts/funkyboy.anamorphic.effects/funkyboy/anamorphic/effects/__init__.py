@@ -1 +1,2 @@
-from .extension import *
+# The extension class is loaded by Kit from funkyboy.anamorphic.effects.extension (see
+# config/extension.toml), so importing the package or core doesn't pull in omni.ext or the UI.
@@ -0,0 +1,65 @@
+__all__ = ["Look", "ABCompare"]
+
+from typing import Any, Dict, Optional, Tuple
+
+from .settings_writer import _same_value
+from .snapshot import MANAGED_SETTINGS
+
+
+class Look:
+    """Everything the extension sets, compactly: the values of MANAGED_SETTINGS
+    in order, plus the aspect ratio and its resolution policy"""
+
+    __slots__ = ("values", "ratio", "policy")
+
+    def __init__(self, values: Tuple[Any, ...], ratio: float, policy: Optional[str] = None):
+        self.values = values
+        self.ratio = ratio
+        self.policy = policy
+
+    def changes_to(self, other: "Look") -> Dict[str, Any]:
+        """{settings path: value} of the settings other differs in"""
+        return {
+            path: new
+            for path, old, new in zip(MANAGED_SETTINGS, self.values, other.values)
+            if new is not None and not _same_value(old, new)
+        }
+
+    def same_aspect(self, other: "Look") -> bool:
+        return _same_value(self.ratio, other.ratio) and self.policy == other.policy
+
+
+class ABCompare:
+    """Two looks to flip between.
+
+    flip() stores the current look in the active slot, so edits made while on
+    A or B are kept, and switches to the other one. The first flip starts B as
+    a copy of A.
+    """
+
+    SLOTS = ("A", "B")
+
+    def __init__(self):
+        self._looks = [None, None]
+        self._active = 0
+        self.flips = 0
+
+    @property
+    def active(self) -> str:
+        return self.SLOTS[self._active]
+
+    def look(self, slot: str) -> Optional[Look]:
+        return self._looks[self.SLOTS.index(slot)]
+
+    def clear(self):
+        self._looks = [None, None]
+        self._active = 0
+
+    def flip(self, current: Look) -> Look:
+        """Store current in the active slot and return the look of the other one, now active."""
+        self._looks[self._active] = current
+        self._active = 1 - self._active
+        if self._looks[self._active] is None:
+            self._looks[self._active] = current
+        self.flips += 1
+        return self._looks[self._active]
@@ -0,0 +1,271 @@
+__all__ = ["ASPECT_MODES", "AspectController", "get_aspect_controller", "release_aspect_controller"]
+
+import weakref
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+import carb.settings
+
+from .deferred_resolution import get_deferred_resolution
+from .presets import PresetRegistry
+from .resolution_planner import POLICIES, plan_resolution
+from .resources import Subscription
+from .viewport_cache import get_viewport_cache
+
+if TYPE_CHECKING:
+    from .matte_overlay import MatteOverlay
+
+ASPECT_MODE_SETTING = "/exts/funkyboy.anamorphic.effects/aspectMode"
+RESOLUTION_POLICY_SETTING = "/exts/funkyboy.anamorphic.effects/resolutionPolicy"
+RESOLUTION_ALIGN_SETTING = "/exts/funkyboy.anamorphic.effects/resolutionAlign"
+PIXEL_BUDGET_SETTING = "/exts/funkyboy.anamorphic.effects/pixelBudget"
+ALL_VIEWPORTS_SETTING = "/exts/funkyboy.anamorphic.effects/allViewports"
+
+# resize: change the render resolution following RESOLUTION_POLICY_SETTING
+# matte:  keep the render resolution and draw letterbox/pillarbox bars over the viewport
+# crop:   keep the render width and take rows off the height, so fewer pixels are shaded
+ASPECT_MODES = ("resize", "matte", "crop")
+
+
+class AspectController:
+    """Applies an aspect ratio to the active viewport, or to every viewport
+    with ALL_VIEWPORTS_SETTING on, in the selected mode"""
+
+    def __init__(self):
+        # id(viewport_api) -> MatteOverlay
+        self._mattes: Dict[int, "MatteOverlay"] = {}
+        # id(viewport_api) -> the full-frame resolution every ratio is planned from,
+        # captured on first use. Planning from the current size instead would shrink
+        # the frame a bit more with each preset in the fitting policies.
+        self._bases: Dict[int, Tuple[int, int]] = {}
+        # id(viewport_api) -> view change subscription that drops the base once the
+        # viewport was resized by something other than this controller
+        self._base_subs: Dict[int, Subscription] = {}
+        # Render scale set by the frame governor, applied on top of the base
+        self._scale = 1.0
+        # The last (viewport_window, ratio, policy) applied, so a new scale can be re-applied
+        self._last = None
+        self._restored_fns: List[Callable[[], None]] = []
+
+    def destroy(self):
+        self._hide_mattes()
+        self._drop_bases()
+        self._last = None
+        self._restored_fns = []
+
+    @property
+    def mode(self) -> str:
+        mode = carb.settings.get_settings().get(ASPECT_MODE_SETTING)
+        return mode if mode in ASPECT_MODES else "resize"
+
+    @property
+    def all_viewports(self) -> bool:
+        return bool(carb.settings.get_settings().get(ALL_VIEWPORTS_SETTING))
+
+    @all_viewports.setter
+    def all_viewports(self, value: bool):
+        carb.settings.get_settings().set(ALL_VIEWPORTS_SETTING, bool(value))
+
+    def viewport_windows(self, viewport_window) -> List:
+        """The viewport windows an aspect change on viewport_window goes to"""
+        if not self.all_viewports:
+            return [viewport_window]
+        from omni.kit.viewport.window import get_viewport_window_instances
+
+        windows = [window for window in get_viewport_window_instances() if window.viewport_api is not None]
+        if viewport_window not in windows:
+            windows.insert(0, viewport_window)
+        return windows
+
+    def set_mode(self, mode: str, viewport_window=None, ratio: Optional[float] = None):
+        """Switch mode for this session and re-apply ratio, if given, in the new mode."""
+        if mode not in ASPECT_MODES:
+            raise ValueError(f"Unknown aspect mode '{mode}', expected one of {ASPECT_MODES}")
+        previous = self.mode
+        carb.settings.get_settings().set(ASPECT_MODE_SETTING, mode)
+        if mode != "matte":
+            self._hide_mattes()
+        if mode == "matte" and previous != "matte" and viewport_window is not None:
+            # The matte goes over the full frame
+            requests = []
+            for window in self.viewport_windows(viewport_window):
+                base = self._bases.get(id(window.viewport_api))
+                if base is not None:
+                    requests.append((window.viewport_api, base))
+            get_deferred_resolution().request_all(requests)
+        if viewport_window is not None and ratio:
+            self.apply(viewport_window, ratio)
+
+    def target_resolution(
+        self, viewport_api, ratio: float, mode: Optional[str] = None, policy: Optional[str] = None
+    ) -> Tuple[int, int]:
+        """The render resolution ratio maps to; unchanged in matte mode.
+
+        policy overrides RESOLUTION_POLICY_SETTING in resize mode.
+        """
+        mode = mode or self.mode
+        if mode == "matte" and self._scale == 1.0:
+            return get_viewport_cache().state(viewport_api).texture_resolution
+        base_width, base_height = self._scaled_base(viewport_api)
+        settings = carb.settings.get_settings()
+        align = settings.get_as_int(RESOLUTION_ALIGN_SETTING) or 1
+        if mode == "matte":
+            # The bars keep the ratio, only the full frame is scaled
+            return plan_resolution(base_width, base_height, base_width / base_height, "fit", align)
+
+        budget = settings.get_as_int(PIXEL_BUDGET_SETTING)
+        return plan_resolution(base_width, base_height, float(ratio), self._policy(mode, policy), align, budget)
+
+    def preset_resolutions(self, viewport_api, registry: PresetRegistry) -> Tuple[Tuple[int, int], ...]:
+        """What each preset of registry resizes viewport_api to in resize or crop mode.
+
+        The registry keeps the planned table for the current base size, so
+        asking again is free until the viewport or the settings change.
+        """
+        mode = self.mode
+        base_width, base_height = self._scaled_base(viewport_api)
+        settings = carb.settings.get_settings()
+        align = settings.get_as_int(RESOLUTION_ALIGN_SETTING) or 1
+        budget = settings.get_as_int(PIXEL_BUDGET_SETTING)
+        return registry.resolutions(
+            base_width, base_height, self._policy(mode), align, budget, preset_policies=mode != "crop"
+        )
+
+    def apply(self, viewport_window, ratio: float, policy: Optional[str] = None) -> Tuple[int, int]:
+        """Apply ratio and return the resulting render resolution of viewport_window.
+
+        With ALL_VIEWPORTS_SETTING on every viewport gets the ratio, each planned
+        from its own full frame, and the resizes are committed together.
+        """
+        mode = self.mode
+        self._last = (viewport_window, ratio, policy)
+        requests = []
+        result = None
+        for window in self.viewport_windows(viewport_window):
+            viewport_api = window.viewport_api
+            resolution = self.target_resolution(viewport_api, ratio, mode, policy)
+            if window is viewport_window:
+                result = resolution
+            if mode == "matte":
+                self._matte(viewport_api).show(window, ratio)
+                if self._scale == 1.0:
+                    continue
+            requests.append((viewport_api, resolution))
+        if mode != "matte":
+            self._hide_mattes()
+        get_deferred_resolution().request_all(requests)
+        return result
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """The ratio last applied, None before the first or after clear()"""
+        return self._last[1] if self._last is not None else None
+
+    def state(self) -> Tuple[str, Optional[float], Optional[str]]:
+        """(mode, ratio, policy), what restore() needs to bring the aspect back"""
+        policy = self._last[2] if self._last is not None else None
+        return self.mode, self.ratio, policy
+
+    def restore(self, state: Tuple[str, Optional[float], Optional[str]]):
+        """Go back to a state() taken earlier, e.g. on undo, and tell the subscribers.
+
+        The ratio goes to the viewport window it was last applied to, the
+        active one if there is none yet.
+        """
+        mode, ratio, policy = state
+        viewport_window = self._last[0] if self._last is not None else None
+        if viewport_window is None and ratio:
+            from omni.kit.viewport.window import ViewportWindow
+
+            viewport_window = ViewportWindow.active_window
+        self.set_mode(mode, viewport_window)
+        if ratio and viewport_window is not None:
+            self.apply(viewport_window, ratio, policy)
+        elif not ratio:
+            self._hide_mattes()
+            self._last = None
+        for fn in list(self._restored_fns):
+            fn()
+
+    def subscribe_restored(self, fn: Callable[[], None]) -> Subscription:
+        """Call fn after restore(); unsubscribe() the result to stop."""
+        return Subscription(self._restored_fns, fn)
+
+    @property
+    def render_scale(self) -> float:
+        return self._scale
+
+    def set_render_scale(self, scale: float):
+        """Scale the render resolution, keeping the applied ratio. Used by the frame governor."""
+        if scale == self._scale:
+            return
+        self._scale = scale
+        if self._last is not None:
+            self.apply(*self._last)
+
+    def clear(self):
+        """Remove the mattes and drop pending resizes; called when the effect is turned off."""
+        self._hide_mattes()
+        self._drop_bases()
+        self._last = None
+        get_deferred_resolution().cancel()
+
+    def _scaled_base(self, viewport_api) -> Tuple[int, int]:
+        key = id(viewport_api)
+        base = self._bases.get(key)
+        if base is None:
+            state = get_viewport_cache().state(viewport_api)
+            base = self._bases[key] = state.texture_resolution
+            if key in self._base_subs:
+                self._base_subs[key].unsubscribe()
+            state_ref = weakref.ref(state)
+            self._base_subs[key] = state.subscribe_invalidated(lambda: self._on_view_changed(key, state_ref()))
+        return max(1, int(base[0] * self._scale)), max(1, int(base[1] * self._scale))
+
+    def _on_view_changed(self, key: int, state):
+        # The resizes this controller makes come back as view changes too, those keep the base
+        if state is None or state.resolution != state.applied_resolution:
+            self._bases.pop(key, None)
+
+    def _drop_bases(self):
+        for subscription in self._base_subs.values():
+            subscription.unsubscribe()
+        self._base_subs = {}
+        self._bases = {}
+
+    def _policy(self, mode: str, policy: Optional[str] = None) -> str:
+        # Crop only ever takes rows off the full frame
+        if mode == "crop":
+            return "crop"
+        policy = policy or carb.settings.get_settings().get(RESOLUTION_POLICY_SETTING)
+        return policy if policy in POLICIES else "width"
+
+    def _matte(self, viewport_api) -> "MatteOverlay":
+        matte = self._mattes.get(id(viewport_api))
+        if matte is None:
+            # Needs omni.ui, which headless users of the controller never load
+            from .matte_overlay import MatteOverlay
+
+            matte = self._mattes[id(viewport_api)] = MatteOverlay()
+        return matte
+
+    def _hide_mattes(self):
+        for matte in self._mattes.values():
+            matte.destroy()
+        self._mattes = {}
+
+
+_controller: Optional[AspectController] = None
+
+
+def get_aspect_controller() -> AspectController:
+    global _controller
+    if _controller is None:
+        _controller = AspectController()
+    return _controller
+
+
+def release_aspect_controller():
+    global _controller
+    if _controller is not None:
+        _controller.destroy()
+        _controller = None
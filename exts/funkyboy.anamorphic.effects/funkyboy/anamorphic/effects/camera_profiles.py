@@ -0,0 +1,189 @@
+__all__ = [
+    "ATTRIBUTE_PREFIX",
+    "read_camera_profile",
+    "write_camera_profile",
+    "CameraProfileCache",
+    "CameraProfileFollower",
+    "get_camera_profile_cache",
+    "release_camera_profile_cache",
+]
+
+from typing import Any, Callable, Dict, Optional
+
+import carb.settings
+from pxr import Sdf, Tf, Usd
+
+from .parameters import LENS_PARAMETERS
+from .profiles import LensProfile
+
+ENABLED_SETTING = "/exts/funkyboy.anamorphic.effects/cameraProfiles/enabled"
+# funkyboy:anamorphic:<parameter name> and funkyboy:anamorphic:ratio
+ATTRIBUTE_PREFIX = "funkyboy:anamorphic:"
+RATIO_ATTRIBUTE = ATTRIBUTE_PREFIX + "ratio"
+
+
+def _value_type(num_type: str):
+    return Sdf.ValueTypeNames.Int if num_type == "int" else Sdf.ValueTypeNames.Float
+
+
+def read_camera_profile(prim: Usd.Prim) -> Optional[LensProfile]:
+    """The lens profile authored on a camera prim, None if it has none"""
+    if not prim or not prim.IsValid():
+        return None
+    values = {}
+    for param in LENS_PARAMETERS:
+        attr = prim.GetAttribute(ATTRIBUTE_PREFIX + param.name)
+        if attr and attr.HasAuthoredValue():
+            values[param.path] = param.clamp(attr.Get())
+    ratio = None
+    attr = prim.GetAttribute(RATIO_ATTRIBUTE)
+    if attr and attr.HasAuthoredValue():
+        ratio = float(attr.Get()) or None
+    if not values and ratio is None:
+        return None
+    return LensProfile(prim.GetPath().pathString, values, ratio, prim.GetPath().pathString)
+
+
+def write_camera_profile(prim: Usd.Prim, values: Dict[str, Any], ratio: Optional[float] = None):
+    """Author values ({settings path: value} of lens parameters) and ratio on prim as custom attributes."""
+    with Sdf.ChangeBlock():
+        for param in LENS_PARAMETERS:
+            if param.path not in values:
+                continue
+            name = ATTRIBUTE_PREFIX + param.name
+            attr = prim.GetAttribute(name) or prim.CreateAttribute(name, _value_type(param.num_type), custom=True)
+            attr.Set(param.clamp(values[param.path]))
+        if ratio:
+            attr = prim.GetAttribute(RATIO_ATTRIBUTE) or prim.CreateAttribute(
+                RATIO_ATTRIBUTE, Sdf.ValueTypeNames.Float, custom=True
+            )
+            attr.Set(float(ratio))
+
+
+class CameraProfileCache:
+    """Camera profiles by prim path, read from the stage once.
+
+    Entries are dropped by Usd.Notice.ObjectsChanged: prim resyncs drop the
+    prim and everything below it, while property resyncs and value changes
+    only matter for our own attributes, so moving or animating a camera
+    doesn't evict its profile.
+    """
+
+    def __init__(self):
+        self._stage: Optional[Usd.Stage] = None
+        self._notice = None
+        # prim path -> profile, None cached for cameras without one
+        self._profiles: Dict[str, Optional[LensProfile]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def destroy(self):
+        self._set_stage(None)
+
+    def profile(self, stage: Usd.Stage, path: str) -> Optional[LensProfile]:
+        # Compared by value, the same stage comes back in a new wrapper on every query
+        if stage != self._stage:
+            self._set_stage(stage)
+        if path in self._profiles:
+            self.hits += 1
+            return self._profiles[path]
+        self.misses += 1
+        profile = self._profiles[path] = read_camera_profile(stage.GetPrimAtPath(path)) if stage else None
+        return profile
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop the entry of path and its descendants, or all entries."""
+        if path is None or path == "/":
+            self._profiles = {}
+            return
+        prefix = path + "/"
+        for key in [key for key in self._profiles if key == path or key.startswith(prefix)]:
+            del self._profiles[key]
+
+    def _set_stage(self, stage: Optional[Usd.Stage]):
+        if self._notice is not None:
+            self._notice.Revoke()
+            self._notice = None
+        self._stage = stage
+        self._profiles = {}
+        if stage is not None:
+            self._notice = Tf.Notice.Register(Usd.Notice.ObjectsChanged, self._on_objects_changed, stage)
+
+    def _on_objects_changed(self, notice, stage):
+        if stage != self._stage or not self._profiles:
+            return
+        for path in notice.GetResyncedPaths():
+            # Creating or removing an attribute resyncs just that property
+            if path.IsPropertyPath():
+                if path.name.startswith(ATTRIBUTE_PREFIX):
+                    self._profiles.pop(path.GetPrimPath().pathString, None)
+                continue
+            self.invalidate(path.pathString)
+        for path in notice.GetChangedInfoOnlyPaths():
+            if path.IsPropertyPath() and not path.name.startswith(ATTRIBUTE_PREFIX):
+                continue
+            self._profiles.pop(path.GetPrimPath().pathString, None)
+
+
+class CameraProfileFollower:
+    """Applies the active camera's profile whenever a viewport switches cameras.
+
+    apply_fn(profile) does the writing; with the settings batch it is given
+    only the keys that differ from the current values reach the renderer.
+    """
+
+    def __init__(self, apply_fn: Callable[[LensProfile], None]):
+        self._apply_fn = apply_fn
+        self._viewport_api = None
+        self._view_sub = None
+        self._camera_path: Optional[str] = None
+        self.applied = 0
+
+    def destroy(self):
+        self.stop()
+        self._apply_fn = None
+
+    @property
+    def active(self) -> bool:
+        return self._view_sub is not None
+
+    def start(self, viewport_api):
+        self.stop()
+        if not carb.settings.get_settings().get(ENABLED_SETTING):
+            return
+        self._viewport_api = viewport_api
+        self._view_sub = viewport_api.subscribe_to_view_change(self._on_view_changed)
+        self._on_view_changed(viewport_api)
+
+    def stop(self):
+        self._view_sub = None
+        self._viewport_api = None
+        self._camera_path = None
+
+    def _on_view_changed(self, viewport_api):
+        # Fires for every camera move too; a path compare is all it costs then
+        path = str(viewport_api.camera_path)
+        if path == self._camera_path:
+            return
+        self._camera_path = path
+        profile = get_camera_profile_cache().profile(viewport_api.stage, path)
+        if profile is not None:
+            self.applied += 1
+            self._apply_fn(profile)
+
+
+_cache: Optional[CameraProfileCache] = None
+
+
+def get_camera_profile_cache() -> CameraProfileCache:
+    global _cache
+    if _cache is None:
+        _cache = CameraProfileCache()
+    return _cache
+
+
+def release_camera_profile_cache():
+    global _cache
+    if _cache is not None:
+        _cache.destroy()
+        _cache = None
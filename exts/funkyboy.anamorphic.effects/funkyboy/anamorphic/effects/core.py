@@ -0,0 +1,164 @@
+"""The anamorphic look without any UI.
+
+Everything here runs on carb.settings and, for aspect ratios, the viewport.
+Importing it loads neither omni.ui nor the window's style, so batch render
+scripts can use it directly, even without the extension enabled; the settings
+then start from the defaults in config/extension.toml:
+
+    from funkyboy.anamorphic.effects import core
+
+    core.enable()
+    core.apply_profile("Classic Scope")
+    core.set_aspect("cinemascope")
+    ...
+    core.disable()
+"""
+
+__all__ = [
+    "DEFAULT_LOOK",
+    "is_enabled",
+    "enable",
+    "disable",
+    "subscribe_enabled",
+    "apply_profile",
+    "set_aspect",
+]
+
+from typing import Callable, List, Optional, Tuple, Union
+
+import carb.settings
+
+from . import defaults, profiles
+from .aspect import get_aspect_controller
+from .frame_governor import ENABLED_SETTING as GOVERNOR_ENABLED_SETTING
+from .frame_governor import get_frame_governor, release_frame_governor
+from .presets import AspectPreset, get_preset_registry, parse_ratio
+from .profiles import LensProfile, get_profile_library
+from .resources import Subscription
+from .settings_writer import settings_batch
+from .snapshot import SettingsSnapshot, restore_snapshot, take_snapshot
+
+defaults.apply_defaults()
+
+# What turning the effect on writes
+DEFAULT_LOOK = {
+    "/rtx/post/dof/anisotropy": 0.5,
+    "/rtx/post/lensFlares/flareScale": 0.1,
+    "/rtx/post/lensFlares/enabled": True,
+    "/rtx/post/lensFlares/sensorAspectRatio": 1.5,
+    "/rtx/post/lensFlares/blades": 3,
+}
+
+# Renderer state from before enable(), restored by disable()
+_snapshot: Optional[SettingsSnapshot] = None
+_enabled_fns: List[Callable[[bool], None]] = []
+
+
+def _active_viewport_window():
+    try:
+        from omni.kit.viewport.window import ViewportWindow
+    except ImportError:
+        return None
+    return ViewportWindow.active_window
+
+
+def is_enabled() -> bool:
+    return _snapshot is not None
+
+
+def enable(*viewport_apis):
+    """Turn the look on with DEFAULT_LOOK.
+
+    The settings, and the resolution of viewport_apis (the active viewport if
+    none are given), are remembered for disable(). Enabling again keeps the
+    first snapshot. The frame governor, if its setting is on, runs until disable().
+    """
+    global _snapshot
+    turned_on = _snapshot is None
+    if turned_on:
+        if not viewport_apis:
+            viewport_window = _active_viewport_window()
+            viewport_apis = (viewport_window.viewport_api,) if viewport_window is not None else ()
+        _snapshot = take_snapshot(*viewport_apis)
+    with settings_batch() as batch:
+        batch.update(DEFAULT_LOOK)
+    if turned_on:
+        if carb.settings.get_settings().get(GOVERNOR_ENABLED_SETTING):
+            get_frame_governor(get_aspect_controller().set_render_scale).start()
+        _notify_enabled(True)
+
+
+def disable():
+    """Turn the look off, putting back what enable() found."""
+    global _snapshot
+    release_frame_governor()
+    controller = get_aspect_controller()
+    controller.clear()
+    # After clear(), so the full scale is not applied to a ratio on its way out
+    controller.set_render_scale(1.0)
+    if _snapshot is not None:
+        restore_snapshot(_snapshot)
+        _snapshot = None
+        _notify_enabled(False)
+    else:
+        with settings_batch() as batch:
+            batch.set("/rtx/post/dof/anisotropy", 0.0)
+            batch.set("/rtx/post/lensFlares/enabled", False)
+
+
+def subscribe_enabled(fn: Callable[[bool], None]) -> Subscription:
+    """Call fn(enabled) whenever enable() turns the look on or disable() turns it off,
+    including from undo and redo."""
+    return Subscription(_enabled_fns, fn)
+
+
+def _notify_enabled(enabled: bool):
+    for fn in list(_enabled_fns):
+        fn(enabled)
+
+
+def apply_profile(profile: Union[LensProfile, str], viewport_window=None, aspect: bool = True) -> LensProfile:
+    """Apply a lens profile, given as a LensProfile or a name from the profile library.
+
+    With aspect on, the profile's ratio, if it has one, goes to viewport_window
+    (the active one by default). Raises KeyError for an unknown name.
+    """
+    if isinstance(profile, str):
+        name = profile
+        profile = get_profile_library().get(name)
+        if profile is None:
+            raise KeyError(f"No lens profile named '{name}'")
+    profiles.apply_profile(profile)
+    if aspect and profile.ratio:
+        set_aspect(profile.ratio, viewport_window)
+    return profile
+
+
+def set_aspect(
+    aspect: Union[float, str, AspectPreset], viewport_window=None, policy: Optional[str] = None
+) -> Optional[Tuple[int, int]]:
+    """Apply an aspect ratio in the current aspect mode and return the new render resolution.
+
+    aspect is a ratio (2.39 or "2.39:1"), a preset id or an AspectPreset; a
+    preset brings its own resolution policy unless policy is given. Goes to
+    viewport_window, the active one by default; None if there is no viewport.
+    Raises ValueError for anything else.
+    """
+    if isinstance(aspect, str) and ":" not in aspect:
+        preset = get_preset_registry().get(aspect)
+        if preset is None:
+            try:
+                aspect = parse_ratio(aspect)
+            except ValueError:
+                raise ValueError(f"'{aspect}' is neither an aspect ratio nor a preset id") from None
+        else:
+            aspect = preset
+    if isinstance(aspect, AspectPreset):
+        ratio, policy = aspect.ratio, policy or aspect.policy
+    else:
+        ratio = parse_ratio(aspect)
+
+    viewport_window = viewport_window or _active_viewport_window()
+    if viewport_window is None:
+        return None
+    return get_aspect_controller().apply(viewport_window, ratio, policy)
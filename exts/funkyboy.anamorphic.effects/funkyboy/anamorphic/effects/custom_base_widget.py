@@ -12,7 +12,10 @@ from typing import Optional
 
 import omni.ui as ui
 
+from .interactive_lod import get_interactive_lod
+from .resources import ResourceRegistry
 from .style import ATTR_LABEL_WIDTH
+from .undo import get_undo_recorder
 
 
 class CustomBaseWidget:
@@ -23,11 +26,17 @@ class CustomBaseWidget:
         self.existing_model: Optional[ui.AbstractItemModel] = kwargs.pop("model", None)
         self.revert_img = None
         self.__attr_label: Optional[str] = kwargs.pop("label", "")
+        # Callbacks the widget adds to its models, released by destroy()
+        self._resources = ResourceRegistry()
         self.__frame = ui.Frame()
         with self.__frame:
             self._build_fn()
 
     def destroy(self):
+        self._resources.destroy()
+        if self.__frame is not None:
+            # Drops the mouse callbacks of the children, which hold on to self
+            self.__frame.destroy()
         self.existing_model = None
         self.revert_img = None
         self.__attr_label = None
@@ -39,6 +48,32 @@ class CustomBaseWidget:
         """
         return getattr(self.__frame, attr)
 
+    def _track_drag(self, widget: ui.Widget):
+        """Switch to the interactive LOD settings while widget is dragged with
+        the left mouse button, and record the whole drag as one undo entry.
+        """
+
+        def pressed(x, y, b, m):
+            if b == 0:
+                get_undo_recorder().begin()
+                get_interactive_lod().begin()
+
+        def released(x, y, b, m):
+            if b == 0:
+                get_interactive_lod().end()
+                get_undo_recorder().end()
+
+        widget.set_mouse_pressed_fn(pressed)
+        widget.set_mouse_released_fn(released)
+
+    def _track_edit(self, model: ui.AbstractValueModel):
+        """Record a value typed into a field of model, from begin to end of
+        the edit, as one undo entry.
+        """
+        undo = get_undo_recorder()
+        self._resources.add(model.subscribe_begin_edit_fn(lambda m: undo.begin()))
+        self._resources.add(model.subscribe_end_edit_fn(lambda m: undo.end()))
+
     def _build_head(self):
         """Build the left-most piece of the widget line (label in this case)"""
         ui.Label(
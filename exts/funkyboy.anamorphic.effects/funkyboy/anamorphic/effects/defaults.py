@@ -0,0 +1,70 @@
+"""The [settings] of config/extension.toml for users of core without the extension.
+
+Kit only loads them when the extension is enabled, so a script that imports
+core on its own would otherwise see unset settings and an unknown
+${funkyboy.anamorphic.effects} token.
+"""
+
+__all__ = ["EXTENSION_FOLDER", "extension_settings", "apply_defaults"]
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict
+
+import carb.settings
+import carb.tokens
+
+EXT_NAME = "funkyboy.anamorphic.effects"
+EXTENSION_FOLDER = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+_SETTING = re.compile(r'^exts\."funkyboy\.anamorphic\.effects"\.([\w.]+)\s*=\s*(.*)$')
+
+
+def _parse_value(text: str) -> Any:
+    # The file only uses the part of TOML that is also JSON, give or take trailing commas
+    return json.loads(re.sub(r",\s*\]", "]", text))
+
+
+@lru_cache(maxsize=1)
+def extension_settings() -> Dict[str, Any]:
+    """Settings path -> value, as config/extension.toml sets them.
+
+    Only reads one key per line, with arrays allowed to span lines.
+    """
+    with open(os.path.join(EXTENSION_FOLDER, "config", "extension.toml"), encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    values = {}
+    in_settings = False
+    key, text = None, ""
+    for line in lines:
+        line = line.strip()
+        if key is not None:
+            text += line
+        elif not line or line.startswith("#"):
+            continue
+        elif line.startswith("["):
+            in_settings = line == "[settings]"
+            continue
+        elif in_settings:
+            match = _SETTING.match(line)
+            if match is None:
+                continue
+            key, text = match.groups()
+        if key is not None and text.count("[") == text.count("]"):
+            values[f"/exts/{EXT_NAME}/{key.replace('.', '/')}"] = _parse_value(text)
+            key, text = None, ""
+    return values
+
+
+def apply_defaults():
+    """Make extension_settings() the defaults and point the extension's token here.
+
+    Neither replaces what Kit or the user already set, so this is a no-op with
+    the extension enabled.
+    """
+    carb.tokens.get_tokens_interface().set_initial_value(EXT_NAME, EXTENSION_FOLDER)
+    settings = carb.settings.get_settings()
+    for path, value in extension_settings().items():
+        settings.set_default(path, value)
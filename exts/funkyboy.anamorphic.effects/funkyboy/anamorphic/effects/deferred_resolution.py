@@ -0,0 +1,114 @@
+__all__ = ["DeferredResolution", "get_deferred_resolution", "release_deferred_resolution"]
+
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import carb.settings
+
+from .settings_writer import get_settings_writer
+from .viewport_cache import _as_int_resolution, get_viewport_cache
+
+ENABLED_SETTING = "/exts/funkyboy.anamorphic.effects/deferredResolution/enabled"
+IDLE_TIMEOUT_SETTING = "/exts/funkyboy.anamorphic.effects/deferredResolution/idleTimeout"
+
+
+class DeferredResolution:
+    """Holds back viewport resolution changes until the user lets go.
+
+    Every resolution change reallocates all render targets, so while a ratio
+    slider is dragged only the latest requested size per viewport is
+    remembered. All of them are applied in one pass by commit() (on mouse
+    release) or once no new request came in for IDLE_TIMEOUT_SETTING seconds.
+    With ENABLED_SETTING off, requests apply immediately.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        # id(viewport_api) -> (viewport_api, resolution)
+        self._pending: Dict[int, Tuple[object, Tuple[int, int]]] = {}
+        self._deadline = 0.0
+        self._update_sub = None
+        self.commits = 0
+        self.skipped = 0
+
+    def destroy(self):
+        self.commit()
+        self._update_sub = None
+
+    def pending(self, viewport_api) -> Optional[Tuple[int, int]]:
+        """The resolution waiting to be committed for viewport_api"""
+        entry = self._pending.get(id(viewport_api))
+        return entry[1] if entry is not None else None
+
+    def request(self, viewport_api, resolution):
+        """Ask for viewport_api to be resized to resolution."""
+        self.request_all(((viewport_api, resolution),))
+
+    def request_all(self, requests: Iterable[Tuple[object, Tuple[float, float]]]):
+        """Ask for several (viewport_api, resolution) changes, committed together."""
+        for viewport_api, resolution in requests:
+            self._pending[id(viewport_api)] = (viewport_api, _as_int_resolution(resolution))
+
+        settings = carb.settings.get_settings()
+        if not settings.get(ENABLED_SETTING):
+            self.commit()
+            return
+
+        self._deadline = self._clock() + settings.get_as_float(IDLE_TIMEOUT_SETTING)
+        if self._update_sub is None:
+            import omni.kit.app
+
+            self._update_sub = (
+                omni.kit.app.get_app()
+                .get_update_event_stream()
+                .create_subscription_to_pop(self._on_update, name="funkyboy.anamorphic.effects.deferred_resolution")
+            )
+
+    def cancel(self):
+        self._pending = {}
+        self._update_sub = None
+
+    def commit(self):
+        """Apply the pending resolutions, skipping viewports already at their size.
+
+        With the write scheduler on they are handed to the settings writer,
+        which applies them as the frame budget allows.
+        """
+        pending = self._pending
+        self.cancel()
+        cache = get_viewport_cache()
+        writer = get_settings_writer()
+        budgeted = writer.budgeted
+        for viewport_api, resolution in pending.values():
+            state = cache.state(viewport_api)
+            current = (budgeted and writer.pending_resolution(viewport_api)) or state.resolution
+            if current == resolution:
+                self.skipped += 1
+                continue
+            if budgeted:
+                writer.queue_resolution(viewport_api, resolution)
+            else:
+                state.set_resolution(resolution)
+            self.commits += 1
+
+    def _on_update(self, event):
+        if self._clock() >= self._deadline:
+            self.commit()
+
+
+_deferred: Optional[DeferredResolution] = None
+
+
+def get_deferred_resolution() -> DeferredResolution:
+    global _deferred
+    if _deferred is None:
+        _deferred = DeferredResolution()
+    return _deferred
+
+
+def release_deferred_resolution():
+    """Apply any pending resolution and drop the instance. Called on extension shutdown."""
+    global _deferred
+    if _deferred is not None:
+        _deferred.destroy()
+        _deferred = None
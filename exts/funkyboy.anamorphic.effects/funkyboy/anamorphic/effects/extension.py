@@ -1,28 +1,65 @@
 import omni.ext
-import omni.ui as ui
-from .window import AnamorphicEffectsWindow, WINDOW_TITLE
+import omni.kit.commands
+from .aspect import release_aspect_controller
+from .deferred_resolution import release_deferred_resolution
+from .frame_governor import release_frame_governor
+from .interactive_lod import release_interactive_lod
+from .presets import release_preset_registry
+from .profiles import release_profile_library, watch_profile_library
+from .settings_writer import release_settings_writer
+from . import undo
+from .undo import release_undo_recorder
+from .viewport_cache import release_viewport_cache
+
+WINDOW_TITLE = "Anamorphic Effects"
 
 class FunkyboyAnamorphicEffectsExtension(omni.ext.IExt):
     def on_startup(self, ext_id): 
+        # UI modules load here, not on import, so funkyboy.anamorphic.effects.core stays headless
+        import omni.kit.ui
+
         self._menu_path = f"Window/{WINDOW_TITLE}"
-        self._window = AnamorphicEffectsWindow(WINDOW_TITLE, self._menu_path)
+        # The window, its style and the viewport window module load on first menu open
+        self._window = None
         self._menu = omni.kit.ui.get_editor_menu().add_item(self._menu_path, self._on_menu_click, True)
+        omni.kit.commands.register_all_commands_in_module(undo)
+        # Profile files edited while Kit runs show up in the window
+        watch_profile_library()
 
 
     def on_shutdown(self):
+        import omni.kit.ui
+        from .camera_profiles import release_camera_profile_cache
+        from .settings_binding import release_settings_binding
+        from .tracks import release_track_player
+
         omni.kit.ui.get_editor_menu().remove_item(self._menu)
         if self._window is not None:
             self._window.destroy()
             self._window = None
+        omni.kit.commands.unregister_module_commands(undo)
+        release_undo_recorder()
+        release_frame_governor()
+        release_aspect_controller()
+        release_camera_profile_cache()
+        release_deferred_resolution()
+        release_interactive_lod()
+        release_preset_registry()
+        release_profile_library()
+        release_settings_binding()
+        release_track_player()
+        release_settings_writer()
+        release_viewport_cache()
 
 
     def _on_menu_click(self, menu, toggled):
         if toggled:
             if self._window is None:
+                from .window import AnamorphicEffectsWindow
+
                 self._window = AnamorphicEffectsWindow(WINDOW_TITLE, self._menu_path)
             else:
                 self._window.show()
         else:
             if self._window is not None:
                 self._window.hide()
-
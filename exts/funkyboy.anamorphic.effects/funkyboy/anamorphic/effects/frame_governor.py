@@ -0,0 +1,167 @@
+__all__ = ["FrameGovernor", "GovernorDecision", "ClockFrameTimer", "get_frame_governor", "release_frame_governor"]
+
+import time
+from collections import deque, namedtuple
+from typing import Callable, Optional
+
+import carb.settings
+
+GOVERNOR_SETTING = "/exts/funkyboy.anamorphic.effects/governor"
+ENABLED_SETTING = f"{GOVERNOR_SETTING}/enabled"
+
+# One resolution change made by the governor: the tick it happened on, the
+# average fps that triggered it and the new render scale
+GovernorDecision = namedtuple("GovernorDecision", ["frame", "fps", "scale"])
+
+
+class ClockFrameTimer:
+    """Frame time source measuring the time between two calls"""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._last: Optional[float] = None
+
+    def __call__(self) -> float:
+        now = self._clock()
+        last, self._last = self._last, now
+        return 0.0 if last is None else now - last
+
+
+class FrameGovernor:
+    """Scales the render resolution up or down to stay near a target fps.
+
+    Every tick() takes one frame time from frame_time_source. Once a full
+    window of samples is collected the average fps is compared against the
+    target; outside the hysteresis band the render scale moves by one step and
+    apply_fn(scale) is called. The window then starts over, so the next
+    decision only sees frames rendered at the new scale.
+    """
+
+    def __init__(
+        self,
+        apply_fn: Callable[[float], None],
+        target_fps: float = 24.0,
+        frame_time_source: Optional[Callable[[], float]] = None,
+        window: int = 30,
+        hysteresis: float = 0.15,
+        step: float = 0.1,
+        min_scale: float = 0.5,
+        max_scale: float = 1.0,
+        history: int = 64,
+    ):
+        self._apply_fn = apply_fn
+        self._source = frame_time_source or ClockFrameTimer()
+        self._samples = deque(maxlen=max(1, int(window)))
+        self._total = 0.0
+        self._frame = 0
+        self._update_sub = None
+        self.target_fps = target_fps
+        self.hysteresis = hysteresis
+        self.step = step
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.scale = max_scale
+        self.decisions = deque(maxlen=history)
+
+    def destroy(self):
+        self.stop()
+        self._apply_fn = None
+
+    @property
+    def running(self) -> bool:
+        return self._update_sub is not None
+
+    @property
+    def average_fps(self) -> Optional[float]:
+        """Average fps over the samples collected since the last decision"""
+        if not self._samples or self._total <= 0:
+            return None
+        return len(self._samples) / self._total
+
+    def start(self):
+        if self._update_sub is None:
+            # Loaded here, so headless imports of core don't need omni.kit.app
+            import omni.kit.app
+
+            self._update_sub = (
+                omni.kit.app.get_app()
+                .get_update_event_stream()
+                .create_subscription_to_pop(lambda _: self.tick(), name="funkyboy.anamorphic.effects.frame_governor")
+            )
+
+    def stop(self):
+        self._update_sub = None
+
+    def reset(self, scale: Optional[float] = None):
+        """Forget the collected samples and optionally jump to scale."""
+        self._samples.clear()
+        self._total = 0.0
+        if scale is not None:
+            self._set_scale(scale)
+
+    def tick(self) -> Optional[GovernorDecision]:
+        """Take one frame time sample; returns the decision if the scale changed."""
+        self._frame += 1
+        frame_time = self._source()
+        if frame_time <= 0:
+            return None
+
+        samples = self._samples
+        if len(samples) == samples.maxlen:
+            self._total -= samples[0]
+        samples.append(frame_time)
+        self._total += frame_time
+        if len(samples) < samples.maxlen:
+            return None
+
+        fps = len(samples) / self._total
+        scale = self.scale
+        if fps < self.target_fps * (1.0 - self.hysteresis) and scale > self.min_scale:
+            new_scale = max(self.min_scale, scale - self.step)
+        elif fps > self.target_fps * (1.0 + self.hysteresis) and scale < self.max_scale:
+            new_scale = min(self.max_scale, scale + self.step)
+            # Shading cost follows the pixel count, don't step up into a scale
+            # that would drop straight back below the target
+            if fps * (scale / new_scale) ** 2 < self.target_fps:
+                return None
+        else:
+            return None
+
+        decision = GovernorDecision(self._frame, fps, new_scale)
+        self.decisions.append(decision)
+        self.reset(new_scale)
+        return decision
+
+    def _set_scale(self, scale: float):
+        scale = min(self.max_scale, max(self.min_scale, scale))
+        if scale == self.scale:
+            return
+        self.scale = scale
+        if self._apply_fn is not None:
+            self._apply_fn(scale)
+
+
+_governor: Optional[FrameGovernor] = None
+
+
+def get_frame_governor(apply_fn: Optional[Callable[[float], None]] = None) -> FrameGovernor:
+    """The governor configured from GOVERNOR_SETTING; apply_fn is used on first call."""
+    global _governor
+    if _governor is None:
+        config = carb.settings.get_settings().get(GOVERNOR_SETTING) or {}
+        _governor = FrameGovernor(
+            apply_fn or (lambda scale: None),
+            target_fps=float(config.get("targetFps", 24.0)),
+            window=int(config.get("window", 30)),
+            hysteresis=float(config.get("hysteresis", 0.15)),
+            step=float(config.get("step", 0.1)),
+            min_scale=float(config.get("minScale", 0.5)),
+        )
+    return _governor
+
+
+def release_frame_governor():
+    global _governor
+    if _governor is not None:
+        _governor.destroy()
+        _governor = None
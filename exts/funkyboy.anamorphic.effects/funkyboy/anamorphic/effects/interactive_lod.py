@@ -0,0 +1,99 @@
+__all__ = ["InteractiveLod", "parse_overrides", "get_interactive_lod", "release_interactive_lod"]
+
+import json
+from typing import Any, Dict, Iterable, Optional
+
+import carb
+import carb.settings
+
+from .settings_writer import get_settings_writer, settings_batch
+
+ENABLED_SETTING = "/exts/funkyboy.anamorphic.effects/interactiveLod/enabled"
+OVERRIDES_SETTING = "/exts/funkyboy.anamorphic.effects/interactiveLod/overrides"
+
+
+def parse_overrides(entries: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """Turn ["/rtx/some/path=<json value>", ...] into {path: value}"""
+    overrides = {}
+    for entry in entries or ():
+        path, sep, raw = str(entry).partition("=")
+        path = path.strip()
+        if not sep or not path:
+            carb.log_warn(f"[funkyboy.anamorphic.effects] Ignoring interactive LOD entry '{entry}'")
+            continue
+        try:
+            overrides[path] = json.loads(raw)
+        except ValueError:
+            carb.log_warn(f"[funkyboy.anamorphic.effects] Bad value in interactive LOD entry '{entry}'")
+    return overrides
+
+
+class InteractiveLod:
+    """Lowers expensive render settings while a lens slider is dragged.
+
+    The degraded keys and their values come from OVERRIDES_SETTING. begin() and
+    end() nest, so the full quality values are only restored, in one batch,
+    when the last drag ends.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._restore: Optional[Dict[str, Any]] = None
+
+    def destroy(self):
+        if self._depth:
+            self._depth = 1
+            self.end()
+
+    @property
+    def active(self) -> bool:
+        return self._restore is not None
+
+    def begin(self):
+        self._depth += 1
+        if self._depth > 1:
+            return
+
+        settings = carb.settings.get_settings()
+        if not settings.get(ENABLED_SETTING):
+            return
+        overrides = parse_overrides(settings.get(OVERRIDES_SETTING))
+        # Keys the renderer doesn't know about couldn't be restored afterwards
+        restore = {path: settings.get(path) for path in overrides}
+        restore = {path: value for path, value in restore.items() if value is not None}
+        if not restore:
+            return
+        self._restore = restore
+        with settings_batch() as batch:
+            batch.update({path: overrides[path] for path in restore})
+
+    def end(self):
+        if not self._depth:
+            return
+        self._depth -= 1
+        if self._depth or self._restore is None:
+            return
+
+        restore, self._restore = self._restore, None
+        # Land the final slider value in the same frame as the full quality settings
+        get_settings_writer().flush()
+        with settings_batch() as batch:
+            batch.update(restore)
+
+
+_lod: Optional[InteractiveLod] = None
+
+
+def get_interactive_lod() -> InteractiveLod:
+    global _lod
+    if _lod is None:
+        _lod = InteractiveLod()
+    return _lod
+
+
+def release_interactive_lod():
+    """Restore full quality if a drag is still in progress. Called on extension shutdown."""
+    global _lod
+    if _lod is not None:
+        _lod.destroy()
+        _lod = None
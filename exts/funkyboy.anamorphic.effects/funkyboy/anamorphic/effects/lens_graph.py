@@ -0,0 +1,246 @@
+__all__ = [
+    "ParameterGraph",
+    "build_lens_graph",
+    "LensGraphDriver",
+]
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import carb.settings
+import omni.kit.app
+
+from .parameters import PARAMETERS_BY_NAME
+from .settings_writer import _same_value, settings_batch
+
+ENABLED_SETTING = "/exts/funkyboy.anamorphic.effects/lensGraph/enabled"
+SQUEEZE_SETTING = "/exts/funkyboy.anamorphic.effects/lensGraph/squeeze"
+
+# The values the derived settings are calibrated against: a 2x squeeze 50mm
+# lens at f/2.8 on a 2.39:1 frame gives the slider defaults
+REFERENCE_ASPECT = 2.39
+REFERENCE_FOCAL_LENGTH = 50.0
+REFERENCE_F_STOP = 2.8
+
+
+class _Node:
+    __slots__ = ("name", "inputs", "fn", "path")
+
+    def __init__(self, name: str, inputs: Tuple[str, ...], fn: Callable[..., Any], path: Optional[str]):
+        self.name = name
+        self.inputs = inputs
+        self.fn = fn
+        self.path = path
+
+
+class ParameterGraph:
+    """Values derived from source values, recomputed only where an input changed.
+
+    Sources are set from outside, derived nodes compute their value from
+    sources and earlier derived nodes. evaluate() walks the derived nodes in
+    the order they were added and recomputes a node only if one of its inputs
+    changed since the last evaluation; a node whose result comes out the same
+    doesn't count as changed for the nodes after it. With no changed source
+    evaluate() does nothing at all.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self._sources: Set[str] = set()
+        # Derived nodes in evaluation order, inputs always come first
+        self._nodes: List[_Node] = []
+        self._changed: Set[str] = set()
+        self.evaluations = 0
+
+    def add_source(self, name: str, value: Any = None):
+        if name in self._values:
+            raise ValueError(f"'{name}' is already in the graph")
+        self._sources.add(name)
+        self._values[name] = value
+        self._changed.add(name)
+
+    def add_derived(self, name: str, inputs: Sequence[str], fn: Callable[..., Any], path: Optional[str] = None):
+        """fn(*input values) computes name; path is the setting evaluate() reports it under."""
+        if name in self._values:
+            raise ValueError(f"'{name}' is already in the graph")
+        for input_name in inputs:
+            if input_name not in self._values:
+                raise ValueError(f"Input '{input_name}' of '{name}' must be added before it")
+        self._nodes.append(_Node(name, tuple(inputs), fn, path))
+        self._values[name] = None
+
+    def value(self, name: str) -> Any:
+        return self._values[name]
+
+    def set(self, name: str, value: Any) -> bool:
+        """Set a source; True if its value changed."""
+        if name not in self._sources:
+            raise KeyError(f"'{name}' is not a source")
+        if value is None or _same_value(self._values[name], value):
+            return False
+        self._values[name] = value
+        self._changed.add(name)
+        return True
+
+    def update(self, values: Dict[str, Any]) -> bool:
+        changed = False
+        for name, value in values.items():
+            changed = self.set(name, value) or changed
+        return changed
+
+    def invalidate(self):
+        """Recompute every node on the next evaluate()."""
+        self._changed.update(self._sources)
+        for node in self._nodes:
+            self._values[node.name] = None
+
+    def evaluate(self) -> Dict[str, Any]:
+        """Recompute the nodes downstream of changed sources.
+
+        Returns {path: value} of the derived values that changed and have a
+        path; nodes with a missing (None) input are skipped.
+        """
+        if not self._changed:
+            return {}
+        changed, self._changed = self._changed, set()
+        values = self._values
+        outputs = {}
+        for node in self._nodes:
+            if changed.isdisjoint(node.inputs):
+                continue
+            args = [values[input_name] for input_name in node.inputs]
+            if None in args:
+                continue
+            self.evaluations += 1
+            value = node.fn(*args)
+            if values[node.name] is not None and _same_value(values[node.name], value):
+                continue
+            values[node.name] = value
+            changed.add(node.name)
+            if node.path is not None:
+                outputs[node.path] = value
+        return outputs
+
+
+def _clamped(name: str, fn: Callable[..., float]) -> Callable[..., Any]:
+    param = PARAMETERS_BY_NAME[name]
+    return lambda *args: param.clamp(fn(*args))
+
+
+def _anisotropy(squeeze: float) -> float:
+    # A spherical lens has round bokeh, a 2x squeeze stretches it to twice as tall as wide
+    return 1.0 - 1.0 / max(squeeze, 1.0)
+
+
+def _flare_stretch(squeeze: float, aspect: float) -> float:
+    # Streaks lengthen with the squeeze and the width of the frame
+    return 0.75 * squeeze * aspect / REFERENCE_ASPECT
+
+
+def _flare_intensity(focal_length: float, f_stop: float) -> float:
+    # Follows the entrance pupil; a camera without depth of field has an f-stop of 0
+    f_stop = f_stop if f_stop > 0 else REFERENCE_F_STOP
+    return PARAMETERS_BY_NAME["sensorDiagonal"].default * (focal_length / f_stop) / (
+        REFERENCE_FOCAL_LENGTH / REFERENCE_F_STOP
+    )
+
+
+def build_lens_graph() -> ParameterGraph:
+    """The graph from squeeze, focalLength, fStop and aspect to the anisotropy,
+    sensorAspectRatio and sensorDiagonal render settings"""
+    graph = ParameterGraph()
+    graph.add_source("squeeze")
+    graph.add_source("focalLength")
+    graph.add_source("fStop")
+    graph.add_source("aspect")
+    for name, inputs, fn in (
+        ("anisotropy", ("squeeze",), _anisotropy),
+        ("sensorAspectRatio", ("squeeze", "aspect"), _flare_stretch),
+        ("sensorDiagonal", ("focalLength", "fStop"), _flare_intensity),
+    ):
+        graph.add_derived(name, inputs, _clamped(name, fn), PARAMETERS_BY_NAME[name].path)
+    return graph
+
+
+class LensGraphDriver:
+    """Feeds the lens graph from the active camera every frame and writes what changed.
+
+    The camera's focalLength and fStop are read at the viewport's time, so an
+    animated camera drives the settings during playback. Frames where no input
+    moved cost a few attribute reads and no writes.
+    """
+
+    def __init__(self, aspect_fn: Callable[[], Optional[float]]):
+        # The aspect ratio currently applied, None while there is none
+        self._aspect_fn = aspect_fn
+        self._graph = build_lens_graph()
+        self._viewport_api = None
+        self._update_sub = None
+        self._camera_path: Optional[str] = None
+        self._camera_attributes = None
+        self.written = 0
+
+    def destroy(self):
+        self.stop()
+        self._aspect_fn = None
+
+    @property
+    def graph(self) -> ParameterGraph:
+        return self._graph
+
+    @property
+    def active(self) -> bool:
+        return self._viewport_api is not None
+
+    def start(self, viewport_api):
+        self.stop()
+        if not carb.settings.get_settings().get(ENABLED_SETTING):
+            return
+        self._viewport_api = viewport_api
+        self._graph.invalidate()
+        self._update_sub = (
+            omni.kit.app.get_app()
+            .get_update_event_stream()
+            .create_subscription_to_pop(self._on_update, name="funkyboy.anamorphic.effects.lens_graph")
+        )
+        self.update()
+
+    def stop(self):
+        self._update_sub = None
+        self._viewport_api = None
+        self._camera_path = None
+        self._camera_attributes = None
+
+    def update(self):
+        """Read the inputs and write the derived settings that changed."""
+        viewport_api = self._viewport_api
+        if viewport_api is None:
+            return
+        graph = self._graph
+        graph.set("squeeze", carb.settings.get_settings().get_as_float(SQUEEZE_SETTING) or None)
+        graph.set("aspect", self._aspect_fn())
+        attributes = self._attributes(viewport_api)
+        if attributes is not None:
+            time = viewport_api.time
+            graph.set("focalLength", attributes[0].Get(time))
+            graph.set("fStop", attributes[1].Get(time))
+        outputs = graph.evaluate()
+        if outputs:
+            with settings_batch() as batch:
+                batch.update(outputs)
+            self.written += len(outputs)
+
+    def _attributes(self, viewport_api):
+        # Looked up once per camera, not every frame
+        path = str(viewport_api.camera_path)
+        if path != self._camera_path:
+            from pxr import UsdGeom
+
+            self._camera_path = path
+            camera = UsdGeom.Camera(viewport_api.stage.GetPrimAtPath(path))
+            self._camera_attributes = (
+                (camera.GetFocalLengthAttr(), camera.GetFStopAttr()) if camera else None
+            )
+        return self._camera_attributes
+
+    def _on_update(self, event):
+        self.update()
@@ -0,0 +1,91 @@
+__all__ = ["MatteOverlay"]
+
+from typing import Optional
+
+import omni.ui as ui
+from omni.ui import color as cl
+
+from .viewport_cache import get_viewport_cache
+
+FRAME_NAME = "funkyboy.anamorphic.effects.matte"
+
+matte_style = {
+    "Rectangle::anamorphic_matte": {"background_color": cl(0.0, 0.0, 0.0, 1.0)},
+}
+
+
+def _fit(ratio: float, width: float, height: float):
+    """The largest width x height box with the given ratio inside width x height"""
+    if width / height > ratio:
+        return height * ratio, height
+    return width, width / ratio
+
+
+class MatteOverlay:
+    """Letterbox/pillarbox bars drawn over a viewport window.
+
+    The render resolution is left alone, so no render targets are reallocated;
+    the bars just cover what falls outside the requested aspect ratio.
+    """
+
+    def __init__(self):
+        self._frame: Optional[ui.Frame] = None
+        self._viewport_api = None
+        self._ratio = 0.0
+
+    def destroy(self):
+        self.hide()
+
+    @property
+    def visible(self) -> bool:
+        return self._frame is not None
+
+    def show(self, viewport_window, ratio: float):
+        frame = viewport_window.get_frame(FRAME_NAME)
+        if self._frame is not None and self._frame is not frame:
+            self.hide()
+        self._frame = frame
+        self._viewport_api = viewport_window.viewport_api
+        self._ratio = ratio
+        frame.visible = True
+        frame.set_build_fn(self._build_fn)
+        frame.set_computed_content_size_changed_fn(frame.rebuild)
+        frame.rebuild()
+
+    def hide(self):
+        frame, self._frame = self._frame, None
+        self._viewport_api = None
+        if frame is not None:
+            frame.set_computed_content_size_changed_fn(None)
+            frame.set_build_fn(None)
+            frame.clear()
+            frame.visible = False
+
+    def _build_fn(self):
+        frame = self._frame
+        if frame is None or self._ratio <= 0:
+            return
+        frame_width, frame_height = frame.computed_width, frame.computed_height
+        tex_width, tex_height = get_viewport_cache().state(self._viewport_api).texture_resolution
+        if not (frame_width and frame_height and tex_width and tex_height):
+            return
+
+        # The viewport fits the render into the window, the matte goes over that image
+        image_width, image_height = _fit(tex_width / tex_height, frame_width, frame_height)
+        visible_width, visible_height = _fit(self._ratio, image_width, image_height)
+        bar_width = (image_width - visible_width) / 2
+        bar_height = (image_height - visible_height) / 2
+
+        with ui.VStack(style=matte_style):
+            ui.Spacer()
+            with ui.HStack(height=image_height):
+                ui.Spacer()
+                with ui.VStack(width=image_width):
+                    ui.Rectangle(name="anamorphic_matte", height=bar_height)
+                    with ui.HStack(height=visible_height):
+                        ui.Rectangle(name="anamorphic_matte", width=bar_width)
+                        ui.Spacer(width=visible_width)
+                        ui.Rectangle(name="anamorphic_matte", width=bar_width)
+                    ui.Rectangle(name="anamorphic_matte", height=bar_height)
+                ui.Spacer()
+            ui.Spacer()
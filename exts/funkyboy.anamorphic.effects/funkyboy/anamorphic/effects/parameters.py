@@ -0,0 +1,62 @@
+__all__ = ["LensParameter", "LENS_PARAMETERS", "PARAMETERS_BY_NAME", "PARAMETERS_BY_PATH"]
+
+from typing import Any
+
+
+class LensParameter:
+    """Describes one render setting driven by a slider in the Lens Effects frame"""
+
+    __slots__ = ("name", "label", "path", "num_type", "min", "max", "default", "precision", "tooltip", "cost")
+
+    def __init__(self, name, label, path, num_type, min, max, default, precision=2, tooltip="", cost="cheap"):
+        self.name = name
+        self.label = label
+        self.path = path
+        self.num_type = num_type
+        self.min = min
+        self.max = max
+        self.default = default
+        self.precision = precision
+        self.tooltip = tooltip
+        # Cost class of a write, see write_scheduler.COST_CLASSES
+        self.cost = cost
+
+    def cast(self, value: Any):
+        """value as the type the renderer expects for this setting"""
+        return int(round(value)) if self.num_type == "int" else float(value)
+
+    def clamp(self, value: Any):
+        return self.cast(min(self.max, max(self.min, value)))
+
+
+LENS_PARAMETERS = (
+    LensParameter(
+        "anisotropy", "Anamorphic Bokeh", "/rtx/post/dof/anisotropy", "float", 0.0, 1.0, 0.5,
+        tooltip="Controls Aniostropy value in Depth of Field Overrides located in the Post Processing menu",
+    ),
+    LensParameter(
+        "sensorDiagonal", "Lens Flare Intensity", "/rtx/post/lensFlares/sensorDiagonal", "float", 0.0, 135.0, 60.0,
+        precision=1, cost="kernel",
+        tooltip="Controls Sensor Diagonal value in FFT Bloom located in the Post Processing menu",
+    ),
+    LensParameter(
+        "sensorAspectRatio", "Lens Flare Stretch", "/rtx/post/lensFlares/sensorAspectRatio", "float", 0.01, 15.0, 1.5,
+        tooltip="Controls Sensor Aspect Ratio value in FFT Bloom located in the Post Processing menu",
+    ),
+    LensParameter(
+        "flareScale", "Bloom Intensity", "/rtx/post/lensFlares/flareScale", "float", 0.0, 0.5, 0.1, precision=3,
+        tooltip="Controls Bloom Intensity value in FFT Bloom located in the Post Processing menu",
+    ),
+    LensParameter(
+        "blades", "Lens Blades", "/rtx/post/lensFlares/blades", "int", 3, 11, 6, precision=0, cost="kernel",
+        tooltip="Controls Lens Blades value in FFT Bloom located in the Post Processing menu",
+    ),
+    LensParameter(
+        "apertureRotation", "Blade Rotation", "/rtx/post/lensFlares/apertureRotation", "float", 0.0, 100.0, 50.0,
+        precision=1,
+        tooltip="Controls Aperture Rotation value in FFT Bloom located in the Post Processing menu",
+    ),
+)
+
+PARAMETERS_BY_NAME = {param.name: param for param in LENS_PARAMETERS}
+PARAMETERS_BY_PATH = {param.path: param for param in LENS_PARAMETERS}
@@ -0,0 +1,189 @@
+__all__ = [
+    "AspectPreset",
+    "BUILTIN_PRESETS",
+    "PresetRegistry",
+    "parse_ratio",
+    "load_presets",
+    "get_preset_registry",
+    "release_preset_registry",
+]
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import carb
+import carb.settings
+import carb.tokens
+
+from .resolution_planner import POLICIES, plan_resolution
+
+PRESET_FILES_SETTING = "/exts/funkyboy.anamorphic.effects/presetFiles"
+
+
+class AspectPreset:
+    """One entry of the Aspect Ratio Preset combo box"""
+
+    __slots__ = ("id", "label", "ratio", "policy")
+
+    def __init__(self, id: str, label: str, ratio: float, policy: Optional[str] = None):
+        self.id = id
+        self.label = label
+        self.ratio = ratio
+        # Resolution policy for this preset, None for the resolutionPolicy setting
+        self.policy = policy
+
+    def __repr__(self):
+        return f"AspectPreset({self.id!r}, {self.label!r}, {self.ratio!r}, {self.policy!r})"
+
+
+BUILTIN_PRESETS = (
+    AspectPreset("cinemascope", "2.39:1 Cinemascope", 2.39),
+    AspectPreset("scope", "2.35:1 Scope", 2.35),
+    AspectPreset("todd_ao", "2.20:1 Todd-AO", 2.20),
+    AspectPreset("panavision_ultra_70", "2.76:1 Panavision Ultra-70", 2.76),
+    AspectPreset("anamorphic_2x", "2:1 2x Anamorphic", 2.0),
+    AspectPreset("widescreen", "1.77:1 Standard Widescreen (16x9)", 16 / 9),
+    AspectPreset("television", "1.33:1 Standard Television (4x3)", 4 / 3),
+    AspectPreset("mobile", "0.56:1 Mobile (9x16)", 9 / 16),
+    AspectPreset("square", "1:1 Square", 1.0),
+)
+
+
+def parse_ratio(value: Any) -> float:
+    """A ratio given as a number, or as "16:9" / "2.39:1" """
+    if isinstance(value, str) and ":" in value:
+        width, _, height = value.partition(":")
+        ratio = float(width) / float(height)
+    else:
+        ratio = float(value)
+    if ratio <= 0:
+        raise ValueError(f"aspect ratio must be positive, got {value!r}")
+    return ratio
+
+
+def load_presets(path: str) -> List[AspectPreset]:
+    """Read presets from a JSON file of the form
+
+        {"presets": [{"id": "flat", "label": "1.85:1 Flat", "ratio": "1.85:1", "policy": "fit"}, ...]}
+
+    "label" defaults to the id and "policy" to the resolutionPolicy setting.
+    Bad entries are skipped with a warning.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    presets = []
+    for entry in data.get("presets", ()):
+        try:
+            preset_id = str(entry["id"])
+            policy = entry.get("policy")
+            if policy is not None and policy not in POLICIES:
+                raise ValueError(f"unknown policy {policy!r}, expected one of {POLICIES}")
+            presets.append(
+                AspectPreset(preset_id, str(entry.get("label", preset_id)), parse_ratio(entry["ratio"]), policy)
+            )
+        except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+            carb.log_warn(f"[funkyboy.anamorphic.effects] Ignoring aspect preset {entry!r} in {path}: {e}")
+    return presets
+
+
+class PresetRegistry:
+    """Aspect presets by combo box index and by id.
+
+    Presets from files replace the built-in preset with the same id in place,
+    new ids are appended. resolutions() plans every preset for one base size
+    and keeps the result until it is asked about a different one.
+    """
+
+    def __init__(self, presets: Iterable[AspectPreset] = BUILTIN_PRESETS):
+        self._presets: Tuple[AspectPreset, ...] = ()
+        self._index: Dict[str, int] = {}
+        self._planned_key = None
+        self._planned: Tuple[Tuple[int, int], ...] = ()
+        self.extend(presets)
+
+    def __len__(self):
+        return len(self._presets)
+
+    def __getitem__(self, index: int) -> AspectPreset:
+        return self._presets[index]
+
+    @property
+    def presets(self) -> Tuple[AspectPreset, ...]:
+        return self._presets
+
+    @property
+    def labels(self) -> List[str]:
+        return [preset.label for preset in self._presets]
+
+    def index_of(self, preset_id: str) -> int:
+        """Combo box index of preset_id, -1 if unknown"""
+        return self._index.get(preset_id, -1)
+
+    def get(self, preset_id: str) -> Optional[AspectPreset]:
+        index = self._index.get(preset_id)
+        return self._presets[index] if index is not None else None
+
+    def extend(self, presets: Iterable[AspectPreset]):
+        merged = list(self._presets)
+        for preset in presets:
+            index = self._index.get(preset.id)
+            if index is None:
+                self._index[preset.id] = len(merged)
+                merged.append(preset)
+            else:
+                merged[index] = preset
+        self._presets = tuple(merged)
+        self._planned_key = None
+
+    def resolutions(
+        self,
+        base_width: int,
+        base_height: int,
+        policy: str = "fit",
+        align: int = 8,
+        budget: int = 0,
+        preset_policies: bool = True,
+    ) -> Tuple[Tuple[int, int], ...]:
+        """The resolution of every preset, by index, planned from base_width x base_height.
+
+        policy applies to presets without their own, or to all of them with
+        preset_policies off.
+        """
+        key = (base_width, base_height, policy, align, budget, preset_policies)
+        if key != self._planned_key:
+            self._planned = tuple(
+                plan_resolution(
+                    base_width, base_height, preset.ratio, (preset_policies and preset.policy) or policy, align, budget
+                )
+                for preset in self._presets
+            )
+            self._planned_key = key
+        return self._planned
+
+
+def _preset_files() -> List[str]:
+    tokens = carb.tokens.get_tokens_interface()
+    return [tokens.resolve(path) for path in carb.settings.get_settings().get(PRESET_FILES_SETTING) or ()]
+
+
+_registry: Optional[PresetRegistry] = None
+
+
+def get_preset_registry() -> PresetRegistry:
+    """The built-in presets extended by the files in PRESET_FILES_SETTING, loaded on first use"""
+    global _registry
+    if _registry is None:
+        _registry = PresetRegistry()
+        for path in _preset_files():
+            try:
+                _registry.extend(load_presets(path))
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                carb.log_warn(f"[funkyboy.anamorphic.effects] Could not read aspect presets from {path}: {e}")
+    return _registry
+
+
+def release_preset_registry():
+    global _registry
+    _registry = None
@@ -0,0 +1,250 @@
+__all__ = [
+    "LensProfile",
+    "ProfileLibrary",
+    "parse_profiles",
+    "apply_profile",
+    "get_profile_library",
+    "watch_profile_library",
+    "release_profile_library",
+]
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import carb
+import carb.settings
+import carb.tokens
+
+from .parameters import PARAMETERS_BY_NAME
+from .presets import parse_ratio
+from .resources import Subscription
+from .settings_writer import settings_batch
+
+PROFILE_FOLDERS_SETTING = "/exts/funkyboy.anamorphic.effects/profileFolders"
+RELOAD_DELAY_SETTING = "/exts/funkyboy.anamorphic.effects/profileReloadDelay"
+PROFILE_EXTENSION = ".json"
+
+
+class LensProfile:
+    """A named look: values for some of the lens parameters, and optionally an aspect ratio"""
+
+    __slots__ = ("name", "values", "ratio", "source")
+
+    def __init__(self, name: str, values: Dict[str, Any], ratio: Optional[float] = None, source: str = ""):
+        self.name = name
+        # settings path -> value, already cast and clamped
+        self.values = values
+        self.ratio = ratio
+        self.source = source
+
+    def __repr__(self):
+        return f"LensProfile({self.name!r}, {self.values!r}, {self.ratio!r})"
+
+
+def parse_profiles(data: Dict[str, Any], source: str = "") -> List[LensProfile]:
+    """Profiles from the contents of a library file:
+
+        {"profiles": [{"name": "Classic Scope", "ratio": "2.39:1", "anisotropy": 0.6, "blades": 6}, ...]}
+
+    Parameter keys are the names in parameters.LENS_PARAMETERS. Unknown keys
+    and bad entries are skipped with a warning.
+    """
+    profiles = []
+    for entry in data.get("profiles", ()):
+        try:
+            name = str(entry["name"])
+            ratio = parse_ratio(entry["ratio"]) if entry.get("ratio") is not None else None
+            values = {}
+            for key, value in entry.items():
+                if key in ("name", "ratio"):
+                    continue
+                param = PARAMETERS_BY_NAME.get(key)
+                if param is None:
+                    carb.log_warn(
+                        f"[funkyboy.anamorphic.effects] Unknown parameter '{key}' in profile '{name}' ({source})"
+                    )
+                    continue
+                values[param.path] = param.clamp(value)
+        except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+            carb.log_warn(f"[funkyboy.anamorphic.effects] Ignoring lens profile {entry!r} in {source}: {e}")
+            continue
+        profiles.append(LensProfile(name, values, ratio, source))
+    return profiles
+
+
+def apply_profile(profile: LensProfile):
+    """Write the profile's settings in one batch, skipping those already at their value.
+
+    The aspect ratio is left to the caller, it goes through the aspect controller.
+    """
+    with settings_batch() as batch:
+        batch.update(profile.values)
+
+
+class ProfileLibrary:
+    """All profiles of the library folders, indexed by name.
+
+    Each folder holds any number of *.json files. scan() stats every file and
+    only parses the ones that are new or changed since the last scan; files
+    later in the folder list win on equal names. watch() rescans after a file
+    in a folder changes, once no further change came in for RELOAD_DELAY_SETTING
+    seconds, so an editor saving several times in a row costs one reparse.
+    """
+
+    def __init__(self, folders: Iterable[str] = (), clock: Callable[[], float] = time.monotonic):
+        self._folders = [os.path.normpath(folder) for folder in folders]
+        self._clock = clock
+        # path -> ((mtime_ns, size), profiles)
+        self._files: Dict[str, Tuple[Tuple[int, int], Tuple[LensProfile, ...]]] = {}
+        self._index: Dict[str, LensProfile] = {}
+        self._names: Tuple[str, ...] = ()
+        self._changed_fns: List[Callable[[], None]] = []
+        self._watch_requests = []
+        self._dirty = threading.Event()
+        self._deadline: Optional[float] = None
+        self._update_sub = None
+        self.parses = 0
+
+    def destroy(self):
+        self.unwatch()
+        self._changed_fns = []
+        self._files = {}
+        self._index = {}
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Profile names, sorted"""
+        return self._names
+
+    def get(self, name: str) -> Optional[LensProfile]:
+        return self._index.get(name)
+
+    def subscribe_changed(self, fn: Callable[[], None]) -> Subscription:
+        """Call fn after a scan that changed the profiles; unsubscribe() the result to stop."""
+        return Subscription(self._changed_fns, fn)
+
+    def scan(self) -> bool:
+        """Reparse new and changed files, drop removed ones. True if anything changed."""
+        seen = {}
+        for folder in self._folders:
+            try:
+                file_names = sorted(os.listdir(folder))
+            except OSError:
+                continue
+            for file_name in file_names:
+                if not file_name.endswith(PROFILE_EXTENSION):
+                    continue
+                path = os.path.join(folder, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                seen[path] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = set(self._files) - set(seen)
+        for path in changed:
+            del self._files[path]
+        for path, signature in seen.items():
+            cached = self._files.get(path)
+            if cached is not None and cached[0] == signature:
+                continue
+            self._files[path] = (signature, self._parse(path))
+            changed.add(path)
+
+        if changed:
+            self._reindex(list(seen))
+            for fn in list(self._changed_fns):
+                fn()
+        return bool(changed)
+
+    def watch(self):
+        """Rescan, debounced, whenever a file in one of the folders changes."""
+        if self._watch_requests:
+            return
+        import omni.client
+        import omni.kit.app
+
+        for folder in self._folders:
+            self._watch_requests.append(
+                omni.client.list_subscribe_with_callback(folder, None, self._on_folder_event)
+            )
+        self._update_sub = (
+            omni.kit.app.get_app()
+            .get_update_event_stream()
+            .create_subscription_to_pop(self._on_update, name="funkyboy.anamorphic.effects.profiles")
+        )
+
+    def unwatch(self):
+        for request in self._watch_requests:
+            request.stop()
+        self._watch_requests = []
+        self._update_sub = None
+
+    def _parse(self, path: str) -> Tuple[LensProfile, ...]:
+        self.parses += 1
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return tuple(parse_profiles(json.load(f), path))
+        except (OSError, ValueError) as e:
+            carb.log_warn(f"[funkyboy.anamorphic.effects] Could not read lens profiles from {path}: {e}")
+            return ()
+
+    def _reindex(self, paths: List[str]):
+        index = {}
+        for path in paths:
+            for profile in self._files[path][1]:
+                index[profile.name] = profile
+        self._index = index
+        self._names = tuple(sorted(index))
+
+    def _on_folder_event(self, result, event, entry):
+        # Called from omni.client's thread, the rescan happens on the main thread
+        self._dirty.set()
+
+    def _on_update(self, event):
+        if self._dirty.is_set():
+            self._dirty.clear()
+            self._deadline = self._clock() + carb.settings.get_settings().get_as_float(RELOAD_DELAY_SETTING)
+            return
+        if self._deadline is None or self._clock() < self._deadline:
+            return
+        self._deadline = None
+        self.scan()
+
+
+_library: Optional[ProfileLibrary] = None
+# Set by the extension; scripts using core read the folders once and never load omni.client
+_watch = False
+
+
+def get_profile_library() -> ProfileLibrary:
+    """The library of the folders in PROFILE_FOLDERS_SETTING, scanned on first use
+    and watched after watch_profile_library()"""
+    global _library
+    if _library is None:
+        tokens = carb.tokens.get_tokens_interface()
+        folders = carb.settings.get_settings().get(PROFILE_FOLDERS_SETTING) or ()
+        _library = ProfileLibrary([tokens.resolve(folder) for folder in folders])
+        _library.scan()
+        if _watch:
+            _library.watch()
+    return _library
+
+
+def watch_profile_library():
+    """Keep the library up to date with its folders, from first use on."""
+    global _watch
+    _watch = True
+    if _library is not None:
+        _library.watch()
+
+
+def release_profile_library():
+    global _library, _watch
+    _watch = False
+    if _library is not None:
+        _library.destroy()
+        _library = None
@@ -0,0 +1,77 @@
+__all__ = ["POLICIES", "plan_resolution"]
+
+import math
+from functools import lru_cache
+from typing import Tuple
+
+# width:  keep the base width, height follows the ratio (the original behaviour)
+# fit:    largest size with the ratio that fits inside the base size
+# fill:   smallest size with the ratio that covers the base size
+# area:   same pixel count as the base size
+# budget: like fit, scaled down further to stay under a pixel budget
+# crop:   keep the base width, only ever take rows off the height
+POLICIES = ("width", "fit", "fill", "area", "budget", "crop")
+
+
+def _align_nearest(value: float, align: int) -> int:
+    return int(round(value / align)) * align
+
+
+def _align_down(value: float, align: int) -> int:
+    return int(math.floor(value / align + 1e-9)) * align
+
+
+def _aligned(width: float, height: float, align: int, down: bool = False) -> Tuple[int, int]:
+    if min(width, height) < align:
+        # Rounding the short side up alone would bend the ratio, so grow both together
+        scale = align / min(width, height)
+        return _align_nearest(width * scale, align), _align_nearest(height * scale, align)
+    rounding = _align_down if down else _align_nearest
+    return rounding(width, align), rounding(height, align)
+
+
+@lru_cache(maxsize=256)
+def plan_resolution(
+    base_width: int, base_height: int, ratio: float, policy: str = "fit", align: int = 8, budget: int = 0
+) -> Tuple[int, int]:
+    """Integer render resolution for ratio (width / height) derived from a base size.
+
+    Both sides are multiples of align, which keeps video encoders happy. A side
+    that would round below align is raised to it together with the other one, so
+    extreme ratios keep their shape even if that goes past the base size. For the
+    budget policy a budget of 0 means the base pixel count.
+    """
+    if ratio <= 0 or base_width <= 0 or base_height <= 0:
+        raise ValueError(f"Cannot plan a resolution for {base_width}x{base_height} at ratio {ratio}")
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown resolution policy '{policy}', expected one of {POLICIES}")
+    align = max(1, int(align))
+
+    if policy == "width":
+        return _aligned(base_width, base_width / ratio, align)
+
+    if policy == "crop":
+        return _aligned(base_width, min(base_height, base_width / ratio), align, down=True)
+
+    if policy == "area":
+        area = base_width * base_height
+        return _aligned(math.sqrt(area * ratio), math.sqrt(area / ratio), align)
+
+    if policy == "fill":
+        if base_width / base_height > ratio:
+            width, height = base_width, base_width / ratio
+        else:
+            width, height = base_height * ratio, base_height
+        return _aligned(width, height, align)
+
+    # fit and budget never go past the base size, so round down
+    if base_width / base_height > ratio:
+        width, height = base_height * ratio, base_height
+    else:
+        width, height = base_width, base_width / ratio
+    if policy == "budget":
+        limit = budget if budget > 0 else base_width * base_height
+        if width * height > limit:
+            scale = math.sqrt(limit / (width * height))
+            width, height = width * scale, height * scale
+    return _aligned(width, height, align, down=True)
@@ -0,0 +1,95 @@
+__all__ = ["ResourceRegistry", "Subscription"]
+
+from typing import Any, Callable, List, Optional, Tuple
+
+import carb
+
+
+def _release_fn(resource: Any) -> Callable[[], None]:
+    destroy = getattr(resource, "destroy", None)
+    if callable(destroy):
+        return destroy
+    unsubscribe = getattr(resource, "unsubscribe", None)
+    if callable(unsubscribe):
+        return unsubscribe
+    # omni.ui and event stream subscriptions end when the last reference is dropped
+    return lambda: None
+
+
+class Subscription:
+    """Keeps fn in a list of callbacks until unsubscribe() is called.
+
+    Returned by the subscribe_*() methods of the extension's objects, and
+    released like any other subscription by a ResourceRegistry.
+    """
+
+    __slots__ = ("_callbacks", "_fn")
+
+    def __init__(self, callbacks: List[Callable[..., None]], fn: Callable[..., None]):
+        self._callbacks = callbacks
+        self._fn = fn
+        callbacks.append(fn)
+
+    def unsubscribe(self):
+        if self._fn in self._callbacks:
+            self._callbacks.remove(self._fn)
+        self._fn = None
+
+
+class ResourceRegistry:
+    """Owns subscriptions, callbacks and child widgets so they can be released together.
+
+    Anything registered is released in reverse order by destroy(): objects with
+    a destroy() or unsubscribe() method have it called, any other handle just has
+    its reference dropped. A failing release is logged and the rest still go.
+    Registries nest; a child registry is a resource of its parent and can be
+    released on its own, e.g. when a frame is rebuilt.
+    """
+
+    def __init__(self):
+        # (name, resource, release)
+        self._entries: List[Tuple[Optional[str], Any, Callable[[], None]]] = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def destroy(self):
+        entries, self._entries = self._entries, []
+        for _, resource, release in reversed(entries):
+            self._release(resource, release)
+
+    def add(self, resource: Any, name: Optional[str] = None) -> Any:
+        """Keep resource until it is released, and return it."""
+        if resource is not None:
+            self._entries.append((name, resource, _release_fn(resource)))
+        return resource
+
+    def add_callback(self, release: Callable[[], None], name: Optional[str] = None):
+        """Call release() when the registry is destroyed."""
+        self._entries.append((name, release, release))
+
+    def add_value_changed_fn(self, model, fn: Callable, name: Optional[str] = None) -> int:
+        """model.add_value_changed_fn(fn), removed again on release"""
+        callback_id = model.add_value_changed_fn(fn)
+        self.add_callback(lambda: model.remove_value_changed_fn(callback_id), name)
+        return callback_id
+
+    def child(self, name: Optional[str] = None) -> "ResourceRegistry":
+        """A nested registry released with this one"""
+        return self.add(ResourceRegistry(), name)
+
+    def release(self, name: str):
+        """Release only the resources registered under name."""
+        keep = []
+        released = []
+        for entry in self._entries:
+            (released if entry[0] == name else keep).append(entry)
+        self._entries = keep
+        for _, resource, release in reversed(released):
+            self._release(resource, release)
+
+    def _release(self, resource: Any, release: Callable[[], None]):
+        try:
+            release()
+        except Exception as e:
+            carb.log_error(f"[funkyboy.anamorphic.effects] failed to release {resource!r}: {e}")
@@ -0,0 +1,144 @@
+__all__ = ["SettingsBinding", "get_settings_binding", "release_settings_binding"]
+
+from typing import Any, Dict, List, Optional
+
+import carb.settings
+import omni.kit.app
+import omni.ui as ui
+
+from .settings_writer import get_settings_writer
+
+ROOT_PATH = "/rtx/post"
+
+
+class _BindingHandle:
+    """Returned by SettingsBinding.bind(), destroy() to unbind"""
+
+    __slots__ = ("_binding", "_path", "_model")
+
+    def __init__(self, binding: "SettingsBinding", path: str, model: ui.AbstractValueModel):
+        self._binding = binding
+        self._path = path
+        self._model = model
+
+    def destroy(self):
+        if self._binding is not None:
+            self._binding.unbind(self._path, self._model)
+        self._binding = None
+        self._model = None
+
+
+class SettingsBinding:
+    """Keeps widget models in sync with carb settings in both directions.
+
+    Widgets push their values with push(), which goes through the shared
+    settings writer. Changes made anywhere else (Render Settings panel,
+    scripts) are picked up by a single tree subscription on ROOT_PATH. The
+    subscription only marks the binding dirty; on the next app update every
+    bound path is read once and models are updated for the values that
+    actually changed, so a burst of writes costs one UI refresh.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, List[ui.AbstractValueModel]] = {}
+        # The last value seen or pushed per path, to tell external changes from our own
+        self._known: Dict[str, Any] = {}
+        self._tree_sub = None
+        self._update_sub = None
+        self._dispatching = False
+        self.events = 0
+        self.dispatches = 0
+
+    def destroy(self):
+        self._unsubscribe()
+        self._update_sub = None
+        self._models = {}
+        self._known = {}
+
+    def bind(self, path: str, model: ui.AbstractValueModel) -> _BindingHandle:
+        """Mirror the setting at path into model and return a handle to unbind."""
+        self._models.setdefault(path, []).append(model)
+        value = carb.settings.get_settings().get(path)
+        if value is not None:
+            # The renderer's value wins over whatever the widget queued while being built
+            get_settings_writer().discard(path)
+            self._known[path] = value
+            self._set_model(model, value)
+        if self._tree_sub is None:
+            self._tree_sub = carb.settings.get_settings().subscribe_to_tree_change_events(
+                ROOT_PATH, self._on_tree_changed
+            )
+        return _BindingHandle(self, path, model)
+
+    def unbind(self, path: str, model: ui.AbstractValueModel):
+        models = self._models.get(path)
+        if not models or model not in models:
+            return
+        models.remove(model)
+        if not models:
+            del self._models[path]
+            self._known.pop(path, None)
+        if not self._models:
+            self._unsubscribe()
+
+    def push(self, path: str, value: Any):
+        """Send a value from a widget to the renderer, unless it is our own echo."""
+        if self._dispatching:
+            return
+        self._known[path] = value
+        get_settings_writer().queue(path, value)
+
+    def _unsubscribe(self):
+        if self._tree_sub is not None:
+            carb.settings.get_settings().unsubscribe_to_change_events(self._tree_sub)
+            self._tree_sub = None
+
+    def _on_tree_changed(self, tree_item, changed_item, event_type):
+        self.events += 1
+        if self._update_sub is None:
+            self._update_sub = (
+                omni.kit.app.get_app()
+                .get_update_event_stream()
+                .create_subscription_to_pop(self._on_update, name="funkyboy.anamorphic.effects.settings_binding")
+            )
+
+    def _on_update(self, event):
+        self._update_sub = None
+        settings = carb.settings.get_settings()
+        writer = get_settings_writer()
+        for path, models in list(self._models.items()):
+            # A value still queued in the writer is newer than what the renderer holds
+            if writer.pending(path) is not None:
+                continue
+            value = settings.get(path)
+            if value is None or value == self._known.get(path):
+                continue
+            self._known[path] = value
+            self.dispatches += 1
+            for model in models:
+                self._set_model(model, value)
+
+    def _set_model(self, model: ui.AbstractValueModel, value: Any):
+        # The model's value changed callbacks push the value back; that echo is dropped
+        self._dispatching = True
+        try:
+            model.set_value(value)
+        finally:
+            self._dispatching = False
+
+
+_binding: Optional[SettingsBinding] = None
+
+
+def get_settings_binding() -> SettingsBinding:
+    global _binding
+    if _binding is None:
+        _binding = SettingsBinding()
+    return _binding
+
+
+def release_settings_binding():
+    global _binding
+    if _binding is not None:
+        _binding.destroy()
+        _binding = None
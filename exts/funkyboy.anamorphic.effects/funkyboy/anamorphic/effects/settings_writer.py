@@ -0,0 +1,251 @@
+__all__ = ["SettingsWriter", "SettingsBatch", "settings_batch", "get_settings_writer", "release_settings_writer"]
+
+import math
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import carb.settings
+
+from .viewport_cache import get_viewport_cache
+from .write_scheduler import ENABLED_SETTING as SCHEDULER_SETTING
+from .write_scheduler import RESOLUTION_KEY, WriteScheduler
+
+
+class SettingsWriter:
+    """Buffers carb settings writes and flushes them once per app update.
+
+    Slider drags produce a value on every mouse move, but the renderer only
+    needs the latest value of each key once per frame. Values queued between
+    two update ticks overwrite each other, and only the survivors are written.
+
+    With SCHEDULER_SETTING on, settings batches and viewport resizes are
+    queued here as well, and each tick only writes what the write scheduler
+    fits into the frame budget.
+    """
+
+    def __init__(self, scheduler: Optional[WriteScheduler] = None):
+        # settings path, or (RESOLUTION_KEY, id(viewport_api)) -> value, or (viewport_api, resolution)
+        self._pending: Dict[Hashable, Any] = {}
+        self._scheduler = scheduler or WriteScheduler()
+        self._update_sub = None
+        self.queued = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.skipped = 0
+
+    def destroy(self):
+        self.flush()
+        self._update_sub = None
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters for queued, dropped (overwritten before flush), flushed and
+        skipped (already at the target value) writes"""
+        return {"queued": self.queued, "dropped": self.dropped, "flushed": self.flushed, "skipped": self.skipped}
+
+    def reset_stats(self):
+        self.queued = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.skipped = 0
+
+    @property
+    def scheduler(self) -> WriteScheduler:
+        return self._scheduler
+
+    @property
+    def budgeted(self) -> bool:
+        """True while pending writes are spread over frames by the write scheduler"""
+        return bool(carb.settings.get_settings().get(SCHEDULER_SETTING))
+
+    def queue(self, path: Hashable, value: Any):
+        """Queue a write; only the latest value per path survives until the next flush."""
+        self.queued += 1
+        if path in self._pending:
+            self.dropped += 1
+        self._pending[path] = value
+        if self._update_sub is None:
+            # Loaded here, so headless imports of core don't need omni.kit.app
+            import omni.kit.app
+
+            self._update_sub = (
+                omni.kit.app.get_app()
+                .get_update_event_stream()
+                .create_subscription_to_pop(self._on_update, name="funkyboy.anamorphic.effects.settings_writer")
+            )
+
+    def queue_resolution(self, viewport_api, resolution: Tuple[int, int]):
+        """Queue a resize of viewport_api, the latest one per viewport survives."""
+        self.queue((RESOLUTION_KEY, id(viewport_api)), (viewport_api, resolution))
+
+    def pending_resolution(self, viewport_api) -> Optional[Tuple[int, int]]:
+        entry = self._pending.get((RESOLUTION_KEY, id(viewport_api)))
+        return entry[1] if entry is not None else None
+
+    def discard(self, path: str) -> bool:
+        """Forget a pending write, e.g. because a newer write superseded it."""
+        if path not in self._pending:
+            return False
+        del self._pending[path]
+        self.dropped += 1
+        return True
+
+    def pending(self, path: str, default: Optional[Any] = None) -> Any:
+        return self._pending.get(path, default)
+
+    def flush(self):
+        """Write every pending value now."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        settings = carb.settings.get_settings()
+        for key, value in pending.items():
+            _write(settings, key, value)
+        self.flushed += len(pending)
+
+    def flush_budgeted(self):
+        """Write the pending values that fit into this frame's budget, cheap ones first."""
+        if not self._pending:
+            return
+        scheduler = self._scheduler
+        settings = carb.settings.get_settings()
+        scheduler.begin_frame()
+        for key in scheduler.order(self._pending):
+            value = self._pending[key]
+            if _is_current(settings, key, value):
+                # Nothing to pay for
+                del self._pending[key]
+                self.skipped += 1
+                continue
+            if not scheduler.admit(key):
+                break
+            del self._pending[key]
+            _write(settings, key, value)
+            self.flushed += 1
+        scheduler.end_frame(len(self._pending))
+
+    def _on_update(self, event):
+        if self.budgeted:
+            self.flush_budgeted()
+        else:
+            self.flush()
+        # Nothing left to do until the next queue() call, so stop ticking
+        if not self._pending:
+            self._update_sub = None
+
+
+class SettingsBatch:
+    """Target values collected by settings_batch() and written in one burst"""
+
+    def __init__(self, writer: SettingsWriter):
+        self._writer = writer
+        self._targets: Dict[str, Any] = {}
+        self.written = 0
+        self.skipped = 0
+
+    def set(self, path: str, value: Any):
+        self._targets[path] = value
+
+    def update(self, values: Dict[str, Any]):
+        self._targets.update(values)
+
+    def commit(self):
+        """Read the current value of every target once and write only those that differ.
+
+        With the write scheduler on, the writes are queued for it instead.
+        """
+        targets, self._targets = self._targets, {}
+        settings = carb.settings.get_settings()
+        writer = self._writer
+        budgeted = writer.budgeted
+        for path, value in targets.items():
+            pending = writer.pending(path, _NOTHING)
+            if budgeted and pending is not _NOTHING and _same_value(pending, value):
+                # Already on its way
+                self.skipped += 1
+                continue
+            # A pending slider value for the same key is older than this batch
+            writer.discard(path)
+            if _same_value(settings.get(path), value):
+                self.skipped += 1
+            elif budgeted:
+                writer.queue(path, value)
+                self.written += 1
+            else:
+                settings.set(path, value)
+                self.written += 1
+        if not budgeted:
+            writer.flushed += self.written
+        writer.skipped += self.skipped
+
+
+_NOTHING = object()
+
+
+def _write(settings, key: Hashable, value: Any):
+    if isinstance(key, tuple):
+        viewport_api, resolution = value
+        get_viewport_cache().state(viewport_api).set_resolution(resolution)
+    else:
+        settings.set(key, value)
+
+
+def _is_current(settings, key: Hashable, value: Any) -> bool:
+    if isinstance(key, tuple):
+        viewport_api, resolution = value
+        return get_viewport_cache().state(viewport_api).resolution == resolution
+    return _same_value(settings.get(key), value)
+
+
+def _same_value(current: Any, target: Any) -> bool:
+    if isinstance(current, float) or isinstance(target, float):
+        try:
+            return math.isclose(current, target, rel_tol=1e-6, abs_tol=1e-9)
+        except TypeError:
+            return False
+    return current == target
+
+
+_batch: Optional[SettingsBatch] = None
+
+
+@contextmanager
+def settings_batch():
+    """Collect settings writes and apply only the changed ones on exit.
+
+    Nested batches join the outermost one, so everything is written together.
+    Nothing is written if the block raises.
+
+        with settings_batch() as batch:
+            batch.set("/rtx/post/lensFlares/enabled", True)
+    """
+    global _batch
+    if _batch is not None:
+        yield _batch
+        return
+
+    _batch = SettingsBatch(get_settings_writer())
+    try:
+        yield _batch
+        _batch.commit()
+    finally:
+        _batch = None
+
+
+_writer: Optional[SettingsWriter] = None
+
+
+def get_settings_writer() -> SettingsWriter:
+    """The writer shared by all widgets of the extension"""
+    global _writer
+    if _writer is None:
+        _writer = SettingsWriter()
+    return _writer
+
+
+def release_settings_writer():
+    """Flush and drop the shared writer. Called on extension shutdown."""
+    global _writer
+    if _writer is not None:
+        _writer.destroy()
+        _writer = None
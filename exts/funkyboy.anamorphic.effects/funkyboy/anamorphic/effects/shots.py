@@ -0,0 +1,248 @@
+__all__ = [
+    "Shot",
+    "ShotIndex",
+    "parse_shot_csv",
+    "parse_edl",
+    "load_shot_list",
+    "ShotPlayer",
+]
+
+import bisect
+import csv
+import io
+import os
+import re
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import carb
+import carb.settings
+import carb.tokens
+
+SHOT_LIST_SETTING = "/exts/funkyboy.anamorphic.effects/shotList"
+
+
+class Shot:
+    """Frames start (inclusive) to end (exclusive) and the look they get.
+
+    profile is a lens profile name and preset an aspect preset id, either may
+    be empty to leave that part alone.
+    """
+
+    __slots__ = ("start", "end", "profile", "preset", "name")
+
+    def __init__(self, start: int, end: int, profile: str = "", preset: str = "", name: str = ""):
+        if end <= start:
+            raise ValueError(f"shot must end after it starts, got {start}..{end}")
+        self.start = start
+        self.end = end
+        self.profile = profile
+        self.preset = preset
+        self.name = name
+
+    def __repr__(self):
+        return f"Shot({self.start!r}, {self.end!r}, {self.profile!r}, {self.preset!r}, {self.name!r})"
+
+
+def _part(shot: Shot, start: int, end: int) -> Shot:
+    return Shot(start, end, shot.profile, shot.preset, shot.name)
+
+
+class ShotIndex:
+    """Shots sorted by start frame, looked up by frame with a binary search.
+
+    Where shots overlap the one starting later wins, so each frame belongs to
+    at most one shot. A shot that contains a later one carries on after it.
+    """
+
+    def __init__(self, shots: Iterable[Shot] = ()):
+        ordered = sorted(shots, key=lambda shot: shot.start)
+        self._shots: List[Shot] = []
+        for shot in ordered:
+            # The shots so far don't overlap, so the ones shot cuts into are at the end
+            overlapped = []
+            while self._shots and self._shots[-1].end > shot.start:
+                overlapped.append(self._shots.pop())
+            overlapped.reverse()
+            if overlapped and overlapped[0].start < shot.start:
+                self._shots.append(_part(overlapped[0], overlapped[0].start, shot.start))
+            self._shots.append(shot)
+            for previous in overlapped:
+                if previous.end > shot.end:
+                    self._shots.append(_part(previous, max(previous.start, shot.end), previous.end))
+        self._starts = [shot.start for shot in self._shots]
+
+    def __len__(self):
+        return len(self._shots)
+
+    @property
+    def shots(self) -> Tuple[Shot, ...]:
+        return tuple(self._shots)
+
+    def find(self, frame: int) -> Optional[Shot]:
+        """The shot frame falls in, None between and outside shots"""
+        index = bisect.bisect_right(self._starts, frame) - 1
+        if index < 0:
+            return None
+        shot = self._shots[index]
+        return shot if frame < shot.end else None
+
+
+def parse_shot_csv(text: str, source: str = "") -> List[Shot]:
+    """Shots from CSV with a header row:
+
+        start,end,profile,preset,name
+        1001,1049,Classic Scope,cinemascope,sh010
+
+    end is exclusive; profile, preset and name are optional columns. Bad rows
+    are skipped with a warning.
+    """
+    shots = []
+    for row in csv.DictReader(io.StringIO(text)):
+        try:
+            shots.append(
+                Shot(
+                    int(row["start"]),
+                    int(row["end"]),
+                    (row.get("profile") or "").strip(),
+                    (row.get("preset") or "").strip(),
+                    (row.get("name") or "").strip(),
+                )
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            carb.log_warn(f"[funkyboy.anamorphic.effects] Ignoring shot {row!r} in {source}: {e}")
+    return shots
+
+
+# 001  AX  V  C  00:00:00:00 00:00:02:00 01:00:00:00 01:00:02:00
+_EDL_EVENT = re.compile(
+    r"^\s*(\d+)\s+(\S+)\s+\S+\s+\S+(?:\s+\d+)?"
+    r"\s+(\d\d:\d\d:\d\d[:;]\d\d)\s+(\d\d:\d\d:\d\d[:;]\d\d)\s+(\d\d:\d\d:\d\d[:;]\d\d)\s+(\d\d:\d\d:\d\d[:;]\d\d)"
+)
+# * LENS PROFILE: Classic Scope / * ASPECT PRESET: cinemascope
+_EDL_COMMENT = re.compile(r"^\s*\*\s*(LENS PROFILE|ASPECT PRESET)\s*:\s*(.*?)\s*$", re.IGNORECASE)
+
+
+def _timecode_frames(timecode: str, fps: int) -> int:
+    hours, minutes, seconds, frames = (int(part) for part in re.split(r"[:;]", timecode))
+    return ((hours * 60 + minutes) * 60 + seconds) * fps + frames
+
+
+def parse_edl(text: str, fps: int, source: str = "") -> List[Shot]:
+    """Shots from a CMX 3600 style EDL, placed by their record in/out timecodes.
+
+    An event's look comes from comment lines following it:
+
+        001  AX  V  C  01:00:00:00 01:00:02:00 01:00:00:00 01:00:02:00
+        * LENS PROFILE: Classic Scope
+        * ASPECT PRESET: cinemascope
+
+    Frames count from the first event's record in.
+    """
+    events = []
+    for line in text.splitlines():
+        match = _EDL_EVENT.match(line)
+        if match:
+            record_in = _timecode_frames(match.group(5), fps)
+            record_out = _timecode_frames(match.group(6), fps)
+            events.append([record_in, record_out, "", "", match.group(1)])
+            continue
+        match = _EDL_COMMENT.match(line)
+        if match and events:
+            events[-1][2 if match.group(1).upper() == "LENS PROFILE" else 3] = match.group(2)
+
+    origin = min((event[0] for event in events), default=0)
+    shots = []
+    for record_in, record_out, profile, preset, name in events:
+        try:
+            shots.append(Shot(record_in - origin, record_out - origin, profile, preset, name))
+        except ValueError as e:
+            carb.log_warn(f"[funkyboy.anamorphic.effects] Ignoring EDL event {name} in {source}: {e}")
+    return shots
+
+
+def load_shot_list(path: str, fps: int = 24) -> ShotIndex:
+    """A ShotIndex from a .edl file, or from CSV for any other extension"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if os.path.splitext(path)[1].lower() == ".edl":
+        return ShotIndex(parse_edl(text, fps, path))
+    return ShotIndex(parse_shot_csv(text, path))
+
+
+class ShotPlayer:
+    """Applies the look of the shot under the timeline's current frame.
+
+    Frames inside the current shot cost a range check, a frame outside it one
+    bisect, and apply_fn(shot) only runs when the shot changes.
+    """
+
+    def __init__(self, apply_fn: Callable[[Shot], None]):
+        self._apply_fn = apply_fn
+        self._index = ShotIndex()
+        self._path: Optional[str] = None
+        self._shot: Optional[Shot] = None
+        self._timeline_sub = None
+        self.changes = 0
+
+    def destroy(self):
+        self.stop()
+        self._apply_fn = None
+        self._index = ShotIndex()
+
+    @property
+    def index(self) -> ShotIndex:
+        return self._index
+
+    @property
+    def shot(self) -> Optional[Shot]:
+        return self._shot
+
+    def set_index(self, index: ShotIndex):
+        self._index = index
+        self._shot = None
+
+    def apply_frame(self, frame: int) -> bool:
+        """Apply the look of frame's shot if it isn't the current one; True if it was applied."""
+        shot = self._shot
+        if shot is not None and shot.start <= frame < shot.end:
+            return False
+        shot = self._index.find(frame)
+        if shot is None or shot is self._shot:
+            return False
+        self._shot = shot
+        self.changes += 1
+        self._apply_fn(shot)
+        return True
+
+    def start(self):
+        """Load the shot list of SHOT_LIST_SETTING, if set, and follow the timeline until stop()."""
+        import omni.timeline
+
+        timeline = omni.timeline.get_timeline_interface()
+        path = carb.settings.get_settings().get(SHOT_LIST_SETTING)
+        path = carb.tokens.get_tokens_interface().resolve(path) if path else None
+        if path != self._path:
+            self._path = path
+            index = ShotIndex()
+            if path:
+                try:
+                    index = load_shot_list(path, int(round(timeline.get_time_codes_per_seconds())))
+                except (OSError, ValueError) as e:
+                    carb.log_warn(f"[funkyboy.anamorphic.effects] Could not read shot list {path}: {e}")
+            self.set_index(index)
+        if not len(self._index) or self._timeline_sub is not None:
+            return
+        self._timeline_sub = timeline.get_timeline_event_stream().create_subscription_to_pop(
+            self._on_timeline_event, name="funkyboy.anamorphic.effects.shots"
+        )
+        self._shot = None
+        self._on_timeline_event(None)
+
+    def stop(self):
+        self._timeline_sub = None
+
+    def _on_timeline_event(self, event):
+        import omni.timeline
+
+        timeline = omni.timeline.get_timeline_interface()
+        self.apply_frame(int(round(timeline.get_current_time() * timeline.get_time_codes_per_seconds())))
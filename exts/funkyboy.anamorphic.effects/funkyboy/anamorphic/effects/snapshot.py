@@ -0,0 +1,57 @@
+__all__ = ["MANAGED_SETTINGS", "SettingsSnapshot", "take_snapshot", "restore_snapshot"]
+
+import weakref
+from typing import Any, Tuple
+
+import carb.settings
+
+from .parameters import LENS_PARAMETERS
+from .settings_writer import get_settings_writer, settings_batch
+from .viewport_cache import get_viewport_cache
+
+# Every render setting the extension writes to
+MANAGED_SETTINGS = ("/rtx/post/lensFlares/enabled",) + tuple(param.path for param in LENS_PARAMETERS)
+
+
+class SettingsSnapshot:
+    """The values of MANAGED_SETTINGS, in order, plus viewport resolutions"""
+
+    __slots__ = ("values", "resolutions")
+
+    def __init__(self, values: Tuple[Any, ...], resolutions: Tuple[Tuple[Any, Tuple[int, int]], ...] = ()):
+        self.values = values
+        # ((weakref to viewport_api, (width, height)), ...)
+        self.resolutions = resolutions
+
+    def as_dict(self):
+        return {path: value for path, value in zip(MANAGED_SETTINGS, self.values) if value is not None}
+
+
+def take_snapshot(*viewport_apis) -> SettingsSnapshot:
+    """Capture the managed settings and the resolution of the given viewports."""
+    # Values still waiting in the writer are what the user last asked for
+    writer = get_settings_writer()
+    settings = carb.settings.get_settings()
+    values = tuple(writer.pending(path, settings.get(path)) for path in MANAGED_SETTINGS)
+    cache = get_viewport_cache()
+    resolutions = tuple(
+        (weakref.ref(api), writer.pending_resolution(api) or cache.state(api).resolution) for api in viewport_apis
+    )
+    return SettingsSnapshot(values, resolutions)
+
+
+def restore_snapshot(snapshot: SettingsSnapshot):
+    """Write back, in one batch, only the settings that differ from the
+    snapshot. Resolutions are only touched on viewports where they changed.
+    """
+    with settings_batch() as batch:
+        batch.update(snapshot.as_dict())
+
+    cache = get_viewport_cache()
+    for viewport_api_ref, resolution in snapshot.resolutions:
+        viewport_api = viewport_api_ref()
+        if viewport_api is None:
+            continue
+        state = cache.state(viewport_api)
+        if state.resolution != resolution:
+            state.set_resolution(resolution)
@@ -6,7 +6,7 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 #
-__all__ = ["julia_modeler_style"]
+__all__ = ["get_style"]
 
 from omni.ui import color as cl
 from omni.ui import constant as fl
@@ -14,10 +14,7 @@ from omni.ui import url
 import omni.kit.app
 import omni.ui as ui
 import pathlib
-
-EXTENSION_FOLDER_PATH = pathlib.Path(
-    omni.kit.app.get_app().get_extension_manager().get_extension_path_by_module(__name__)
-)
+from typing import Optional
 
 ATTR_LABEL_WIDTH = 1
 BLOCK_HEIGHT = 22
@@ -57,159 +54,186 @@ fl.radio_group_font_size = 14
 fl.collapsable_header_font_size = 17.5
 fl.range_text_size = 10
 
-url.closed_arrow_icon = f"{EXTENSION_FOLDER_PATH}/icons/closed.svg"
-url.open_arrow_icon = f"{EXTENSION_FOLDER_PATH}/icons/opened.svg"
-url.revert_arrow_icon = f"{EXTENSION_FOLDER_PATH}/icons/revert_arrow.svg"
-url.checkbox_on_icon = f"{EXTENSION_FOLDER_PATH}/icons/checkbox_on.svg"
-url.checkbox_off_icon = f"{EXTENSION_FOLDER_PATH}/icons/checkbox_off.svg"
-url.radio_btn_on_icon = f"{EXTENSION_FOLDER_PATH}/icons/radio_btn_on.svg"
-url.radio_btn_off_icon = f"{EXTENSION_FOLDER_PATH}/icons/radio_btn_off.svg"
-url.diag_bg_lines_texture = f"{EXTENSION_FOLDER_PATH}/icons/diagonal_texture_screenshot.png"
-
-# The main style dict
-julia_modeler_style = {
-    "Button::tool_button": {
-        "background_color": cl.field_bg,
-        "margin_height": 0,
-        "margin_width": 6,
-        "border_color": cl.btn_border,
-        "border_width": fl.border_width,
-        "font_size": fl.field_text_font_size,
-    },
-    "CollapsableFrame::group": {
-        "margin_height": fl.collapsable_group_spacing,
-        "background_color": cl.transparent,
-    },
-    # TODO: For some reason this ColorWidget style doesn't respond much, if at all (ie, border_radius, corner_flag)
-    "ColorWidget": {
-        "border_radius": fl.border_radius,
-        "border_color": cl(0.0, 0.0, 0.0, 0.0),
-    },
-    "Field": {
-        "background_color": cl.field_bg,
-        "border_radius": fl.border_radius,
-        "border_color": cl.field_border,
-        "border_width": fl.border_width,
-    },
-    "Field::attr_field": {
-        "corner_flag": ui.CornerFlag.RIGHT,
-        "font_size": 2,  # fl.field_text_font_size,  # Hack to allow for a smaller field border until field padding works
-    },
-    "Field::attribute_color": {
-        "font_size": fl.field_text_font_size,
-    },
-    "Field::multi_attr_field": {
-        "padding": 4,  # TODO: Hacky until we get padding fix
-        "font_size": fl.field_text_font_size,
-    },
-    "Field::path_field": {
-        "corner_flag": ui.CornerFlag.RIGHT,
-        "font_size": fl.field_text_font_size,
-    },
-    "HeaderLine": {"color": cl(.5, .5, .5, .5)},
-    "Image::collapsable_opened": {
-        "color": cl.collapsible_header_text,
-        "image_url": url.open_arrow_icon,
-    },
-    "Image::collapsable_opened:hovered": {
-        "color": cl.collapsible_header_text_hover,
-        "image_url": url.open_arrow_icon,
-    },
-    "Image::collapsable_closed": {
-        "color": cl.collapsible_header_text,
-        "image_url": url.closed_arrow_icon,
-    },
-    "Image::collapsable_closed:hovered": {
-        "color": cl.collapsible_header_text_hover,
-        "image_url": url.closed_arrow_icon,
-    },
-    "Image::radio_on": {"image_url": url.radio_btn_on_icon},
-    "Image::radio_off": {"image_url": url.radio_btn_off_icon},
-    "Image::revert_arrow": {
-        "image_url": url.revert_arrow_icon,
-        "color": cl.revert_arrow_enabled,
-    },
-    "Image::revert_arrow:disabled": {"color": cl.revert_arrow_disabled},
-    "Image::checked": {"image_url": url.checkbox_on_icon},
-    "Image::unchecked": {"image_url": url.checkbox_off_icon},
-    "Image::slider_bg_texture": {
-        "image_url": url.diag_bg_lines_texture,
-        "border_radius": fl.border_radius,
-        "corner_flag": ui.CornerFlag.LEFT,
-    },
-    "Label::attribute_name": {
-        "alignment": ui.Alignment.RIGHT_TOP,
-        "margin_height": fl.attr_label_v_spacing,
-        "margin_width": fl.main_label_attr_hspacing,
-        "color": cl.main_attr_label_text,
-        "font_size": fl.main_label_font_size,
-    },
-    "Label::attribute_name:hovered": {"color": cl.main_attr_label_text_hover},
-    "Label::collapsable_name": {"font_size": fl.collapsable_header_font_size},
-    "Label::multi_attr_label": {
-        "color": cl.multifield_label_text,
-        "font_size": fl.multi_attr_label_font_size,
-    },
-    "Label::radio_group_name": {
-        "font_size": fl.radio_group_font_size,
-        "alignment": ui.Alignment.CENTER,
-        "color": cl.main_attr_label_text,
-    },
-    "Label::range_text": {
-        "font_size": fl.range_text_size,
-    },
-    "Label::window_title": {
-        "font_size": fl.window_title_font_size,
-        "color": cl.window_title_text,
-    },
-    "ScrollingFrame::window_bg": {
-        "background_color": cl.window_bg_color,
-        "padding": fl.outer_frame_padding,
-        "border_radius": 20  # Not obvious in a window, but more visible with only a frame
-    },
-    "Slider::attr_slider": {
-        "draw_mode": ui.SliderDrawMode.FILLED,
-        "padding": 0,
-        "color": cl.transparent,
-        # Meant to be transparent, but completely transparent shows opaque black instead.
-        "background_color": cl(0.28, 0.28, 0.28, 0.01),
-        "secondary_color": cl.slider_fill,
-        "border_radius": fl.border_radius,
-        "corner_flag": ui.CornerFlag.LEFT,  # TODO: Not actually working yet OM-53727
-    },
-    "Slider::attr_slider2": {
-        "draw_mode": ui.SliderDrawMode.HANDLE,
-        "padding": 0,
-        "color": cl.transparent,
-        # Meant to be transparent, but completely transparent shows opaque black instead.
-        "background_color": cl(0.68, 0.28, 0.28, 0.01),
-        "secondary_color": cl.slider_fill,
-        "border_radius": fl.border_radius,
-        "corner_flag": ui.CornerFlag.LEFT,  # TODO: Not actually working yet OM-53727
-    },
-
-    # Combobox workarounds
-    "Rectangle::combobox": {  # TODO: remove when ComboBox can have a border
-        "background_color": cl.field_bg,
-        "border_radius": fl.border_radius,
-        "border_color": cl.btn_border,
-        "border_width": fl.border_width,
-    },
-
-    "Rectangle::combobox2": {  # TODO: remove when ComboBox can have a border
-
-        "border_radius": fl.border_radius,
-        "border_color": cl.btn_border,
-        "border_width": fl.border_width,
-    },    
-    "ComboBox::dropdown_menu": {
-        "color": cl.combobox_label_text,  # label color
-        "padding_height": 1.25,
-        "margin": 2,
-        "background_color": cl.field_bg,
-        "border_radius": fl.border_radius,
-        "font_size": fl.field_text_font_size,
-        "secondary_color": cl.transparent,  # button background color
-    },
-    "Rectangle::combobox_icon_cover": {"background_color": cl.field_bg}
-}
+_style: Optional[dict] = None
+
+
+def _build_style() -> dict:
+    # Asking the extension manager for our folder is the slow part of importing
+    # this module, so it waits until the window actually needs the style
+    extension_folder_path = pathlib.Path(
+        omni.kit.app.get_app().get_extension_manager().get_extension_path_by_module(__name__)
+    )
+
+    url.closed_arrow_icon = f"{extension_folder_path}/icons/closed.svg"
+    url.open_arrow_icon = f"{extension_folder_path}/icons/opened.svg"
+    url.revert_arrow_icon = f"{extension_folder_path}/icons/revert_arrow.svg"
+    url.checkbox_on_icon = f"{extension_folder_path}/icons/checkbox_on.svg"
+    url.checkbox_off_icon = f"{extension_folder_path}/icons/checkbox_off.svg"
+    url.radio_btn_on_icon = f"{extension_folder_path}/icons/radio_btn_on.svg"
+    url.radio_btn_off_icon = f"{extension_folder_path}/icons/radio_btn_off.svg"
+    # diagonal_texture_screenshot.png tiled the way the sliders used to lay it out, at 2x the field height
+    url.diag_bg_lines_texture = f"{extension_folder_path}/icons/diagonal_texture_tiled.png"
+
+    # The main style dict
+    return {
+        "Button::tool_button": {
+            "background_color": cl.field_bg,
+            "margin_height": 0,
+            "margin_width": 6,
+            "border_color": cl.btn_border,
+            "border_width": fl.border_width,
+            "font_size": fl.field_text_font_size,
+        },
+        "CollapsableFrame::group": {
+            "margin_height": fl.collapsable_group_spacing,
+            "background_color": cl.transparent,
+        },
+        # TODO: For some reason this ColorWidget style doesn't respond much, if at all (ie, border_radius, corner_flag)
+        "ColorWidget": {
+            "border_radius": fl.border_radius,
+            "border_color": cl(0.0, 0.0, 0.0, 0.0),
+        },
+        "Field": {
+            "background_color": cl.field_bg,
+            "border_radius": fl.border_radius,
+            "border_color": cl.field_border,
+            "border_width": fl.border_width,
+        },
+        "Field::attr_field": {
+            "corner_flag": ui.CornerFlag.RIGHT,
+            # fl.field_text_font_size
+            "font_size": 2,  # Hack to allow for a smaller field border until field padding works
+        },
+        "Field::attribute_color": {
+            "font_size": fl.field_text_font_size,
+        },
+        "Field::multi_attr_field": {
+            "padding": 4,  # TODO: Hacky until we get padding fix
+            "font_size": fl.field_text_font_size,
+        },
+        "Field::path_field": {
+            "corner_flag": ui.CornerFlag.RIGHT,
+            "font_size": fl.field_text_font_size,
+        },
+        "HeaderLine": {"color": cl(.5, .5, .5, .5)},
+        "Image::collapsable_opened": {
+            "color": cl.collapsible_header_text,
+            "image_url": url.open_arrow_icon,
+        },
+        "Image::collapsable_opened:hovered": {
+            "color": cl.collapsible_header_text_hover,
+            "image_url": url.open_arrow_icon,
+        },
+        "Image::collapsable_closed": {
+            "color": cl.collapsible_header_text,
+            "image_url": url.closed_arrow_icon,
+        },
+        "Image::collapsable_closed:hovered": {
+            "color": cl.collapsible_header_text_hover,
+            "image_url": url.closed_arrow_icon,
+        },
+        "Image::radio_on": {"image_url": url.radio_btn_on_icon},
+        "Image::radio_off": {"image_url": url.radio_btn_off_icon},
+        "Image::revert_arrow": {
+            "image_url": url.revert_arrow_icon,
+            "color": cl.revert_arrow_enabled,
+        },
+        "Image::revert_arrow:disabled": {"color": cl.revert_arrow_disabled},
+        "Image::checked": {"image_url": url.checkbox_on_icon},
+        "Image::unchecked": {"image_url": url.checkbox_off_icon},
+        "Image::slider_bg_texture": {
+            "image_url": url.diag_bg_lines_texture,
+            "border_radius": fl.border_radius,
+            "corner_flag": ui.CornerFlag.LEFT,
+        },
+        "Label::attribute_name": {
+            "alignment": ui.Alignment.RIGHT_TOP,
+            "margin_height": fl.attr_label_v_spacing,
+            "margin_width": fl.main_label_attr_hspacing,
+            "color": cl.main_attr_label_text,
+            "font_size": fl.main_label_font_size,
+        },
+        "Label::attribute_name:hovered": {"color": cl.main_attr_label_text_hover},
+        "Label::collapsable_name": {"font_size": fl.collapsable_header_font_size},
+        "Label::multi_attr_label": {
+            "color": cl.multifield_label_text,
+            "font_size": fl.multi_attr_label_font_size,
+        },
+        "Label::radio_group_name": {
+            "font_size": fl.radio_group_font_size,
+            "alignment": ui.Alignment.CENTER,
+            "color": cl.main_attr_label_text,
+        },
+        "Label::range_text": {
+            "font_size": fl.range_text_size,
+        },
+        "Label::window_title": {
+            "font_size": fl.window_title_font_size,
+            "color": cl.window_title_text,
+        },
+        "ScrollingFrame::window_bg": {
+            "background_color": cl.window_bg_color,
+            "padding": fl.outer_frame_padding,
+            "border_radius": 20  # Not obvious in a window, but more visible with only a frame
+        },
+        "Slider::attr_slider": {
+            "draw_mode": ui.SliderDrawMode.FILLED,
+            "padding": 0,
+            "color": cl.transparent,
+            # Meant to be transparent, but completely transparent shows opaque black instead.
+            "background_color": cl(0.28, 0.28, 0.28, 0.01),
+            "secondary_color": cl.slider_fill,
+            "border_radius": fl.border_radius,
+            "corner_flag": ui.CornerFlag.LEFT,  # TODO: Not actually working yet OM-53727
+        },
+        "Slider::attr_slider2": {
+            "draw_mode": ui.SliderDrawMode.HANDLE,
+            "padding": 0,
+            "color": cl.transparent,
+            # Meant to be transparent, but completely transparent shows opaque black instead.
+            "background_color": cl(0.68, 0.28, 0.28, 0.01),
+            "secondary_color": cl.slider_fill,
+            "border_radius": fl.border_radius,
+            "corner_flag": ui.CornerFlag.LEFT,  # TODO: Not actually working yet OM-53727
+        },
+
+        # Combobox workarounds
+        "Rectangle::combobox": {  # TODO: remove when ComboBox can have a border
+            "background_color": cl.field_bg,
+            "border_radius": fl.border_radius,
+            "border_color": cl.btn_border,
+            "border_width": fl.border_width,
+        },
+
+        "Rectangle::combobox2": {  # TODO: remove when ComboBox can have a border
+
+            "border_radius": fl.border_radius,
+            "border_color": cl.btn_border,
+            "border_width": fl.border_width,
+        },    
+        "ComboBox::dropdown_menu": {
+            "color": cl.combobox_label_text,  # label color
+            "padding_height": 1.25,
+            "margin": 2,
+            "background_color": cl.field_bg,
+            "border_radius": fl.border_radius,
+            "font_size": fl.field_text_font_size,
+            "secondary_color": cl.transparent,  # button background color
+        },
+        "Rectangle::combobox_icon_cover": {"background_color": cl.field_bg}
+    }
+
+
+def get_style() -> dict:
+    """The window style, built on first use"""
+    global _style
+    if _style is None:
+        _style = _build_style()
+    return _style
+
+
+def __getattr__(name):
+    # julia_modeler_style used to be built at import time, keep it importable by name
+    if name == "julia_modeler_style":
+        return get_style()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1 +1,25 @@
-from .test_hello_world import *
\ No newline at end of file
+from .test_settings_writer import *
+from .test_settings_batch import *
+from .test_snapshot import *
+from .test_interactive_lod import *
+from .test_deferred_resolution import *
+from .test_aspect import *
+from .test_resolution_planner import *
+from .test_frame_governor import *
+from .test_viewport_cache import *
+from .test_setting_slider import *
+from .test_slider_background import *
+from .test_startup import *
+from .test_resources import *
+from .test_reload_soak import *
+from .test_undo import *
+from .test_presets import *
+from .test_profiles import *
+from .test_camera_profiles import *
+from .test_lens_graph import *
+from .test_tracks import *
+from .test_shots import *
+from .test_ab_compare import *
+from .test_write_scheduler import *
+from .test_core import *
+from .test_settings_binding import *
\ No newline at end of file
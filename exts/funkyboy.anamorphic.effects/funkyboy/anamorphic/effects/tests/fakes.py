@@ -0,0 +1,58 @@
+"""Stand-ins for the Kit objects the tests drive"""
+
+
+class FakeClock:
+    """A clock that only moves when the test sets now"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeViewportApi:
+    """The parts of a viewport API the extension uses, counting queries and resizes"""
+
+    def __init__(self, resolution=(1920, 1080), stage=None, camera_path=None):
+        self._resolution = resolution
+        self.texture_resolution = resolution
+        self.stage = stage
+        self.camera_path = camera_path
+        self.resizes = []
+        self.queries = 0
+        self.view_changed_fn = None
+
+    @property
+    def resolution(self):
+        self.queries += 1
+        return self._resolution
+
+    @resolution.setter
+    def resolution(self, value):
+        self._resolution = value
+        self.texture_resolution = value
+        self.resizes.append(value)
+
+    def get_texture_resolution(self):
+        self.queries += 1
+        return self.texture_resolution
+
+    def subscribe_to_view_change(self, fn):
+        self.view_changed_fn = fn
+        return object()
+
+    def resize_window(self, resolution):
+        """What the viewport sees when the user resizes its window"""
+        self._resolution = resolution
+        self.texture_resolution = resolution
+        self._view_changed()
+
+    def cut_to(self, camera_path):
+        """What the viewport sees when the active camera changes"""
+        self.camera_path = camera_path
+        self._view_changed()
+
+    def _view_changed(self):
+        if self.view_changed_fn is not None:
+            self.view_changed_fn(self)
@@ -0,0 +1,31 @@
+"""A fresh Python interpreter for checks the test process has already spoiled by importing"""
+
+import os
+import subprocess
+import sys
+import unittest
+from typing import Optional
+
+
+def python_executable() -> Optional[str]:
+    """The interpreter to start, None if there is none; inside Kit sys.executable is the kit binary"""
+    candidates = [os.path.join(sys.prefix, "bin", "python3"), os.path.join(sys.prefix, "python.exe")]
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        candidates.insert(0, sys.executable)
+    for path in candidates:
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    return None
+
+
+def run_python(script: str) -> str:
+    """Run script in a fresh interpreter on this process's sys.path and return what it printed.
+
+    Raises unittest.SkipTest when no interpreter can be found.
+    """
+    executable = python_executable()
+    if executable is None:
+        raise unittest.SkipTest(f"No Python interpreter next to {sys.executable}")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    result = subprocess.run([executable, "-c", script], env=env, stdout=subprocess.PIPE, check=True)
+    return result.stdout.decode()
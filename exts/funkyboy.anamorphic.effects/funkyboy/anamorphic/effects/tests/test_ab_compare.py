@@ -0,0 +1,39 @@
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.ab_compare import ABCompare, Look
+from funkyboy.anamorphic.effects.snapshot import MANAGED_SETTINGS
+
+
+def _look(ratio=2.39, policy=None, **values):
+    # Defaults for every managed setting, overridden by name (last path component)
+    defaults = {"enabled": True, "anisotropy": 0.5, "sensorDiagonal": 60.0, "sensorAspectRatio": 1.5,
+                "flareScale": 0.1, "blades": 6, "apertureRotation": 50.0}
+    defaults.update(values)
+    return Look(tuple(defaults[path.rsplit("/", 1)[1]] for path in MANAGED_SETTINGS), ratio, policy)
+
+
+class TestABCompare(omni.kit.test.AsyncTestCase):
+    async def test_changes_are_only_differing_keys(self):
+        a = _look()
+        b = _look(flareScale=0.3, blades=9)
+        self.assertEqual(
+            a.changes_to(b), {"/rtx/post/lensFlares/flareScale": 0.3, "/rtx/post/lensFlares/blades": 9}
+        )
+        self.assertEqual(a.changes_to(_look(flareScale=0.1 + 1e-12)), {})
+        self.assertTrue(a.same_aspect(b))
+        self.assertFalse(a.same_aspect(_look(ratio=1.85)))
+
+    async def test_flip_keeps_edits_of_each_side(self):
+        ab = ABCompare()
+        a = _look()
+        # First flip: B starts as a copy of A
+        self.assertIs(ab.flip(a), a)
+        self.assertEqual(ab.active, "B")
+        # Edited while on B, then back to A
+        b = _look(anisotropy=0.8, ratio=2.76)
+        self.assertIs(ab.flip(b), a)
+        self.assertEqual(ab.active, "A")
+        self.assertIs(ab.flip(a), b)
+        self.assertIs(ab.look("B"), b)
+        ab.clear()
+        self.assertIsNone(ab.look("A"))
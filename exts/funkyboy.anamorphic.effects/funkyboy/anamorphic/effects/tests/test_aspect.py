@@ -0,0 +1,157 @@
+from unittest import mock
+
+import carb.settings
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.aspect import (
+    ALL_VIEWPORTS_SETTING,
+    ASPECT_MODE_SETTING,
+    PIXEL_BUDGET_SETTING,
+    RESOLUTION_ALIGN_SETTING,
+    RESOLUTION_POLICY_SETTING,
+    AspectController,
+)
+from funkyboy.anamorphic.effects.deferred_resolution import ENABLED_SETTING as DEFERRED_SETTING
+from funkyboy.anamorphic.effects.write_scheduler import ENABLED_SETTING as SCHEDULER_SETTING
+
+from .fakes import FakeViewportApi
+
+SETTINGS = {
+    ASPECT_MODE_SETTING: "resize",
+    ALL_VIEWPORTS_SETTING: False,
+    RESOLUTION_POLICY_SETTING: "width",
+    RESOLUTION_ALIGN_SETTING: 8,
+    PIXEL_BUDGET_SETTING: 0,
+    DEFERRED_SETTING: False,
+    SCHEDULER_SETTING: False,
+}
+
+
+class FakeFrame:
+    def __init__(self):
+        self.visible = False
+
+    def set_build_fn(self, fn):
+        pass
+
+    def set_computed_content_size_changed_fn(self, fn):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def clear(self):
+        pass
+
+
+class FakeViewportWindow:
+    def __init__(self, resolution):
+        self.viewport_api = FakeViewportApi(resolution)
+        self.frame = FakeFrame()
+
+    def get_frame(self, name):
+        return self.frame
+
+
+class TestAspect(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._settings = carb.settings.get_settings()
+        self._saved = {path: self._settings.get(path) for path in SETTINGS}
+        for path, value in SETTINGS.items():
+            self._settings.set(path, value)
+        self._controller = AspectController()
+
+    async def tearDown(self):
+        self._controller.destroy()
+        for path, value in self._saved.items():
+            if value is not None:
+                self._settings.set(path, value)
+
+    async def test_resize_plans_from_the_full_frame(self):
+        window = FakeViewportWindow((1920, 1080))
+        self.assertEqual(self._controller.apply(window, 2.39), (1920, 800))
+        self.assertEqual(window.viewport_api.resolution, (1920, 800))
+        # Not from the 1920 x 800 the last ratio left
+        self.assertEqual(self._controller.apply(window, 16 / 9), (1920, 1080))
+
+    async def test_base_follows_outside_resizes(self):
+        window = FakeViewportWindow((1920, 1080))
+        self._controller.apply(window, 2.39)
+        # The controller's own resize and a camera cut keep the full frame
+        window.viewport_api._view_changed()
+        window.viewport_api.cut_to("/World/Camera")
+        self.assertEqual(self._controller.apply(window, 16 / 9), (1920, 1080))
+
+        window.viewport_api.resize_window((1280, 720))
+        self.assertEqual(self._controller.apply(window, 2.39), (1280, 536))
+
+    async def test_crop_only_removes_pixels(self):
+        self._controller.set_mode("crop")
+        window = FakeViewportWindow((1920, 1080))
+        self.assertEqual(self._controller.apply(window, 2.39), (1920, 800))
+        # Narrower than the frame: nothing to take off the height
+        self.assertEqual(self._controller.apply(window, 1.0), (1920, 1080))
+
+    async def test_resize_and_crop_differ(self):
+        window = FakeViewportWindow((1920, 1080))
+        self.assertEqual(self._controller.apply(window, 1.0), (1920, 1920))
+        self._controller.set_mode("crop")
+        self.assertEqual(self._controller.apply(window, 1.0), (1920, 1080))
+
+    async def test_matte_keeps_the_render_resolution(self):
+        window = FakeViewportWindow((1920, 1080))
+        self._controller.apply(window, 2.39)
+        self._controller.set_mode("matte", window)
+        # Back to the full frame, which the matte goes over
+        self.assertEqual(window.viewport_api.resolution, (1920, 1080))
+        resizes = len(window.viewport_api.resizes)
+
+        self.assertEqual(self._controller.apply(window, 2.39), (1920, 1080))
+        self.assertEqual(len(window.viewport_api.resizes), resizes)
+        self.assertTrue(window.frame.visible)
+
+        self._controller.set_mode("resize", window, 2.39)
+        self.assertFalse(window.frame.visible)
+        self.assertEqual(window.viewport_api.resolution, (1920, 800))
+
+    async def test_all_viewports(self):
+        active = FakeViewportWindow((1920, 1080))
+        other = FakeViewportWindow((1280, 720))
+        self._controller.all_viewports = True
+        with mock.patch("omni.kit.viewport.window.get_viewport_window_instances", return_value=[other, active]):
+            self.assertEqual(self._controller.viewport_windows(active), [other, active])
+            self.assertEqual(self._controller.apply(active, 2.39), (1920, 800))
+        # Each one planned from its own frame
+        self.assertEqual(other.viewport_api.resolution, (1280, 536))
+
+        self._controller.all_viewports = False
+        self.assertEqual(self._controller.viewport_windows(active), [active])
+
+    async def test_all_viewports_matte(self):
+        active = FakeViewportWindow((1920, 1080))
+        other = FakeViewportWindow((1280, 720))
+        self._controller.all_viewports = True
+        with mock.patch("omni.kit.viewport.window.get_viewport_window_instances", return_value=[active, other]):
+            self._controller.apply(active, 2.39)
+            self._controller.set_mode("matte", active)
+            # Every viewport goes back to its own full frame, and gets a matte
+            self.assertEqual(active.viewport_api.resolution, (1920, 1080))
+            self.assertEqual(other.viewport_api.resolution, (1280, 720))
+            self._controller.apply(active, 2.39)
+        self.assertTrue(active.frame.visible)
+        self.assertTrue(other.frame.visible)
+
+    async def test_restore_state(self):
+        window = FakeViewportWindow((1920, 1080))
+        self._controller.apply(window, 2.39)
+        state = self._controller.state()
+        self._controller.set_mode("crop")
+        self._controller.apply(window, 1.0)
+
+        restored = []
+        subscription = self._controller.subscribe_restored(lambda: restored.append(True))
+        self._controller.restore(state)
+        subscription.unsubscribe()
+        self.assertEqual(self._controller.state(), ("resize", 2.39, None))
+        self.assertEqual(window.viewport_api.resolution, (1920, 800))
+        self.assertEqual(restored, [True])
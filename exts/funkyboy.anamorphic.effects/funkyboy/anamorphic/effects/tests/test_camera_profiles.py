@@ -0,0 +1,78 @@
+import carb.settings
+import omni.kit.test
+from pxr import Usd, UsdGeom
+
+from funkyboy.anamorphic.effects.camera_profiles import (
+    ENABLED_SETTING,
+    CameraProfileCache,
+    CameraProfileFollower,
+    get_camera_profile_cache,
+    read_camera_profile,
+    write_camera_profile,
+)
+
+from .fakes import FakeViewportApi
+
+ANISOTROPY = "/rtx/post/dof/anisotropy"
+BLADES = "/rtx/post/lensFlares/blades"
+
+
+class TestCameraProfiles(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._stage = Usd.Stage.CreateInMemory()
+        self._wide = UsdGeom.Camera.Define(self._stage, "/World/Wide").GetPrim()
+        self._close = UsdGeom.Camera.Define(self._stage, "/World/Close").GetPrim()
+        UsdGeom.Camera.Define(self._stage, "/World/Plain")
+
+    async def test_write_and_read(self):
+        write_camera_profile(self._wide, {ANISOTROPY: 0.8, BLADES: 7.4, "/not/a/lens/setting": 1}, 2.39)
+        profile = read_camera_profile(self._wide)
+        self.assertAlmostEqual(profile.values[ANISOTROPY], 0.8, places=5)
+        self.assertEqual(profile.values[BLADES], 7)
+        self.assertAlmostEqual(profile.ratio, 2.39, places=5)
+        self.assertIsNone(read_camera_profile(self._stage.GetPrimAtPath("/World/Plain")))
+
+    async def test_cache_invalidated_by_own_attributes_only(self):
+        write_camera_profile(self._wide, {ANISOTROPY: 0.8})
+        cache = CameraProfileCache()
+        try:
+            self.assertAlmostEqual(cache.profile(self._stage, "/World/Wide").values[ANISOTROPY], 0.8, places=5)
+            cache.profile(self._stage, "/World/Wide")
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+            # Moving the camera keeps the entry
+            UsdGeom.Xformable(self._wide).AddTranslateOp().Set((0.0, 1.0, 0.0))
+            cache.profile(self._stage, "/World/Wide")
+            self.assertEqual(cache.misses, 1)
+
+            write_camera_profile(self._wide, {ANISOTROPY: 0.3})
+            self.assertAlmostEqual(cache.profile(self._stage, "/World/Wide").values[ANISOTROPY], 0.3, places=5)
+            self.assertEqual(cache.misses, 2)
+
+            # Removing the prim is a prim resync
+            self._stage.RemovePrim("/World/Wide")
+            self.assertIsNone(cache.profile(self._stage, "/World/Wide"))
+            self.assertEqual(cache.misses, 3)
+        finally:
+            cache.destroy()
+
+    async def test_follower_applies_on_camera_cut(self):
+        settings = carb.settings.get_settings()
+        enabled = settings.get(ENABLED_SETTING)
+        settings.set(ENABLED_SETTING, True)
+        write_camera_profile(self._wide, {ANISOTROPY: 0.2}, 2.39)
+        write_camera_profile(self._close, {ANISOTROPY: 0.9})
+        applied = []
+        follower = CameraProfileFollower(lambda profile: applied.append(profile.name))
+        viewport_api = FakeViewportApi(stage=self._stage, camera_path="/World/Wide")
+        try:
+            follower.start(viewport_api)
+            viewport_api.cut_to("/World/Wide")
+            viewport_api.cut_to("/World/Plain")
+            viewport_api.cut_to("/World/Close")
+            viewport_api.cut_to("/World/Wide")
+            self.assertEqual(applied, ["/World/Wide", "/World/Close", "/World/Wide"])
+            self.assertGreater(get_camera_profile_cache().hits, 0)
+        finally:
+            follower.destroy()
+            settings.set(ENABLED_SETTING, bool(enabled))
@@ -0,0 +1,93 @@
+import carb.settings
+import omni.kit.test
+
+from funkyboy.anamorphic.effects import core
+from funkyboy.anamorphic.effects.aspect import RESOLUTION_ALIGN_SETTING
+from funkyboy.anamorphic.effects.defaults import apply_defaults, extension_settings
+from funkyboy.anamorphic.effects.frame_governor import ENABLED_SETTING as GOVERNOR_SETTING
+from funkyboy.anamorphic.effects.frame_governor import get_frame_governor, release_frame_governor
+from funkyboy.anamorphic.effects.profiles import PROFILE_FOLDERS_SETTING, LensProfile
+
+from .interpreter import run_python
+
+ANISOTROPY = "/rtx/post/dof/anisotropy"
+FLARES_ENABLED = "/rtx/post/lensFlares/enabled"
+BLADES = "/rtx/post/lensFlares/blades"
+
+
+def _modules_after_import(module):
+    """The modules a fresh interpreter has loaded once it imported module"""
+    return set(run_python(f"import sys, {module}; print(chr(10).join(sys.modules))").split())
+
+
+class TestCore(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        settings = carb.settings.get_settings()
+        self._previous = {
+            path: settings.get(path) for path in (ANISOTROPY, FLARES_ENABLED, BLADES, GOVERNOR_SETTING)
+        }
+        settings.set(ANISOTROPY, 0.0)
+        settings.set(FLARES_ENABLED, False)
+        settings.set(BLADES, 8)
+
+    async def tearDown(self):
+        if core.is_enabled():
+            core.disable()
+        release_frame_governor()
+        settings = carb.settings.get_settings()
+        for path, value in self._previous.items():
+            if value is not None:
+                settings.set(path, value)
+
+    async def test_imports_no_ui(self):
+        modules = _modules_after_import("funkyboy.anamorphic.effects.core")
+        self.assertIn("funkyboy.anamorphic.effects.core", modules)
+        self.assertNotIn("funkyboy.anamorphic.effects.extension", modules)
+        self.assertNotIn("funkyboy.anamorphic.effects.window", modules)
+        for name in modules:
+            self.assertFalse(name.startswith(("omni.ui", "omni.ext", "omni.client", "omni.kit", "pxr", "numpy")), name)
+
+    async def test_enable_disable_restores(self):
+        settings = carb.settings.get_settings()
+        core.enable()
+        self.assertTrue(core.is_enabled())
+        self.assertTrue(settings.get(FLARES_ENABLED))
+        self.assertEqual(settings.get(BLADES), 3)
+        core.disable()
+        self.assertFalse(core.is_enabled())
+        self.assertFalse(settings.get(FLARES_ENABLED))
+        self.assertEqual(settings.get(BLADES), 8)
+
+    async def test_governor_runs_while_enabled(self):
+        carb.settings.get_settings().set(GOVERNOR_SETTING, True)
+        core.enable()
+        self.assertTrue(get_frame_governor().running)
+        core.disable()
+        self.assertFalse(get_frame_governor().running)
+
+        carb.settings.get_settings().set(GOVERNOR_SETTING, False)
+        core.enable()
+        self.assertFalse(get_frame_governor().running)
+
+    async def test_apply_profile(self):
+        profile = LensProfile("Test", {ANISOTROPY: 0.7, BLADES: 5})
+        self.assertIs(core.apply_profile(profile), profile)
+        self.assertAlmostEqual(carb.settings.get_settings().get(ANISOTROPY), 0.7)
+        with self.assertRaises(KeyError):
+            core.apply_profile("No Such Profile")
+        with self.assertRaises(ValueError):
+            core.set_aspect("no_such_preset")
+
+    async def test_headless_defaults(self):
+        self.assertEqual(extension_settings()[RESOLUTION_ALIGN_SETTING], 8)
+        settings = carb.settings.get_settings()
+        folders = settings.get(PROFILE_FOLDERS_SETTING)
+        settings.destroy_item(PROFILE_FOLDERS_SETTING)
+        try:
+            apply_defaults()
+            self.assertEqual(settings.get(PROFILE_FOLDERS_SETTING), extension_settings()[PROFILE_FOLDERS_SETTING])
+        finally:
+            if folders is not None:
+                settings.set(PROFILE_FOLDERS_SETTING, folders)
+        # The example from the core docstring
+        self.assertEqual(core.apply_profile("Classic Scope", aspect=False).name, "Classic Scope")
@@ -0,0 +1,78 @@
+import carb.settings
+import omni.kit.app
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.deferred_resolution import ENABLED_SETTING, IDLE_TIMEOUT_SETTING, DeferredResolution
+from funkyboy.anamorphic.effects.write_scheduler import ENABLED_SETTING as SCHEDULER_SETTING
+
+from .fakes import FakeClock, FakeViewportApi
+
+
+class TestDeferredResolution(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._settings = carb.settings.get_settings()
+        self._saved = {
+            path: self._settings.get(path) for path in (ENABLED_SETTING, IDLE_TIMEOUT_SETTING, SCHEDULER_SETTING)
+        }
+        self._settings.set(ENABLED_SETTING, True)
+        self._settings.set(IDLE_TIMEOUT_SETTING, 0.3)
+        self._settings.set(SCHEDULER_SETTING, False)
+
+    async def tearDown(self):
+        for path, value in self._saved.items():
+            if value is not None:
+                self._settings.set(path, value)
+
+    async def test_drag_resizes_once_on_commit(self):
+        viewport_api = FakeViewportApi((1920, 1080))
+        deferred = DeferredResolution(FakeClock())
+        try:
+            for height in range(1000, 800, -10):
+                deferred.request(viewport_api, (1920, height))
+            self.assertEqual(viewport_api.resizes, [])
+            self.assertEqual(deferred.pending(viewport_api), (1920, 810))
+
+            deferred.commit()
+            self.assertEqual(viewport_api.resizes, [(1920, 810)])
+            self.assertIsNone(deferred.pending(viewport_api))
+        finally:
+            deferred.destroy()
+
+    async def test_commit_skips_unchanged_viewports(self):
+        viewport_api = FakeViewportApi((1920, 1080))
+        deferred = DeferredResolution(FakeClock())
+        try:
+            # A float size from the planner lands on the same pixels
+            deferred.request(viewport_api, (1920.2, 1079.8))
+            deferred.commit()
+            self.assertEqual(viewport_api.resizes, [])
+            self.assertEqual((deferred.commits, deferred.skipped), (0, 1))
+        finally:
+            deferred.destroy()
+
+    async def test_commits_after_idle_timeout(self):
+        app = omni.kit.app.get_app()
+        viewport_api = FakeViewportApi((1920, 1080))
+        clock = FakeClock()
+        deferred = DeferredResolution(clock)
+        try:
+            deferred.request(viewport_api, (1920, 800))
+            clock.now = 0.2
+            await app.next_update_async()
+            self.assertEqual(viewport_api.resizes, [])
+
+            clock.now = 0.31
+            await app.next_update_async()
+            self.assertEqual(viewport_api.resizes, [(1920, 800)])
+        finally:
+            deferred.destroy()
+
+    async def test_disabled_applies_immediately(self):
+        self._settings.set(ENABLED_SETTING, False)
+        viewport_api = FakeViewportApi((1920, 1080))
+        deferred = DeferredResolution(FakeClock())
+        try:
+            deferred.request(viewport_api, (1920, 800))
+            self.assertEqual(viewport_api.resizes, [(1920, 800)])
+        finally:
+            deferred.destroy()
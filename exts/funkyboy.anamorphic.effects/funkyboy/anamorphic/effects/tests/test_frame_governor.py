@@ -0,0 +1,62 @@
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.frame_governor import ClockFrameTimer, FrameGovernor
+
+
+class SyntheticFrames:
+    """Frame time source whose frame cost follows the render scale squared"""
+
+    def __init__(self, full_res_frame_time):
+        self.full_res_frame_time = full_res_frame_time
+        self.scale = 1.0
+
+    def __call__(self):
+        return self.full_res_frame_time * self.scale * self.scale
+
+
+class TestFrameGovernor(omni.kit.test.AsyncTestCase):
+    def _governor(self, frames, **kwargs):
+        def apply(scale):
+            frames.scale = scale
+
+        return FrameGovernor(apply, target_fps=24.0, frame_time_source=frames, window=10, **kwargs)
+
+    async def test_scales_down_when_slow(self):
+        frames = SyntheticFrames(1 / 12)
+        governor = self._governor(frames)
+        for _ in range(200):
+            governor.tick()
+        self.assertLess(governor.scale, 1.0)
+        self.assertGreaterEqual(governor.average_fps or 24.0, 24.0 * 0.85)
+        self.assertTrue(governor.decisions)
+
+    async def test_stays_put_inside_hysteresis_band(self):
+        frames = SyntheticFrames(1 / 26)
+        governor = self._governor(frames)
+        for _ in range(200):
+            governor.tick()
+        self.assertEqual(governor.scale, 1.0)
+        self.assertFalse(governor.decisions)
+
+    async def test_does_not_oscillate(self):
+        frames = SyntheticFrames(1 / 20)
+        governor = self._governor(frames)
+        for _ in range(1000):
+            governor.tick()
+        scales = [decision.scale for decision in governor.decisions]
+        # Settles after stepping down, without bouncing back up
+        self.assertEqual(scales, sorted(scales, reverse=True))
+
+    async def test_respects_min_scale(self):
+        frames = SyntheticFrames(1.0)
+        governor = self._governor(frames, min_scale=0.6)
+        for _ in range(500):
+            governor.tick()
+        self.assertAlmostEqual(governor.scale, 0.6)
+
+    async def test_clock_frame_timer(self):
+        now = [0.0]
+        timer = ClockFrameTimer(lambda: now[0])
+        self.assertEqual(timer(), 0.0)
+        now[0] = 0.04
+        self.assertAlmostEqual(timer(), 0.04)
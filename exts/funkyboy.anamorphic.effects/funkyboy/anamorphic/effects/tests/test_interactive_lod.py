@@ -0,0 +1,87 @@
+from unittest import mock
+
+import carb.settings
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.interactive_lod import (
+    ENABLED_SETTING,
+    OVERRIDES_SETTING,
+    InteractiveLod,
+    parse_overrides,
+)
+from funkyboy.anamorphic.effects.settings_writer import settings_batch
+
+SPECTRAL_BLUR_SAMPLES = "/rtx/post/lensFlares/spectralBlurSamples"
+FLARE_SCALE = "/rtx/post/lensFlares/flareScale"
+
+
+class TestInteractiveLod(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._settings = carb.settings.get_settings()
+        paths = (ENABLED_SETTING, OVERRIDES_SETTING, SPECTRAL_BLUR_SAMPLES, FLARE_SCALE)
+        self._saved = {path: self._settings.get(path) for path in paths}
+        self._settings.set(ENABLED_SETTING, True)
+        self._settings.set(OVERRIDES_SETTING, [f"{SPECTRAL_BLUR_SAMPLES}=0", f"{FLARE_SCALE}=0.05"])
+        self._settings.set(SPECTRAL_BLUR_SAMPLES, 5)
+        self._settings.set(FLARE_SCALE, 0.123456)
+        self._lod = InteractiveLod()
+
+    async def tearDown(self):
+        self._lod.destroy()
+        for path, value in self._saved.items():
+            if value is not None:
+                self._settings.set(path, value)
+
+    async def test_nested_drags_restore_on_the_last_end(self):
+        self._lod.begin()
+        self._lod.begin()
+        self.assertTrue(self._lod.active)
+        self.assertEqual(self._settings.get(SPECTRAL_BLUR_SAMPLES), 0)
+
+        self._lod.end()
+        self.assertTrue(self._lod.active)
+        self.assertEqual(self._settings.get(SPECTRAL_BLUR_SAMPLES), 0)
+
+        self._lod.end()
+        self.assertFalse(self._lod.active)
+        # The exact pre-drag values, not the override or a rounded copy
+        self.assertEqual(self._settings.get(SPECTRAL_BLUR_SAMPLES), 5)
+        self.assertEqual(self._settings.get(FLARE_SCALE), 0.123456)
+
+        # An unmatched end() is ignored
+        self._lod.end()
+        self.assertEqual(self._settings.get(FLARE_SCALE), 0.123456)
+
+    async def test_no_writes_while_dragging(self):
+        with mock.patch(
+            "funkyboy.anamorphic.effects.interactive_lod.settings_batch", wraps=settings_batch
+        ) as batch:
+            self._lod.begin()
+            self.assertEqual(batch.call_count, 1)
+            for _ in range(3):
+                self._lod.begin()
+                self._lod.end()
+            self.assertEqual(batch.call_count, 1)
+            self._lod.end()
+            self.assertEqual(batch.call_count, 2)
+
+    async def test_unknown_keys_are_left_alone(self):
+        missing = "/exts/funkyboy.anamorphic.effects/tests/missingSetting"
+        self._settings.set(OVERRIDES_SETTING, [f"{missing}=1"])
+        self._lod.begin()
+        self.assertFalse(self._lod.active)
+        self.assertIsNone(self._settings.get(missing))
+        self._lod.end()
+
+    async def test_parse_overrides(self):
+        entries = [
+            f"{SPECTRAL_BLUR_SAMPLES}=0",
+            f" {FLARE_SCALE} = 0.05",
+            "/rtx/no/separator",
+            "=3",
+            "/rtx/not/json=fast",
+            "/rtx/empty=",
+        ]
+        self.assertEqual(parse_overrides(entries), {SPECTRAL_BLUR_SAMPLES: 0, FLARE_SCALE: 0.05})
+        self.assertEqual(parse_overrides(None), {})
+        self.assertEqual(parse_overrides([]), {})
@@ -0,0 +1,82 @@
+import carb.settings
+import omni.kit.test
+from pxr import Usd, UsdGeom
+
+from funkyboy.anamorphic.effects.lens_graph import (
+    ENABLED_SETTING,
+    SQUEEZE_SETTING,
+    LensGraphDriver,
+    ParameterGraph,
+    build_lens_graph,
+)
+
+from .fakes import FakeViewportApi
+
+ANISOTROPY = "/rtx/post/dof/anisotropy"
+SENSOR_ASPECT_RATIO = "/rtx/post/lensFlares/sensorAspectRatio"
+SENSOR_DIAGONAL = "/rtx/post/lensFlares/sensorDiagonal"
+
+
+class TestLensGraph(omni.kit.test.AsyncTestCase):
+    async def test_only_dependents_recompute(self):
+        graph = build_lens_graph()
+        graph.update({"squeeze": 2.0, "aspect": 2.39, "focalLength": 50.0, "fStop": 2.8})
+        outputs = graph.evaluate()
+        self.assertAlmostEqual(outputs[ANISOTROPY], 0.5)
+        self.assertAlmostEqual(outputs[SENSOR_ASPECT_RATIO], 1.5)
+        self.assertAlmostEqual(outputs[SENSOR_DIAGONAL], 60.0)
+        self.assertEqual(graph.evaluations, 3)
+
+        graph.set("fStop", 5.6)
+        self.assertEqual(list(graph.evaluate()), [SENSOR_DIAGONAL])
+        self.assertEqual(graph.evaluations, 4)
+
+        # Same values again: nothing to do
+        graph.update({"squeeze": 2.0, "fStop": 5.6})
+        self.assertEqual(graph.evaluate(), {})
+        self.assertEqual(graph.evaluations, 4)
+
+    async def test_unchanged_result_stops_propagation(self):
+        graph = ParameterGraph()
+        graph.add_source("x", 1)
+        graph.add_derived("sign", ("x",), lambda x: 1 if x > 0 else -1)
+        calls = []
+        graph.add_derived("out", ("sign",), lambda sign: calls.append(sign) or sign * 10, "/out")
+        self.assertEqual(graph.evaluate(), {"/out": 10})
+        graph.set("x", 5)
+        self.assertEqual(graph.evaluate(), {})
+        self.assertEqual(calls, [1])
+        with self.assertRaises(ValueError):
+            graph.add_derived("bad", ("missing",), lambda value: value)
+
+    async def test_driver_follows_animated_camera(self):
+        settings = carb.settings.get_settings()
+        enabled = settings.get(ENABLED_SETTING)
+        squeeze = settings.get(SQUEEZE_SETTING)
+        settings.set(ENABLED_SETTING, True)
+        settings.set(SQUEEZE_SETTING, 2.0)
+
+        stage = Usd.Stage.CreateInMemory()
+        camera = UsdGeom.Camera.Define(stage, "/World/Camera")
+        camera.GetFocalLengthAttr().Set(50.0, 1)
+        camera.GetFocalLengthAttr().Set(100.0, 2)
+        camera.GetFStopAttr().Set(2.8)
+        viewport_api = FakeViewportApi(stage=stage, camera_path="/World/Camera")
+        viewport_api.time = Usd.TimeCode(1)
+        driver = LensGraphDriver(lambda: 2.39)
+        try:
+            driver.start(viewport_api)
+            self.assertAlmostEqual(settings.get(SENSOR_DIAGONAL), 60.0, places=3)
+            written = driver.written
+
+            driver.update()
+            self.assertEqual(driver.written, written)
+
+            viewport_api.time = Usd.TimeCode(2)
+            driver.update()
+            self.assertEqual(driver.written, written + 1)
+            self.assertAlmostEqual(settings.get(SENSOR_DIAGONAL), 120.0, places=3)
+        finally:
+            driver.destroy()
+            settings.set(ENABLED_SETTING, bool(enabled))
+            settings.set(SQUEEZE_SETTING, squeeze if squeeze is not None else 2.0)
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.presets import BUILTIN_PRESETS, AspectPreset, PresetRegistry, load_presets, parse_ratio
+from funkyboy.anamorphic.effects.resolution_planner import plan_resolution
+
+
+class TestPresets(omni.kit.test.AsyncTestCase):
+    async def test_builtin_ratios_match_labels(self):
+        registry = PresetRegistry()
+        self.assertAlmostEqual(registry[registry.index_of("panavision_ultra_70")].ratio, 2.76)
+        self.assertAlmostEqual(registry[registry.index_of("anamorphic_2x")].ratio, 2.0)
+        for index, preset in enumerate(BUILTIN_PRESETS):
+            self.assertEqual(registry.index_of(preset.id), index)
+            self.assertAlmostEqual(preset.ratio, parse_ratio(preset.label.split()[0]), delta=0.01)
+
+    async def test_parse_ratio(self):
+        self.assertAlmostEqual(parse_ratio("16:9"), 16 / 9)
+        self.assertAlmostEqual(parse_ratio("2.39:1"), 2.39)
+        self.assertAlmostEqual(parse_ratio(1.85), 1.85)
+        with self.assertRaises(ValueError):
+            parse_ratio("0:1")
+
+    async def test_file_presets_replace_and_extend(self):
+        data = {
+            "presets": [
+                {"id": "scope", "label": "2.40:1 Scope", "ratio": "2.40:1"},
+                {"id": "flat", "label": "1.85:1 Flat", "ratio": 1.85, "policy": "area"},
+                {"id": "broken", "ratio": "wide"},
+                {"id": "bad_policy", "ratio": 2.0, "policy": "stretch"},
+            ]
+        }
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "aspect_presets.json")
+            with open(path, "w") as f:
+                json.dump(data, f)
+            presets = load_presets(path)
+
+        self.assertEqual([preset.id for preset in presets], ["scope", "flat"])
+        registry = PresetRegistry()
+        registry.extend(presets)
+        self.assertEqual(len(registry), len(BUILTIN_PRESETS) + 1)
+        self.assertEqual(registry.index_of("scope"), 1)
+        self.assertEqual(registry[1].label, "2.40:1 Scope")
+        self.assertEqual(registry[len(registry) - 1].policy, "area")
+
+    async def test_resolutions_are_planned_once_per_base(self):
+        registry = PresetRegistry([AspectPreset("a", "a", 2.39), AspectPreset("b", "b", 1.0, policy="width")])
+        planned = registry.resolutions(1920, 1080, "fit", 8)
+        self.assertEqual(planned[0], plan_resolution(1920, 1080, 2.39, "fit", 8))
+        self.assertEqual(planned[1], plan_resolution(1920, 1080, 1.0, "width", 8))
+        self.assertIs(registry.resolutions(1920, 1080, "fit", 8), planned)
+        self.assertIsNot(registry.resolutions(1280, 720, "fit", 8), planned)
+        self.assertEqual(
+            registry.resolutions(1920, 1080, "fit", 8, preset_policies=False)[1],
+            plan_resolution(1920, 1080, 1.0, "fit", 8),
+        )
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+
+import carb.settings
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.profiles import RELOAD_DELAY_SETTING, ProfileLibrary, apply_profile, parse_profiles
+
+from .fakes import FakeClock
+
+
+def _write(folder, file_name, profiles):
+    path = os.path.join(folder, file_name)
+    with open(path, "w") as f:
+        json.dump({"profiles": profiles}, f)
+    return path
+
+
+class TestProfiles(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    async def test_parse_casts_and_clamps(self):
+        profiles = parse_profiles(
+            {"profiles": [
+                {"name": "Scope", "ratio": "2.39:1", "anisotropy": 2.0, "blades": 5.6, "unknown": 1},
+                {"ratio": 2.0},
+            ]}
+        )
+        self.assertEqual(len(profiles), 1)
+        self.assertAlmostEqual(profiles[0].ratio, 2.39)
+        self.assertEqual(profiles[0].values, {"/rtx/post/dof/anisotropy": 1.0, "/rtx/post/lensFlares/blades": 6})
+
+    async def test_scan_reparses_only_changed_files(self):
+        folder = self._folder.name
+        _write(folder, "a.json", [{"name": "A", "anisotropy": 0.1}])
+        path_b = _write(folder, "b.json", [{"name": "B", "anisotropy": 0.2}])
+        library = ProfileLibrary([folder])
+        self.assertTrue(library.scan())
+        self.assertEqual(library.names, ("A", "B"))
+        self.assertEqual(library.parses, 2)
+
+        self.assertFalse(library.scan())
+        self.assertEqual(library.parses, 2)
+
+        _write(folder, "b.json", [{"name": "B", "anisotropy": 0.3}, {"name": "C"}])
+        os.utime(path_b, ns=(0, 10 ** 18))
+        self.assertTrue(library.scan())
+        self.assertEqual(library.parses, 3)
+        self.assertEqual(library.names, ("A", "B", "C"))
+        self.assertAlmostEqual(library.get("B").values["/rtx/post/dof/anisotropy"], 0.3)
+
+        os.remove(path_b)
+        self.assertTrue(library.scan())
+        self.assertEqual(library.names, ("A",))
+
+    async def test_folder_events_are_debounced(self):
+        settings = carb.settings.get_settings()
+        settings.set(RELOAD_DELAY_SETTING, 0.5)
+        folder = self._folder.name
+        clock = FakeClock()
+        library = ProfileLibrary([folder], clock=clock)
+        library.scan()
+        changes = []
+        subscription = library.subscribe_changed(lambda: changes.append(library.names))
+
+        for i in range(5):
+            _write(folder, "a.json", [{"name": f"A{i}"}])
+            library._on_folder_event(None, None, None)
+            library._on_update(None)
+            clock.now += 0.1
+        library._on_update(None)
+        self.assertEqual(changes, [])
+
+        clock.now += 0.5
+        library._on_update(None)
+        self.assertEqual(changes, [("A4",)])
+        self.assertEqual(library.parses, 1)
+
+        subscription.unsubscribe()
+        library.destroy()
+
+    async def test_apply_writes_only_differences(self):
+        settings = carb.settings.get_settings()
+        settings.set("/rtx/post/dof/anisotropy", 0.5)
+        settings.set("/rtx/post/lensFlares/blades", 3)
+        profile = parse_profiles({"profiles": [{"name": "P", "anisotropy": 0.5, "blades": 7}]})[0]
+        apply_profile(profile)
+        self.assertEqual(settings.get("/rtx/post/lensFlares/blades"), 7)
+        self.assertAlmostEqual(settings.get("/rtx/post/dof/anisotropy"), 0.5)
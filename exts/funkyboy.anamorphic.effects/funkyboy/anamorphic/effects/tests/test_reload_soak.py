@@ -0,0 +1,96 @@
+import gc
+import tracemalloc
+from collections import Counter
+
+import carb
+import omni.kit.app
+import omni.kit.test
+
+EXT_NAME = "funkyboy.anamorphic.effects"
+WINDOW_TITLE = "Anamorphic Effects Soak Test"
+CYCLES = 10
+# Types that should not outlive a disable, counted by name since the
+# extension manager may import the modules again on enable
+TRACKED_TYPES = (
+    "AnamorphicEffectsWindow",
+    "SettingSlider",
+    "ResourceRegistry",
+    "_BindingHandle",
+    "SettingsBinding",
+    "SettingsWriter",
+    "AspectController",
+    "ViewportState",
+)
+# Bytes the extension's own allocations may grow by over all cycles
+MAX_GROWTH = 64 * 1024
+
+
+def _live_counts():
+    gc.collect()
+    counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+    return {name: counts[name] for name in TRACKED_TYPES}
+
+
+def _extension_allocations():
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, "*funkyboy*")])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+class TestReloadSoak(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._app = omni.kit.app.get_app()
+        self._ext_manager = self._app.get_extension_manager()
+        self._ext_id = self._ext_manager.get_enabled_extension_id(EXT_NAME)
+        if not self._ext_id:
+            self.skipTest(f"{EXT_NAME} is not enabled")
+
+    async def tearDown(self):
+        # The rest of the suite runs against this extension, so it has to come back even after a failure
+        if self._ext_id and not self._ext_manager.is_extension_enabled(EXT_NAME):
+            self._ext_manager.set_extension_enabled_immediate(self._ext_id, True)
+            await self._app.next_update_async()
+
+    async def _cycle(self):
+        """Disable and enable the extension, then open the window with both frames built"""
+        self._ext_manager.set_extension_enabled_immediate(self._ext_id, False)
+        try:
+            await self._app.next_update_async()
+        finally:
+            self._ext_manager.set_extension_enabled_immediate(self._ext_id, True)
+        await self._app.next_update_async()
+
+        from funkyboy.anamorphic.effects.window import AnamorphicEffectsWindow
+
+        window = AnamorphicEffectsWindow(WINDOW_TITLE)
+        try:
+            await self._app.next_update_async()
+            window.aspect_frame.collapsed = False
+            window.lens_frame.collapsed = False
+            await self._app.next_update_async()
+            await self._app.next_update_async()
+        finally:
+            window.destroy()
+        await self._app.next_update_async()
+
+    async def test_enable_disable_keeps_object_counts_flat(self):
+        # Warm up so lazy imports and caches are not counted as growth
+        await self._cycle()
+        await self._cycle()
+
+        tracemalloc.start()
+        try:
+            baseline_counts = _live_counts()
+            baseline_bytes = _extension_allocations()
+            for _ in range(CYCLES):
+                await self._cycle()
+            counts = _live_counts()
+            growth = _extension_allocations() - baseline_bytes
+        finally:
+            tracemalloc.stop()
+
+        carb.log_info(
+            f"[{EXT_NAME}] {CYCLES} enable/disable cycles: {growth} bytes allocated by the extension, "
+            f"live objects {counts} (baseline {baseline_counts})"
+        )
+        self.assertEqual(counts, baseline_counts)
+        self.assertLess(growth, MAX_GROWTH)
@@ -0,0 +1,59 @@
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.resolution_planner import plan_resolution
+
+
+class TestResolutionPlanner(omni.kit.test.AsyncTestCase):
+    async def test_width_policy_keeps_width(self):
+        self.assertEqual(plan_resolution(1920, 1080, 2.39, "width", 8), (1920, 800))
+
+    async def test_fit_stays_inside_base(self):
+        width, height = plan_resolution(1920, 1080, 9 / 16, "fit", 8)
+        self.assertLessEqual(width, 1920)
+        self.assertLessEqual(height, 1080)
+        self.assertEqual(height, 1080)
+
+    async def test_fill_covers_base(self):
+        width, height = plan_resolution(1920, 1080, 2.39, "fill", 8)
+        self.assertGreaterEqual(width, 1920)
+        self.assertGreaterEqual(height, 1080)
+
+    async def test_area_is_constant(self):
+        width, height = plan_resolution(1920, 1080, 9 / 16, "area", 8)
+        self.assertAlmostEqual(width * height / (1920 * 1080), 1.0, delta=0.02)
+
+    async def test_budget_caps_pixel_count(self):
+        width, height = plan_resolution(3840, 2160, 2.39, "budget", 16, 1920 * 1080)
+        self.assertLessEqual(width * height, 1920 * 1080)
+
+    async def test_crop_only_shrinks_height(self):
+        self.assertEqual(plan_resolution(1920, 1080, 2.39, "crop", 8), (1920, 800))
+        self.assertEqual(plan_resolution(1920, 1080, 9 / 16, "crop", 8), (1920, 1080))
+
+    async def test_sizes_are_aligned(self):
+        for policy in ("width", "fit", "fill", "area", "budget", "crop"):
+            width, height = plan_resolution(1917, 1033, 2.2, policy, 16)
+            self.assertEqual(width % 16, 0, policy)
+            self.assertEqual(height % 16, 0, policy)
+
+    async def test_extreme_ratios_keep_their_shape(self):
+        for policy in ("fit", "area", "budget"):
+            self.assertEqual(plan_resolution(100, 50, 0.01, policy, 8), (8, 800), policy)
+            self.assertEqual(plan_resolution(100, 50, 100.0, policy, 8), (800, 8), policy)
+        self.assertEqual(plan_resolution(100, 50, 100.0, "width", 8), (800, 8))
+
+    async def test_tiny_base_is_aligned(self):
+        self.assertEqual(plan_resolution(6, 4, 1.5, "fit", 8), (16, 8))
+        self.assertEqual(plan_resolution(6, 4, 1.5, "fit", 1), (6, 4))
+
+    async def test_results_are_cached(self):
+        plan_resolution.cache_clear()
+        plan_resolution(1920, 1080, 2.35, "fit", 8)
+        plan_resolution(1920, 1080, 2.35, "fit", 8)
+        self.assertEqual(plan_resolution.cache_info().hits, 1)
+
+    async def test_bad_input(self):
+        with self.assertRaises(ValueError):
+            plan_resolution(1920, 1080, 0.0)
+        with self.assertRaises(ValueError):
+            plan_resolution(1920, 1080, 2.39, "stretch")
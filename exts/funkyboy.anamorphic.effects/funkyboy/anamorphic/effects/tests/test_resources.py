@@ -0,0 +1,86 @@
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.resources import ResourceRegistry
+
+
+class Resource:
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def destroy(self):
+        self.log.append(self.name)
+
+
+class Subscription:
+    def __init__(self, log):
+        self.log = log
+
+    def unsubscribe(self):
+        self.log.append("unsubscribe")
+
+
+class Model:
+    def __init__(self):
+        self.callbacks = {}
+        self._next_id = 0
+
+    def add_value_changed_fn(self, fn):
+        self._next_id += 1
+        self.callbacks[self._next_id] = fn
+        return self._next_id
+
+    def remove_value_changed_fn(self, callback_id):
+        del self.callbacks[callback_id]
+
+
+class TestResourceRegistry(omni.kit.test.AsyncTestCase):
+    async def test_destroy_releases_in_reverse_order(self):
+        log = []
+        registry = ResourceRegistry()
+        registry.add(Resource(log, "first"))
+        registry.add(Subscription(log))
+        registry.add_callback(lambda: log.append("callback"))
+        registry.add(object())
+        registry.destroy()
+        self.assertEqual(log, ["callback", "unsubscribe", "first"])
+        self.assertEqual(len(registry), 0)
+
+        registry.destroy()
+        self.assertEqual(log, ["callback", "unsubscribe", "first"])
+
+    async def test_value_changed_fn_is_removed(self):
+        model = Model()
+        registry = ResourceRegistry()
+        registry.add_value_changed_fn(model, lambda m: None)
+        self.assertEqual(len(model.callbacks), 1)
+        registry.destroy()
+        self.assertEqual(model.callbacks, {})
+
+    async def test_child_and_named_release(self):
+        log = []
+        registry = ResourceRegistry()
+        child = registry.child()
+        child.add(Resource(log, "child"))
+        registry.add(Resource(log, "named"), name="frame")
+        registry.add(Resource(log, "kept"))
+
+        registry.release("frame")
+        self.assertEqual(log, ["named"])
+
+        child.destroy()
+        child.add(Resource(log, "rebuilt"))
+        registry.destroy()
+        self.assertEqual(log, ["named", "child", "kept", "rebuilt"])
+
+    async def test_failing_release_does_not_stop_the_rest(self):
+        log = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        registry = ResourceRegistry()
+        registry.add(Resource(log, "first"))
+        registry.add_callback(fail)
+        registry.destroy()
+        self.assertEqual(log, ["first"])
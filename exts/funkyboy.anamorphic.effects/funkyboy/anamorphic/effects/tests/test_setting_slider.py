@@ -0,0 +1,42 @@
+import carb.settings
+import omni.kit.test
+import omni.ui as ui
+
+from funkyboy.anamorphic.effects.custom_slider_widget import SettingSlider
+from funkyboy.anamorphic.effects.parameters import PARAMETERS_BY_NAME
+from funkyboy.anamorphic.effects.settings_writer import get_settings_writer
+
+BLADES = PARAMETERS_BY_NAME["blades"]
+
+
+class TestSettingSlider(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._settings = carb.settings.get_settings()
+        self._previous = self._settings.get(BLADES.path)
+        self._settings.set(BLADES.path, BLADES.default)
+        self._window = ui.Window("SettingSlider Test", width=300, height=100)
+        with self._window.frame:
+            self._slider = SettingSlider(BLADES, label=BLADES.label)
+
+    async def tearDown(self):
+        self._slider.destroy()
+        self._window.destroy()
+        get_settings_writer().discard(BLADES.path)
+        if self._previous is not None:
+            self._settings.set(BLADES.path, self._previous)
+
+    async def test_built_from_the_parameter(self):
+        self.assertIs(self._slider.param, BLADES)
+        self.assertEqual(self._slider.model.as_int, BLADES.default)
+        self.assertFalse(self._slider.revert_img.enabled)
+
+    async def test_edits_are_pushed_as_the_setting_type(self):
+        self._slider.model.set_value(8)
+        pending = get_settings_writer().pending(BLADES.path)
+        self.assertEqual(pending, 8)
+        self.assertIsInstance(pending, int)
+        self.assertTrue(self._slider.revert_img.enabled)
+
+        self._slider._restore_default()
+        self.assertEqual(get_settings_writer().pending(BLADES.path), BLADES.default)
+        self.assertFalse(self._slider.revert_img.enabled)
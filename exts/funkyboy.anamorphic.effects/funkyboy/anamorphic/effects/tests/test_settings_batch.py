@@ -0,0 +1,66 @@
+import carb.settings
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.settings_writer import get_settings_writer, settings_batch
+from funkyboy.anamorphic.effects.write_scheduler import ENABLED_SETTING as SCHEDULER_SETTING
+
+ANISOTROPY = "/rtx/post/dof/anisotropy"
+FLARE_SCALE = "/rtx/post/lensFlares/flareScale"
+FLARES_ENABLED = "/rtx/post/lensFlares/enabled"
+
+
+class TestSettingsBatch(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._settings = carb.settings.get_settings()
+        self._saved = {
+            path: self._settings.get(path) for path in (ANISOTROPY, FLARE_SCALE, FLARES_ENABLED, SCHEDULER_SETTING)
+        }
+        self._settings.set(ANISOTROPY, 0.0)
+        self._settings.set(FLARE_SCALE, 0.1)
+        self._settings.set(FLARES_ENABLED, False)
+        self._settings.set(SCHEDULER_SETTING, False)
+
+    async def tearDown(self):
+        get_settings_writer().flush()
+        for path, value in self._saved.items():
+            if value is not None:
+                self._settings.set(path, value)
+
+    async def test_batch_writes_only_changes(self):
+        writer = get_settings_writer()
+        writer.reset_stats()
+        with settings_batch() as batch:
+            batch.set(ANISOTROPY, 0.0)
+            batch.set(FLARE_SCALE, 0.1 + 1e-9)
+            batch.set(FLARES_ENABLED, True)
+            # Not written until the block ends
+            self.assertFalse(self._settings.get(FLARES_ENABLED))
+        self.assertTrue(self._settings.get(FLARES_ENABLED))
+        self.assertEqual((writer.flushed, writer.skipped), (1, 2))
+
+    async def test_nested_batches_join_the_outermost(self):
+        with settings_batch() as outer:
+            with settings_batch() as inner:
+                self.assertIs(inner, outer)
+                inner.set(ANISOTROPY, 0.5)
+            # The inner block ending writes nothing yet
+            self.assertEqual(self._settings.get(ANISOTROPY), 0.0)
+            outer.set(FLARE_SCALE, 0.2)
+        self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.5)
+        self.assertAlmostEqual(self._settings.get(FLARE_SCALE), 0.2)
+
+    async def test_batch_supersedes_pending_values(self):
+        writer = get_settings_writer()
+        writer.queue(ANISOTROPY, 0.9)
+        with settings_batch() as batch:
+            batch.set(ANISOTROPY, 0.3)
+        self.assertIsNone(writer.pending(ANISOTROPY))
+        writer.flush()
+        self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.3)
+
+    async def test_raising_block_writes_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with settings_batch() as batch:
+                batch.set(ANISOTROPY, 0.5)
+                raise RuntimeError("abort")
+        self.assertEqual(self._settings.get(ANISOTROPY), 0.0)
@@ -0,0 +1,55 @@
+import carb.settings
+import omni.kit.test
+import omni.ui as ui
+
+from funkyboy.anamorphic.effects.settings_binding import SettingsBinding
+from funkyboy.anamorphic.effects.settings_writer import get_settings_writer
+
+FLARE_SCALE = "/rtx/post/lensFlares/flareScale"
+
+
+class TestSettingsBinding(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._settings = carb.settings.get_settings()
+        self._previous = self._settings.get(FLARE_SCALE)
+        self._settings.set(FLARE_SCALE, 0.1)
+        self._binding = SettingsBinding()
+        self._model = ui.SimpleFloatModel(0.0)
+        # Widgets push their model changes, like SettingSlider does
+        self._sub = self._model.subscribe_value_changed_fn(
+            lambda model: self._binding.push(FLARE_SCALE, model.as_float)
+        )
+        self._handle = self._binding.bind(FLARE_SCALE, self._model)
+
+    async def tearDown(self):
+        self._handle.destroy()
+        self._sub = None
+        self._binding.destroy()
+        get_settings_writer().discard(FLARE_SCALE)
+        if self._previous is not None:
+            self._settings.set(FLARE_SCALE, self._previous)
+
+    async def test_external_change_reaches_model_without_echo(self):
+        self.assertAlmostEqual(self._model.as_float, 0.1)
+        self._settings.set(FLARE_SCALE, 0.3)
+        self._binding._on_update(None)
+        self.assertAlmostEqual(self._model.as_float, 0.3)
+        self.assertEqual(self._binding.dispatches, 1)
+        # Setting the model didn't queue the value back
+        self.assertIsNone(get_settings_writer().pending(FLARE_SCALE))
+        # Nothing changed since: no dispatch
+        self._binding._on_update(None)
+        self.assertEqual(self._binding.dispatches, 1)
+
+    async def test_queued_push_is_not_reverted(self):
+        self._model.set_value(0.25)
+        # Queued, the renderer still holds the old value
+        self.assertAlmostEqual(get_settings_writer().pending(FLARE_SCALE), 0.25)
+        self.assertAlmostEqual(self._settings.get(FLARE_SCALE), 0.1)
+        self._binding._on_update(None)
+        self.assertAlmostEqual(self._model.as_float, 0.25)
+        self.assertEqual(self._binding.dispatches, 0)
+        get_settings_writer().flush()
+        self._binding._on_update(None)
+        self.assertAlmostEqual(self._model.as_float, 0.25)
+        self.assertEqual(self._binding.dispatches, 0)
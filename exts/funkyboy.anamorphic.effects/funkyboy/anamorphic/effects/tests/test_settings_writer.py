@@ -0,0 +1,66 @@
+import carb.settings
+import omni.kit.app
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.settings_writer import SettingsWriter, get_settings_writer
+from funkyboy.anamorphic.effects.write_scheduler import ENABLED_SETTING as SCHEDULER_SETTING
+
+ANISOTROPY = "/rtx/post/dof/anisotropy"
+FLARE_SCALE = "/rtx/post/lensFlares/flareScale"
+
+
+class TestSettingsWriter(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._settings = carb.settings.get_settings()
+        self._saved = {path: self._settings.get(path) for path in (ANISOTROPY, FLARE_SCALE, SCHEDULER_SETTING)}
+        self._settings.set(ANISOTROPY, 0.0)
+        self._settings.set(FLARE_SCALE, 0.1)
+        self._settings.set(SCHEDULER_SETTING, False)
+
+    async def tearDown(self):
+        get_settings_writer().flush()
+        for path, value in self._saved.items():
+            if value is not None:
+                self._settings.set(path, value)
+
+    async def test_coalesces_until_flush(self):
+        writer = SettingsWriter()
+        try:
+            for tick in range(100):
+                writer.queue(ANISOTROPY, tick / 100)
+            writer.queue(FLARE_SCALE, 0.3)
+            # Nothing reaches the renderer before the flush
+            self.assertEqual(self._settings.get(ANISOTROPY), 0.0)
+            self.assertAlmostEqual(writer.pending(ANISOTROPY), 0.99)
+
+            writer.flush()
+            self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.99)
+            self.assertAlmostEqual(self._settings.get(FLARE_SCALE), 0.3)
+            self.assertIsNone(writer.pending(ANISOTROPY))
+            self.assertEqual(writer.stats, {"queued": 101, "dropped": 99, "flushed": 2, "skipped": 0})
+        finally:
+            writer.destroy()
+
+    async def test_flushes_on_next_update(self):
+        writer = SettingsWriter()
+        try:
+            writer.queue(ANISOTROPY, 0.4)
+            await omni.kit.app.get_app().next_update_async()
+            await omni.kit.app.get_app().next_update_async()
+            self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.4)
+            # Stops ticking once there is nothing left to write
+            self.assertIsNone(writer._update_sub)
+        finally:
+            writer.destroy()
+
+    async def test_discard(self):
+        writer = SettingsWriter()
+        try:
+            writer.queue(ANISOTROPY, 0.4)
+            self.assertTrue(writer.discard(ANISOTROPY))
+            self.assertFalse(writer.discard(ANISOTROPY))
+            writer.flush()
+            self.assertEqual(self._settings.get(ANISOTROPY), 0.0)
+            self.assertEqual(writer.flushed, 0)
+        finally:
+            writer.destroy()
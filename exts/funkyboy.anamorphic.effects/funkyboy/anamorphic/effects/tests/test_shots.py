@@ -0,0 +1,65 @@
+import time
+
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.shots import Shot, ShotIndex, ShotPlayer, parse_edl, parse_shot_csv
+
+EDL = """TITLE: REEL 1
+FCM: NON-DROP FRAME
+
+001  AX       V     C        00:00:10:00 00:00:12:00 01:00:00:00 01:00:02:00
+* LENS PROFILE: Classic Scope
+* ASPECT PRESET: cinemascope
+002  AX       V     C        00:00:20:00 00:00:21:00 01:00:02:00 01:00:03:00
+* ASPECT PRESET: flat
+"""
+
+
+class TestShots(omni.kit.test.AsyncTestCase):
+    async def test_parse_csv(self):
+        shots = parse_shot_csv(
+            "start,end,profile,preset,name\n0,24,Classic Scope,cinemascope,sh010\n30,20,,,bad\n48,96,,flat,\n"
+        )
+        self.assertEqual(
+            [(shot.start, shot.end, shot.preset) for shot in shots], [(0, 24, "cinemascope"), (48, 96, "flat")]
+        )
+        self.assertEqual(shots[0].profile, "Classic Scope")
+
+    async def test_parse_edl(self):
+        shots = parse_edl(EDL, 24)
+        self.assertEqual([(shot.start, shot.end) for shot in shots], [(0, 48), (48, 72)])
+        self.assertEqual((shots[0].profile, shots[0].preset), ("Classic Scope", "cinemascope"))
+        self.assertEqual((shots[1].profile, shots[1].preset), ("", "flat"))
+
+    async def test_index_lookup(self):
+        index = ShotIndex([Shot(50, 60, name="c"), Shot(0, 20, name="a"), Shot(10, 30, name="b")])
+        self.assertEqual([shot.name for shot in index.shots], ["a", "b", "c"])
+        self.assertEqual(index.find(15).name, "b")
+        self.assertEqual(index.find(9).name, "a")
+        self.assertIsNone(index.find(40))
+        self.assertIsNone(index.find(-1))
+        self.assertIsNone(index.find(60))
+
+    async def test_contained_shot_splits_the_outer_one(self):
+        index = ShotIndex([Shot(0, 100, name="outer"), Shot(40, 60, name="inner"), Shot(50, 70, name="late")])
+        self.assertEqual(
+            [(shot.start, shot.end, shot.name) for shot in index.shots],
+            [(0, 40, "outer"), (40, 50, "inner"), (50, 70, "late"), (70, 100, "outer")],
+        )
+        self.assertEqual(index.find(39).name, "outer")
+        self.assertEqual(index.find(45).name, "inner")
+        self.assertEqual(index.find(65).name, "late")
+        self.assertEqual(index.find(99).name, "outer")
+        self.assertIsNone(index.find(100))
+
+    async def test_player_applies_on_cuts_only(self):
+        applied = []
+        player = ShotPlayer(lambda shot: applied.append(shot.name))
+        player.set_index(ShotIndex(Shot(frame * 10, frame * 10 + 10, name=str(frame)) for frame in range(50000)))
+        start = time.perf_counter()
+        for frame in range(0, 30):
+            player.apply_frame(frame)
+        player.apply_frame(123456)
+        self.assertEqual(applied, ["0", "1", "2", "12345"])
+        self.assertLess(time.perf_counter() - start, 0.05)
+        player.destroy()
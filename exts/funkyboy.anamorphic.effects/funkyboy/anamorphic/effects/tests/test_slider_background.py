@@ -0,0 +1,67 @@
+import time
+
+import carb
+import omni.kit.app
+import omni.kit.test
+import omni.ui as ui
+
+from funkyboy.anamorphic.effects.custom_slider_widget import (
+    FIELD_HEIGHT,
+    SLIDER_WIDTH,
+    TEXTURE_NAME,
+    build_slider_background,
+)
+from funkyboy.anamorphic.effects.style import julia_modeler_style
+
+SLIDERS = 6
+FRAMES = 30
+
+
+def _build_tiled_background():
+    """How the slider background was built before it was pre-tiled"""
+    with ui.Frame(width=SLIDER_WIDTH, height=FIELD_HEIGHT, horizontal_clipping=True):
+        with ui.HStack(spacing=-12):
+            for i in range(50):
+                ui.Image(name=TEXTURE_NAME, fill_policy=ui.FillPolicy.PRESERVE_ASPECT_CROP, width=50)
+
+
+def _count_widgets(widget):
+    return 1 + sum(_count_widgets(child) for child in ui.Inspector.get_children(widget))
+
+
+class TestSliderBackground(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._window = ui.Window("Slider Background Benchmark", width=375, height=425)
+        self._window.frame.style = julia_modeler_style
+
+    async def tearDown(self):
+        self._window.destroy()
+        self._window = None
+
+    async def _measure(self, build_fn):
+        start = time.perf_counter()
+        with self._window.frame:
+            with ui.VStack() as stack:
+                for _ in range(SLIDERS):
+                    build_fn()
+        build_time = time.perf_counter() - start
+
+        app = omni.kit.app.get_app()
+        await app.next_update_async()
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            await app.next_update_async()
+        frame_time = (time.perf_counter() - start) / FRAMES
+        return build_time, frame_time, _count_widgets(stack)
+
+    async def test_single_widget_background(self):
+        tiled_build, tiled_frame, tiled_widgets = await self._measure(_build_tiled_background)
+        single_build, single_frame, single_widgets = await self._measure(build_slider_background)
+        carb.log_info(
+            f"[funkyboy.anamorphic.effects] {SLIDERS} slider backgrounds: "
+            f"tiled {tiled_widgets} widgets, {tiled_build * 1000:.2f} ms build, {tiled_frame * 1000:.2f} ms/frame; "
+            f"single {single_widgets} widgets, {single_build * 1000:.2f} ms build, {single_frame * 1000:.2f} ms/frame"
+        )
+        # A frame and an image per slider, plus the stack
+        self.assertEqual(single_widgets, 1 + SLIDERS * 2)
+        self.assertLess(single_widgets, tiled_widgets)
@@ -0,0 +1,50 @@
+import carb.settings
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.settings_writer import get_settings_writer
+from funkyboy.anamorphic.effects.snapshot import MANAGED_SETTINGS, restore_snapshot, take_snapshot
+from funkyboy.anamorphic.effects.viewport_cache import get_viewport_cache
+
+from .fakes import FakeViewportApi
+
+ANISOTROPY = "/rtx/post/dof/anisotropy"
+FLARE_SCALE = "/rtx/post/lensFlares/flareScale"
+
+
+class TestSnapshot(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._settings = carb.settings.get_settings()
+        self._saved = {path: self._settings.get(path) for path in MANAGED_SETTINGS}
+        self._settings.set(ANISOTROPY, 0.25)
+        self._settings.set(FLARE_SCALE, 0.1)
+
+    async def tearDown(self):
+        get_settings_writer().flush()
+        for path, value in self._saved.items():
+            if value is not None:
+                self._settings.set(path, value)
+
+    async def test_restore_writes_changed_keys_only(self):
+        viewport_api = FakeViewportApi((1920, 1080))
+        snapshot = take_snapshot(viewport_api)
+        self.assertAlmostEqual(snapshot.as_dict()[ANISOTROPY], 0.25)
+
+        self._settings.set(ANISOTROPY, 0.75)
+        get_viewport_cache().state(viewport_api).set_resolution((1920, 800))
+
+        writer = get_settings_writer()
+        writer.reset_stats()
+        restore_snapshot(snapshot)
+        self.assertEqual(writer.flushed, 1)
+        self.assertEqual(writer.skipped, len(snapshot.as_dict()) - 1)
+        self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.25)
+        self.assertEqual(viewport_api.resizes, [(1920, 800), (1920, 1080)])
+
+        # Already in place: nothing to write or resize
+        restore_snapshot(snapshot)
+        self.assertEqual(len(viewport_api.resizes), 2)
+
+    async def test_pending_values_are_part_of_the_snapshot(self):
+        get_settings_writer().queue(FLARE_SCALE, 0.6)
+        snapshot = take_snapshot()
+        self.assertAlmostEqual(snapshot.as_dict()[FLARE_SCALE], 0.6)
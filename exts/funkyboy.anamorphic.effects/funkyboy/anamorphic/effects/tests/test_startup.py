@@ -0,0 +1,62 @@
+import time
+
+import carb
+import omni.kit.app
+import omni.kit.test
+
+import funkyboy.anamorphic.effects.style as style_module
+from funkyboy.anamorphic.effects.parameters import LENS_PARAMETERS
+from funkyboy.anamorphic.effects.window import AnamorphicEffectsWindow
+
+from .interpreter import run_python
+
+# Imports the extension and style modules cold, then reports the time and whether the style got built
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+try:
+    import funkyboy.anamorphic.effects.extension
+    import funkyboy.anamorphic.effects.style as style
+except ImportError:
+    print("unavailable")
+else:
+    print(time.perf_counter() - start, style._style is None)
+"""
+
+
+class TestStartup(omni.kit.test.AsyncTestCase):
+    async def test_import_does_not_build_style(self):
+        output = run_python(IMPORT_SCRIPT).split()
+        if output == ["unavailable"]:
+            self.skipTest("omni.ui cannot be imported outside Kit")
+        import_time, style_unbuilt = float(output[0]), output[1] == "True"
+        carb.log_info(f"[funkyboy.anamorphic.effects] extension and style import: {import_time * 1000:.2f} ms")
+        self.assertTrue(style_unbuilt)
+        self.assertIs(style_module.julia_modeler_style, style_module.get_style())
+
+    async def test_frames_build_on_first_expand(self):
+        app = omni.kit.app.get_app()
+        start = time.perf_counter()
+        window = AnamorphicEffectsWindow("Anamorphic Effects Startup Test")
+        await app.next_update_async()
+        await app.next_update_async()
+        window_time = time.perf_counter() - start
+        try:
+            # Collapsed frames have no children yet
+            self.assertEqual(window._lens_sliders, [])
+            self.assertIsNone(window._ratio_preview)
+
+            start = time.perf_counter()
+            window.lens_frame.collapsed = False
+            window.aspect_frame.collapsed = False
+            await app.next_update_async()
+            await app.next_update_async()
+            expand_time = time.perf_counter() - start
+            carb.log_info(
+                f"[funkyboy.anamorphic.effects] window: {window_time * 1000:.2f} ms collapsed, "
+                f"{expand_time * 1000:.2f} ms to expand both frames"
+            )
+            self.assertEqual(len(window._lens_sliders), len(LENS_PARAMETERS))
+            self.assertIsNotNone(window._ratio_preview)
+        finally:
+            window.destroy()
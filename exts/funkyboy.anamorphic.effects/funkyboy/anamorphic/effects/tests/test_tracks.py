@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import time
+
+import carb.settings
+import numpy as np
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.tracks import Keyframe, TrackPlayer, load_tracks, parse_tracks, sample_keys
+
+FLARE_SCALE = "/rtx/post/lensFlares/flareScale"
+BLADES = "/rtx/post/lensFlares/blades"
+
+
+class TestTracks(omni.kit.test.AsyncTestCase):
+    async def test_interpolations(self):
+        frames = np.arange(0, 21, dtype=np.float64)
+        linear = sample_keys([Keyframe(0, 0.0), Keyframe(10, 1.0)], frames)
+        self.assertAlmostEqual(linear[5], 0.5)
+        self.assertAlmostEqual(linear[20], 1.0)
+
+        step = sample_keys([Keyframe(0, 0.0, "step"), Keyframe(10, 1.0)], frames)
+        self.assertEqual(step[9], 0.0)
+        self.assertEqual(step[10], 1.0)
+
+        bezier = sample_keys([Keyframe(0, 0.0, "bezier"), Keyframe(10, 1.0, "bezier"), Keyframe(20, 0.0)], frames)
+        # Eases out of the first key and peaks on the middle one
+        self.assertLess(bezier[2], linear[2])
+        self.assertAlmostEqual(bezier[10], 1.0)
+        self.assertEqual(int(np.argmax(bezier)), 10)
+
+    async def test_parse_skips_bad_tracks(self):
+        tracks = parse_tracks(
+            {"tracks": {"flareScale": [[0, 0.1], [24, 0.4, "bezier"]], "blades": [[0, 6, "cubic"]], "nope": [[0, 1]]}}
+        )
+        self.assertEqual(list(tracks), ["flareScale"])
+        self.assertEqual(tracks["flareScale"][1].interpolation, "bezier")
+
+    async def test_load_tracks(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "tracks.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"tracks": {"flareScale": [[0, 0.1], [24, 0.4]]}}, f)
+            tracks = load_tracks(path)
+        self.assertEqual([key.frame for key in tracks["flareScale"]], [0.0, 24.0])
+
+    async def test_frames_write_only_changes(self):
+        settings = carb.settings.get_settings()
+        player = TrackPlayer()
+        try:
+            player.set_track("flareScale", [Keyframe(0, 0.1), Keyframe(10, 0.3)])
+            player.set_track("blades", [Keyframe(0, 6)])
+            player.bake(0, 20)
+
+            self.assertEqual(player.apply_frame(0), 2)
+            self.assertEqual(settings.get(BLADES), 6)
+            self.assertEqual(player.apply_frame(0), 0)
+            # Only the animated track changes
+            self.assertEqual(player.apply_frame(5), 1)
+            self.assertAlmostEqual(settings.get(FLARE_SCALE), 0.2)
+            # Past the last key nothing moves any more
+            player.apply_frame(15)
+            self.assertEqual(player.apply_frame(20), 0)
+        finally:
+            player.destroy()
+
+    async def test_bake_is_fast(self):
+        player = TrackPlayer()
+        for name in ("anisotropy", "sensorDiagonal", "sensorAspectRatio", "flareScale"):
+            player.set_track(name, [Keyframe(frame, frame % 7, "bezier") for frame in range(0, 100000, 250)])
+        start = time.perf_counter()
+        player.bake(0, 99999)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        player.destroy()
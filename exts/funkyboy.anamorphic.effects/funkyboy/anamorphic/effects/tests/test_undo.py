@@ -0,0 +1,119 @@
+import carb.settings
+import omni.kit.commands
+import omni.kit.test
+import omni.kit.undo
+
+from funkyboy.anamorphic.effects import core
+from funkyboy.anamorphic.effects.aspect import ASPECT_MODE_SETTING, get_aspect_controller
+from funkyboy.anamorphic.effects.settings_writer import get_settings_writer
+from funkyboy.anamorphic.effects.undo import get_undo_recorder, undoable
+
+ANISOTROPY = "/rtx/post/dof/anisotropy"
+FLARE_SCALE = "/rtx/post/lensFlares/flareScale"
+
+
+class TestUndo(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._settings = carb.settings.get_settings()
+        self._saved = {path: self._settings.get(path) for path in (ANISOTROPY, FLARE_SCALE, ASPECT_MODE_SETTING)}
+        self._settings.set(ANISOTROPY, 0.25)
+        self._settings.set(FLARE_SCALE, 0.1)
+        omni.kit.undo.clear_stack()
+
+    async def tearDown(self):
+        if core.is_enabled():
+            core.disable()
+        for path, value in self._saved.items():
+            if value is not None:
+                self._settings.set(path, value)
+        omni.kit.undo.clear_stack()
+
+    async def test_drag_is_one_undo_entry(self):
+        recorder = get_undo_recorder()
+        recorder.begin()
+        for tick in range(200):
+            get_settings_writer().queue(ANISOTROPY, tick / 200)
+        recorder.end()
+
+        history = omni.kit.undo.get_undo_stack()
+        self.assertEqual(len(history), 1)
+        self.assertAlmostEqual(self._settings.get(ANISOTROPY), 199 / 200)
+
+        omni.kit.undo.undo()
+        self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.25)
+        omni.kit.undo.redo()
+        self.assertAlmostEqual(self._settings.get(ANISOTROPY), 199 / 200)
+
+    async def test_entry_holds_only_changed_keys(self):
+        with undoable():
+            self._settings.set(ANISOTROPY, 0.75)
+            self._settings.set(FLARE_SCALE, 0.1)
+        command = omni.kit.undo.get_undo_stack()[-1].command
+        self.assertEqual(command._before, {ANISOTROPY: 0.25})
+        self.assertEqual(command._after, {ANISOTROPY: 0.75})
+
+    async def test_no_change_records_nothing(self):
+        with undoable():
+            self._settings.set(ANISOTROPY, 0.25)
+        self.assertEqual(len(omni.kit.undo.get_undo_stack()), 0)
+
+    async def test_aspect_mode_is_undone(self):
+        controller = get_aspect_controller()
+        self._settings.set(ASPECT_MODE_SETTING, "resize")
+        with undoable():
+            controller.set_mode("crop")
+        command = omni.kit.undo.get_undo_stack()[-1].command
+        self.assertEqual(command._before, {})
+        self.assertEqual(command._aspect[0][0], "resize")
+
+        restored = []
+        subscription = controller.subscribe_restored(lambda: restored.append(controller.mode))
+        omni.kit.undo.undo()
+        self.assertEqual(controller.mode, "resize")
+        omni.kit.undo.redo()
+        self.assertEqual(controller.mode, "crop")
+        subscription.unsubscribe()
+        self.assertEqual(restored, ["resize", "crop"])
+
+    async def test_turning_on_is_undone(self):
+        # What the window's camera follower, lens graph and players hang on
+        followers = []
+        subscription = core.subscribe_enabled(followers.append)
+        try:
+            with undoable():
+                core.enable()
+            command = omni.kit.undo.get_undo_stack()[-1].command
+            self.assertEqual(command._enabled, (False, True))
+            self.assertAlmostEqual(self._settings.get(ANISOTROPY), core.DEFAULT_LOOK[ANISOTROPY])
+
+            omni.kit.undo.undo()
+            self.assertFalse(core.is_enabled())
+            self.assertEqual(followers, [True, False])
+            self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.25)
+
+            omni.kit.undo.redo()
+            self.assertTrue(core.is_enabled())
+            self.assertEqual(followers, [True, False, True])
+            self.assertAlmostEqual(self._settings.get(ANISOTROPY), core.DEFAULT_LOOK[ANISOTROPY])
+
+            # Undoing the redo still puts back what the first enable() found
+            omni.kit.undo.undo()
+            self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.25)
+        finally:
+            subscription.unsubscribe()
+
+    async def test_turning_off_is_undone(self):
+        core.enable()
+        self._settings.set(ANISOTROPY, 0.8)
+        with undoable():
+            core.disable()
+        self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.25)
+
+        omni.kit.undo.undo()
+        self.assertTrue(core.is_enabled())
+        # The look as it was tuned, not DEFAULT_LOOK
+        self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.8)
+
+        omni.kit.undo.redo()
+        self.assertFalse(core.is_enabled())
+        self.assertAlmostEqual(self._settings.get(ANISOTROPY), 0.25)
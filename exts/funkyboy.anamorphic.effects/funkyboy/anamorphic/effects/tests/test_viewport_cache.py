@@ -0,0 +1,69 @@
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.viewport_cache import ViewportCache
+
+from .fakes import FakeViewportApi
+
+
+class TestViewportCache(omni.kit.test.AsyncTestCase):
+    async def test_queries_once_until_view_change(self):
+        cache = ViewportCache()
+        viewport_api = FakeViewportApi((1920, 1080))
+        try:
+            state = cache.state(viewport_api)
+            for _ in range(10):
+                self.assertEqual(state.resolution, (1920, 1080))
+                self.assertEqual(state.texture_resolution, (1920, 1080))
+            self.assertEqual(viewport_api.queries, 2)
+            self.assertEqual((cache.hits, cache.misses), (18, 2))
+
+            viewport_api.resize_window((1280, 720))
+            self.assertEqual(state.resolution, (1280, 720))
+            self.assertEqual(state.texture_resolution, (1280, 720))
+            self.assertEqual(viewport_api.queries, 4)
+        finally:
+            cache.destroy()
+
+    async def test_set_resolution_updates_the_cache(self):
+        cache = ViewportCache()
+        viewport_api = FakeViewportApi((1920, 1080))
+        try:
+            state = cache.state(viewport_api)
+            state.set_resolution((1920.4, 803.6))
+            self.assertEqual(viewport_api.resolution, (1920, 804))
+            queries = viewport_api.queries
+            self.assertEqual(state.resolution, (1920, 804))
+            self.assertEqual(viewport_api.queries, queries)
+        finally:
+            cache.destroy()
+
+    async def test_invalidate(self):
+        cache = ViewportCache()
+        first, second = FakeViewportApi((1920, 1080)), FakeViewportApi((1280, 720))
+        try:
+            cache.state(first).resolution
+            cache.state(second).resolution
+            cache.invalidate(first)
+            cache.state(first).resolution
+            cache.state(second).resolution
+            self.assertEqual((first.queries, second.queries), (2, 1))
+
+            cache.invalidate()
+            cache.state(first).resolution
+            cache.state(second).resolution
+            self.assertEqual((first.queries, second.queries), (3, 2))
+        finally:
+            cache.destroy()
+
+    async def test_states_are_dropped_with_their_viewport(self):
+        cache = ViewportCache()
+        try:
+            viewport_api = FakeViewportApi((1920, 1080))
+            state = cache.state(viewport_api)
+            self.assertIs(cache.state(viewport_api), state)
+            del viewport_api
+            self.assertFalse(state.alive)
+            cache.state(FakeViewportApi((1280, 720)))
+            self.assertNotIn(state, cache._states.values())
+        finally:
+            cache.destroy()
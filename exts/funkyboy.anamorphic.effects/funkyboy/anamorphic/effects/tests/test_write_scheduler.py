@@ -0,0 +1,91 @@
+import carb.settings
+import omni.kit.test
+
+from funkyboy.anamorphic.effects.settings_writer import SettingsBatch, SettingsWriter
+from funkyboy.anamorphic.effects.write_scheduler import ENABLED_SETTING, WriteScheduler, cost_class
+
+from .fakes import FakeClock
+
+FLARE_SCALE = "/rtx/post/lensFlares/flareScale"
+ANISOTROPY = "/rtx/post/dof/anisotropy"
+BLADES = "/rtx/post/lensFlares/blades"
+SENSOR_DIAGONAL = "/rtx/post/lensFlares/sensorDiagonal"
+COSTS = {"cheap": 1.0, "kernel": 6.0, "resolution": 12.0}
+
+
+class TestWriteScheduler(omni.kit.test.AsyncTestCase):
+    def _run_frame(self, scheduler, pending, clock=None, write_ms=0.0):
+        """One frame over pending (a list of keys), returns the keys written"""
+        written = []
+        scheduler.begin_frame()
+        for key in scheduler.order(pending):
+            if not scheduler.admit(key):
+                break
+            written.append(key)
+            if clock is not None:
+                clock.now += write_ms / 1000.0
+        for key in written:
+            pending.remove(key)
+        scheduler.end_frame(len(pending))
+        return written
+
+    async def test_cost_classes(self):
+        self.assertEqual(cost_class(FLARE_SCALE), "cheap")
+        self.assertEqual(cost_class(BLADES), "kernel")
+        self.assertEqual(cost_class(SENSOR_DIAGONAL), "kernel")
+        self.assertEqual(cost_class(("resolution", 1)), "resolution")
+
+    async def test_spreads_under_budget_cheap_first(self):
+        scheduler = WriteScheduler(budget_ms=8.0, costs=COSTS, clock=FakeClock())
+        pending = [("resolution", 1), BLADES, FLARE_SCALE, SENSOR_DIAGONAL, ANISOTROPY]
+        frames = []
+        while pending:
+            frames.append(self._run_frame(scheduler, pending))
+        # Cheap ones and the merged kernel rebuild fit in the first frame, the resize waits
+        self.assertEqual(frames, [[FLARE_SCALE, ANISOTROPY, BLADES, SENSOR_DIAGONAL], [("resolution", 1)]])
+        stats = scheduler.stats
+        self.assertEqual(stats["frames"], 2)
+        self.assertEqual(stats["kernel_rebuilds"], 1)
+        self.assertEqual(stats["merged"], 1)
+        self.assertEqual(stats["carried_over"], 1)
+        self.assertEqual(stats["written"], {"cheap": 2, "kernel": 2, "resolution": 1})
+        # The resize alone is over budget, but a frame always makes progress
+        self.assertEqual(stats["max_frame_ms"], 12.0)
+
+    async def test_measured_time_counts(self):
+        clock = FakeClock()
+        scheduler = WriteScheduler(budget_ms=8.0, costs=COSTS, clock=clock)
+        pending = [FLARE_SCALE, ANISOTROPY, BLADES]
+        # Cheap writes that actually take 5 ms each
+        self.assertEqual(self._run_frame(scheduler, pending, clock, write_ms=5.0), [FLARE_SCALE, ANISOTROPY])
+        self.assertEqual(self._run_frame(scheduler, pending, clock, write_ms=5.0), [BLADES])
+        # The first frame measured 10 ms against 6 ms of estimates
+        self.assertEqual(scheduler.stats["max_frame_ms"], 10.0)
+
+    async def test_writer_budgets_batches(self):
+        settings = carb.settings.get_settings()
+        enabled = settings.get(ENABLED_SETTING)
+        previous = {path: settings.get(path) for path in (FLARE_SCALE, BLADES)}
+        settings.set(ENABLED_SETTING, True)
+        settings.set(FLARE_SCALE, 0.1)
+        settings.set(BLADES, 6)
+        writer = SettingsWriter(WriteScheduler(budget_ms=0.5, costs=COSTS, clock=FakeClock()))
+        try:
+            batch = SettingsBatch(writer)
+            batch.update({FLARE_SCALE: 0.3, BLADES: 9})
+            batch.commit()
+            # Queued, not written yet
+            self.assertEqual(settings.get(BLADES), 6)
+            self.assertEqual(writer.pending(BLADES), 9)
+            writer.flush_budgeted()
+            self.assertAlmostEqual(settings.get(FLARE_SCALE), 0.3)
+            self.assertEqual(settings.get(BLADES), 6)
+            writer.flush_budgeted()
+            self.assertEqual(settings.get(BLADES), 9)
+            self.assertEqual(writer.scheduler.stats["frames"], 2)
+        finally:
+            writer.destroy()
+            settings.set(ENABLED_SETTING, bool(enabled))
+            for path, value in previous.items():
+                if value is not None:
+                    settings.set(path, value)
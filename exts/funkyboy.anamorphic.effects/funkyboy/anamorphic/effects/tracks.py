@@ -0,0 +1,262 @@
+__all__ = [
+    "INTERPOLATIONS",
+    "Keyframe",
+    "sample_keys",
+    "parse_tracks",
+    "load_tracks",
+    "TrackPlayer",
+    "get_track_player",
+    "release_track_player",
+]
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import carb
+import carb.settings
+import carb.tokens
+import numpy as np
+
+from .parameters import PARAMETERS_BY_NAME
+from .settings_writer import settings_batch
+
+# Interpolation from a key to the next one. "bezier" eases through the keys
+# with automatic (Catmull-Rom) handles and flat handles on the first and last key.
+INTERPOLATIONS = ("linear", "bezier", "step")
+
+TRACK_FILE_SETTING = "/exts/funkyboy.anamorphic.effects/trackFile"
+
+
+class Keyframe:
+    """A value at a frame, and how to get from it to the next key"""
+
+    __slots__ = ("frame", "value", "interpolation")
+
+    def __init__(self, frame: float, value: float, interpolation: str = "linear"):
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation '{interpolation}', expected one of {INTERPOLATIONS}")
+        self.frame = float(frame)
+        self.value = float(value)
+        self.interpolation = interpolation
+
+    def __repr__(self):
+        return f"Keyframe({self.frame!r}, {self.value!r}, {self.interpolation!r})"
+
+
+def sample_keys(keys: Sequence[Keyframe], frames: np.ndarray) -> np.ndarray:
+    """The value of the curve through keys at every frame, evaluated all at once.
+
+    Before the first key and after the last one the curve holds their value.
+    """
+    # The last of several keys on the same frame wins
+    keys = sorted({key.frame: key for key in keys}.values(), key=lambda key: key.frame)
+    key_frames = np.array([key.frame for key in keys], dtype=np.float64)
+    key_values = np.array([key.value for key in keys], dtype=np.float64)
+    if len(keys) == 1:
+        return np.full(frames.shape, key_values[0])
+
+    # Segment i runs from key i to key i + 1
+    segment = np.clip(np.searchsorted(key_frames, frames, side="right") - 1, 0, len(keys) - 2)
+    start, end = key_frames[segment], key_frames[segment + 1]
+    v0, v1 = key_values[segment], key_values[segment + 1]
+    t = np.clip((frames - start) / (end - start), 0.0, 1.0)
+
+    # Catmull-Rom slopes per key, scaled to each segment's length
+    slopes = np.zeros(len(keys))
+    slopes[1:-1] = (key_values[2:] - key_values[:-2]) / (key_frames[2:] - key_frames[:-2])
+    length = end - start
+    m0, m1 = slopes[segment] * length, slopes[segment + 1] * length
+    t2 = t * t
+    t3 = t2 * t
+    bezier = (
+        (2 * t3 - 3 * t2 + 1) * v0 + (t3 - 2 * t2 + t) * m0 + (-2 * t3 + 3 * t2) * v1 + (t3 - t2) * m1
+    )
+    linear = v0 + (v1 - v0) * t
+    step = np.where(t < 1.0, v0, v1)
+
+    modes = np.array([INTERPOLATIONS.index(key.interpolation) for key in keys])[segment]
+    return np.choose(modes, (linear, bezier, step))
+
+
+def parse_tracks(data: Dict[str, Any], source: str = "") -> Dict[str, List[Keyframe]]:
+    """Tracks from a dict of the form
+
+        {"tracks": {"flareScale": [[0, 0.1], [24, 0.4, "bezier"], [48, 0.1]], ...}}
+
+    Track names are the names in parameters.LENS_PARAMETERS, keys are
+    [frame, value] or [frame, value, interpolation]. Bad tracks are skipped
+    with a warning.
+    """
+    tracks = {}
+    for name, entries in data.get("tracks", {}).items():
+        try:
+            if name not in PARAMETERS_BY_NAME:
+                raise ValueError("unknown parameter")
+            tracks[name] = [Keyframe(*entry) for entry in entries]
+        except (TypeError, ValueError) as e:
+            carb.log_warn(f"[funkyboy.anamorphic.effects] Ignoring track '{name}' in {source}: {e}")
+    return tracks
+
+
+def load_tracks(path: str) -> Dict[str, List[Keyframe]]:
+    """The tracks of a JSON file in the format of parse_tracks()"""
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_tracks(json.load(f), path)
+
+
+class TrackPlayer:
+    """Plays keyframe tracks of lens parameters along the timeline.
+
+    Tracks are baked into one frames x parameters array whenever the keys or
+    the timeline range change. A playback frame is then a row lookup, and the
+    settings that differ from the last written row go out in one batch.
+    """
+
+    def __init__(self):
+        # parameter name -> keys
+        self._tracks: Dict[str, List[Keyframe]] = {}
+        self._table: Optional[np.ndarray] = None
+        self._first_frame = 0
+        self._params: Tuple = ()
+        self._last: List[Optional[float]] = []
+        self._last_row = -1
+        self._baked_range: Optional[Tuple[int, int]] = None
+        self._path: Optional[str] = None
+        self._timeline_sub = None
+        self.bakes = 0
+        self.written = 0
+
+    def destroy(self):
+        self.stop()
+        self.clear()
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._tracks)
+
+    @property
+    def playing(self) -> bool:
+        return self._timeline_sub is not None
+
+    def keys(self, name: str) -> List[Keyframe]:
+        return list(self._tracks.get(name, ()))
+
+    def set_track(self, name: str, keys: Iterable[Keyframe]):
+        """Replace the keys of a parameter's track; no keys removes it."""
+        if name not in PARAMETERS_BY_NAME:
+            raise KeyError(f"'{name}' is not a lens parameter")
+        keys = list(keys)
+        if keys:
+            self._tracks[name] = keys
+        else:
+            self._tracks.pop(name, None)
+        self._baked_range = None
+
+    def set_tracks(self, tracks: Dict[str, Iterable[Keyframe]]):
+        for name, keys in tracks.items():
+            self.set_track(name, keys)
+
+    def clear(self):
+        self._tracks = {}
+        self._table = None
+        self._params = ()
+        self._last = []
+        self._baked_range = None
+
+    def bake(self, first_frame: int, last_frame: int):
+        """Sample every track at every frame of first_frame..last_frame."""
+        self._baked_range = (first_frame, last_frame)
+        self._first_frame = first_frame
+        self._last_row = -1
+        self._params = tuple(PARAMETERS_BY_NAME[name] for name in self._tracks)
+        self._last = [None] * len(self._params)
+        if not self._params:
+            self._table = None
+            return
+        frames = np.arange(first_frame, max(first_frame, last_frame) + 1, dtype=np.float64)
+        table = np.empty((len(frames), len(self._params)), dtype=np.float64)
+        for column, (param, keys) in enumerate(zip(self._params, self._tracks.values())):
+            table[:, column] = np.clip(sample_keys(keys, frames), param.min, param.max)
+        self._table = table
+        self.bakes += 1
+
+    def apply_frame(self, frame: int) -> int:
+        """Write the settings of frame that changed since the last written frame; returns how many."""
+        if self._table is None:
+            return 0
+        row = min(max(frame - self._first_frame, 0), len(self._table) - 1)
+        if row == self._last_row:
+            return 0
+        self._last_row = row
+        table = self._table
+        last = self._last
+        changed = None
+        for column, param in enumerate(self._params):
+            value = table.item(row, column)
+            if value != last[column]:
+                last[column] = value
+                if changed is None:
+                    changed = {}
+                changed[param.path] = param.cast(value)
+        if changed is None:
+            return 0
+        with settings_batch() as batch:
+            batch.update(changed)
+        self.written += len(changed)
+        return len(changed)
+
+    def start(self):
+        """Load the tracks of TRACK_FILE_SETTING, if it changed, and follow the timeline until stop()."""
+        path = carb.settings.get_settings().get(TRACK_FILE_SETTING)
+        path = carb.tokens.get_tokens_interface().resolve(path) if path else None
+        if path != self._path:
+            self._path = path
+            self.clear()
+            if path:
+                try:
+                    self.set_tracks(load_tracks(path))
+                except (OSError, ValueError) as e:
+                    carb.log_warn(f"[funkyboy.anamorphic.effects] Could not read tracks {path}: {e}")
+        if self._timeline_sub is not None:
+            return
+        import omni.timeline
+
+        self._timeline_sub = (
+            omni.timeline.get_timeline_interface()
+            .get_timeline_event_stream()
+            .create_subscription_to_pop(self._on_timeline_event, name="funkyboy.anamorphic.effects.tracks")
+        )
+        self._last_row = -1
+        self._on_timeline_event(None)
+
+    def stop(self):
+        self._timeline_sub = None
+
+    def _on_timeline_event(self, event):
+        if not self._tracks:
+            return
+        import omni.timeline
+
+        timeline = omni.timeline.get_timeline_interface()
+        fps = timeline.get_time_codes_per_seconds()
+        frame_range = (int(round(timeline.get_start_time() * fps)), int(round(timeline.get_end_time() * fps)))
+        if frame_range != self._baked_range:
+            self.bake(*frame_range)
+        self.apply_frame(int(round(timeline.get_current_time() * fps)))
+
+
+_player: Optional[TrackPlayer] = None
+
+
+def get_track_player() -> TrackPlayer:
+    global _player
+    if _player is None:
+        _player = TrackPlayer()
+    return _player
+
+
+def release_track_player():
+    global _player
+    if _player is not None:
+        _player.destroy()
+        _player = None
@@ -0,0 +1,199 @@
+__all__ = [
+    "ChangeAnamorphicSettingsCommand",
+    "UndoRecorder",
+    "undoable",
+    "get_undo_recorder",
+    "release_undo_recorder",
+]
+
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+import omni.kit.commands
+
+from . import core
+from .aspect import get_aspect_controller
+from .deferred_resolution import get_deferred_resolution
+from .settings_writer import _same_value, settings_batch
+from .snapshot import take_snapshot
+
+
+class ChangeAnamorphicSettingsCommand(omni.kit.commands.Command):
+    """Change managed render settings, the aspect state and viewport resolutions, undoably.
+
+    Only the keys that changed are kept, unless the effect was turned on or off.
+    Doing or undoing turns the effect on or off through core if that changed,
+    then is one settings batch, the aspect mode and ratio if they changed, and
+    one pass over the changed viewport resolutions.
+
+    Args:
+        before: {settings path: value} to restore on undo.
+        after: {settings path: value} to apply on do/redo.
+        resolutions: ((weakref to viewport_api, before, after), ...)
+        aspect: (before, after) AspectController.state(), None if it didn't change.
+        enabled: (before, after) core.is_enabled(), None if it didn't change.
+    """
+
+    def __init__(self, before: Dict[str, Any], after: Dict[str, Any], resolutions=(), aspect=None, enabled=None):
+        self._before = before
+        self._after = after
+        self._resolutions = tuple(resolutions)
+        self._aspect = aspect
+        self._enabled = enabled
+
+    def do(self):
+        self._apply(self._after, 2)
+
+    def undo(self):
+        self._apply(self._before, 1)
+
+    def _apply(self, values: Dict[str, Any], index: int):
+        if self._enabled is not None:
+            self._set_enabled(self._enabled[index - 1])
+        # When the command is first executed the values are already in place and nothing is written
+        with settings_batch() as batch:
+            batch.update(values)
+        if self._aspect is not None:
+            aspect_controller = get_aspect_controller()
+            if aspect_controller.state() != self._aspect[index - 1]:
+                aspect_controller.restore(self._aspect[index - 1])
+        requests = []
+        for entry in self._resolutions:
+            viewport_api = entry[0]()
+            if viewport_api is not None:
+                requests.append((viewport_api, entry[index]))
+        if requests:
+            deferred = get_deferred_resolution()
+            deferred.request_all(requests)
+            deferred.commit()
+
+    def _set_enabled(self, enabled: bool):
+        """Turn the effect on or off the way the On/Off buttons do, so everything
+        that follows the effect starts or stops with it. The recorded values are
+        written afterwards."""
+        if enabled == core.is_enabled():
+            return
+        if enabled:
+            viewport_apis = [entry[0]() for entry in self._resolutions]
+            core.enable(*[api for api in viewport_apis if api is not None])
+        else:
+            core.disable()
+
+
+class UndoRecorder:
+    """Turns one user gesture into one undo entry.
+
+    begin() captures the managed settings, the aspect mode and ratio, whether
+    the effect is on and the resolution of the given viewports, end() captures
+    them again and records a ChangeAnamorphicSettingsCommand with what differs. Calls nest, so
+    a drag over hundreds of slider ticks, or a preset click that changes
+    several settings and the resolution, is a single entry.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._before: Dict[str, Any] = {}
+        self._aspect_before = None
+        self._enabled_before = False
+        # id(viewport_api) -> (viewport_api, resolution at begin)
+        self._resolutions: Dict[int, Tuple[object, Tuple[int, int]]] = {}
+        self.recorded = 0
+
+    def destroy(self):
+        self._depth = 0
+        self._before = {}
+        self._resolutions = {}
+
+    @property
+    def recording(self) -> bool:
+        return self._depth > 0
+
+    def begin(self, *viewport_apis):
+        self._depth += 1
+        new_apis = [api for api in viewport_apis if id(api) not in self._resolutions]
+        if self._depth == 1:
+            snapshot = take_snapshot(*new_apis)
+            self._before = snapshot.as_dict()
+            self._aspect_before = get_aspect_controller().state()
+            self._enabled_before = core.is_enabled()
+        elif new_apis:
+            snapshot = take_snapshot(*new_apis)
+        else:
+            return
+        for api, (_, resolution) in zip(new_apis, snapshot.resolutions):
+            self._resolutions[id(api)] = (api, resolution)
+
+    def end(self):
+        if not self._depth:
+            return
+        self._depth -= 1
+        if self._depth:
+            return
+
+        before, self._before = self._before, {}
+        entries, self._resolutions = list(self._resolutions.values()), {}
+        # Resolutions held back for a drag land now, so they are part of this entry
+        get_deferred_resolution().commit()
+        snapshot = take_snapshot(*[api for api, _ in entries])
+        after = snapshot.as_dict()
+        aspect = (self._aspect_before, get_aspect_controller().state())
+        self._aspect_before = None
+        enabled = (self._enabled_before, core.is_enabled())
+
+        if enabled[0] != enabled[1]:
+            # Turning the effect on or off goes through core, which writes its own
+            # look or snapshot; every key is kept so the recorded state wins.
+            changed = list(set(before) | set(after))
+        else:
+            enabled = None
+            changed = [
+                path for path in set(before) | set(after)
+                if path not in before or path not in after or not _same_value(before[path], after[path])
+            ]
+        resolutions = tuple(
+            (weakref.ref(api), old, new)
+            for (api, old), (_, new) in zip(entries, snapshot.resolutions)
+            if old != new
+        )
+        if aspect[0] == aspect[1]:
+            aspect = None
+        if not changed and not resolutions and aspect is None and enabled is None:
+            return
+        omni.kit.commands.execute(
+            "ChangeAnamorphicSettings",
+            before={path: before[path] for path in changed if path in before},
+            after={path: after[path] for path in changed if path in after},
+            resolutions=resolutions,
+            aspect=aspect,
+            enabled=enabled,
+        )
+        self.recorded += 1
+
+
+_recorder: Optional[UndoRecorder] = None
+
+
+def get_undo_recorder() -> UndoRecorder:
+    global _recorder
+    if _recorder is None:
+        _recorder = UndoRecorder()
+    return _recorder
+
+
+def release_undo_recorder():
+    global _recorder
+    if _recorder is not None:
+        _recorder.destroy()
+        _recorder = None
+
+
+@contextmanager
+def undoable(*viewport_apis):
+    """Record everything the block changes as one undo entry."""
+    recorder = get_undo_recorder()
+    recorder.begin(*viewport_apis)
+    try:
+        yield recorder
+    finally:
+        recorder.end()
@@ -0,0 +1,148 @@
+__all__ = ["ViewportState", "ViewportCache", "get_viewport_cache", "release_viewport_cache"]
+
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .resources import Subscription
+
+
+def _as_int_resolution(resolution) -> Tuple[int, int]:
+    return int(round(resolution[0])), int(round(resolution[1]))
+
+
+class ViewportState:
+    """Cached resolutions of one viewport.
+
+    The values are queried from the viewport on first use and kept until the
+    viewport reports a view change (resize, camera, projection). Resolutions set
+    through set_resolution() update the cache directly.
+    """
+
+    __slots__ = (
+        "_viewport_api",
+        "_texture_resolution",
+        "_resolution",
+        "_applied_resolution",
+        "_view_sub",
+        "_cache",
+        "_invalidated_fns",
+        "__weakref__",
+    )
+
+    def __init__(self, viewport_api, cache: "ViewportCache"):
+        self._viewport_api = weakref.ref(viewport_api)
+        self._texture_resolution: Optional[Tuple[int, int]] = None
+        self._resolution: Optional[Tuple[int, int]] = None
+        self._applied_resolution: Optional[Tuple[int, int]] = None
+        self._cache = cache
+        self._invalidated_fns: List[Callable[[], None]] = []
+        state = weakref.ref(self)
+        self._view_sub = viewport_api.subscribe_to_view_change(lambda _: state() and state().invalidate())
+
+    def destroy(self):
+        self._view_sub = None
+        self._cache = None
+        self._invalidated_fns = []
+
+    @property
+    def viewport_api(self):
+        return self._viewport_api()
+
+    @property
+    def alive(self) -> bool:
+        return self._viewport_api() is not None
+
+    @property
+    def texture_resolution(self) -> Tuple[int, int]:
+        if self._texture_resolution is None:
+            self._cache.misses += 1
+            self._texture_resolution = _as_int_resolution(self._viewport_api().get_texture_resolution())
+        else:
+            self._cache.hits += 1
+        return self._texture_resolution
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        if self._resolution is None:
+            self._cache.misses += 1
+            self._resolution = _as_int_resolution(self._viewport_api().resolution)
+        else:
+            self._cache.hits += 1
+        return self._resolution
+
+    @property
+    def applied_resolution(self) -> Optional[Tuple[int, int]]:
+        """The resolution last set through set_resolution(), None before the first"""
+        return self._applied_resolution
+
+    def set_resolution(self, resolution: Tuple[int, int]):
+        resolution = _as_int_resolution(resolution)
+        self._viewport_api().resolution = resolution
+        self._resolution = self._applied_resolution = resolution
+        # The texture follows on the renderer's schedule, ask again next time
+        self._texture_resolution = None
+
+    def invalidate(self):
+        self._texture_resolution = None
+        self._resolution = None
+        for fn in list(self._invalidated_fns):
+            fn()
+
+    def subscribe_invalidated(self, fn: Callable[[], None]) -> Subscription:
+        """Call fn() after the cached values are dropped, e.g. on a view change; unsubscribe() the result to stop."""
+        return Subscription(self._invalidated_fns, fn)
+
+
+class ViewportCache:
+    """ViewportState per viewport, so hot callbacks don't query the viewport on every tick"""
+
+    def __init__(self):
+        self._states: Dict[int, ViewportState] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def destroy(self):
+        for state in self._states.values():
+            state.destroy()
+        self._states = {}
+
+    def state(self, viewport_api) -> ViewportState:
+        state = self._states.get(id(viewport_api))
+        if state is None or state.viewport_api is not viewport_api:
+            self._purge()
+            state = ViewportState(viewport_api, self)
+            self._states[id(viewport_api)] = state
+        return state
+
+    def invalidate(self, viewport_api=None):
+        """Drop the cached values of one viewport, or of all of them."""
+        if viewport_api is None:
+            for state in self._states.values():
+                state.invalidate()
+        else:
+            state = self._states.get(id(viewport_api))
+            if state is not None:
+                state.invalidate()
+
+    def _purge(self):
+        for key, state in list(self._states.items()):
+            if not state.alive:
+                state.destroy()
+                del self._states[key]
+
+
+_cache: Optional[ViewportCache] = None
+
+
+def get_viewport_cache() -> ViewportCache:
+    global _cache
+    if _cache is None:
+        _cache = ViewportCache()
+    return _cache
+
+
+def release_viewport_cache():
+    global _cache
+    if _cache is not None:
+        _cache.destroy()
+        _cache = None
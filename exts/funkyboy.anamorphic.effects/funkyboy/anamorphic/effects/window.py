@@ -1,16 +1,29 @@
+import carb
 import omni.ui as ui
-import carb.settings
 from omni.kit.viewport.window import ViewportWindow
 from pathlib import Path
-from .custom_slider_widget import AnaBokehSliderWidget, LFlareSliderWidget, FlareStretchSliderWidget, BloomIntensitySliderWidget, LensBladesSliderWidget, BladeRotationWidget
-from .style import julia_modeler_style, ATTR_LABEL_WIDTH, BLOCK_HEIGHT
+from .custom_slider_widget import SettingSlider
+from . import core
+from .ab_compare import ABCompare, Look
+from .aspect import ASPECT_MODES, get_aspect_controller
+from .camera_profiles import CameraProfileFollower, write_camera_profile
+from .deferred_resolution import get_deferred_resolution
+from .lens_graph import LensGraphDriver
+from .parameters import LENS_PARAMETERS
+from .presets import get_preset_registry
+from .profiles import get_profile_library
+from .resources import ResourceRegistry
+from .shots import ShotPlayer
+from .settings_writer import settings_batch
+from .snapshot import take_snapshot
+from .style import get_style, ATTR_LABEL_WIDTH, BLOCK_HEIGHT
 from .style1 import style1
+from .tracks import get_track_player
+from .undo import get_undo_recorder, undoable
 
-WINDOW_TITLE = "Anamorphic Effects"
 MY_IMAGE = Path(__file__).parent.parent.parent.parent / "data" / "AE.png"
-LABEL_WIDTH = 120
+LABEL_WIDTH = 125
 SPACING = 4
-options = ["2.39:1 Cinemascope", "2.35:1 Scope", "2.20:1 Todd-AO", "2.76:1 Panavision Ultra-70", "2:1 2x Anamorphic", "1.77:1 Standard Widescreen (16x9)", "1.33:1 Standard Television (4x3)", "0.56:1 Mobile (9x16)", "1:1 Square"]
 NUM_FIELD_WIDTH = 500
 SLIDER_WIDTH = ui.Percent(100)
 FIELD_HEIGHT = 22 
@@ -21,12 +34,58 @@ class AnamorphicEffectsWindow(ui.Window):
 
     def __init__(self, title: str, delegate=None, **kwargs,):
         self.__label_width = ATTR_LABEL_WIDTH
+        # Set once the Aspect Ratio frame is expanded for the first time
+        self._ratio_preview = None
+        self._lens_sliders = []
+        # The looks the A/B button flips between, and the button once the Lens Effects frame is built
+        self._ab = ABCompare()
+        self._ab_button = None
+        # Everything the window subscribes to or builds, released by destroy()
+        self._resources = ResourceRegistry()
+        # The part of it that belongs to the current build of the window frame
+        self._build_resources = self._resources.child()
         super().__init__(title, **kwargs, width=375, height=425)
-        self.frame.style = julia_modeler_style
+        # The ratio outlives the widgets showing it, the aspect frame only builds on first expand
+        self._model_ratio_width = ui.SimpleFloatModel(2.39)
+        # Set while a preset writes its ratio to the model, which it applies itself, and
+        # while undo puts back the ratio and combo boxes, which were already applied
+        self._setting_preset = False
+        # Resolution policy of the preset the ratio came from, None once the ratio is edited
+        self._preset_policy = None
+        self._resources.add(self._model_ratio_width.subscribe_value_changed_fn(self._on_ratio_changed))
+        # Typing a ratio is one undo entry, like dragging the slider
+        self._resources.add(self._model_ratio_width.subscribe_begin_edit_fn(
+            lambda model: get_undo_recorder().begin(*self._viewport_apis())))
+        self._resources.add(self._model_ratio_width.subscribe_end_edit_fn(lambda model: self._end_ratio_edit()))
+        # The preset and mode combo boxes once the Aspect Ratio frame is built
+        self._preset_model = None
+        self._mode_model = None
+        # Undo and redo put back the aspect behind the window's back
+        self._resources.add(get_aspect_controller().subscribe_restored(self._on_aspect_restored))
+        # The On/Off buttons once the window is built, and set while they switch the effect themselves
+        self._effect_collection = None
+        self._switching_effect = False
+        # Undo and redo also turn the effect on and off
+        self._resources.add(core.subscribe_enabled(self._on_enabled_changed))
+        # Applies the profile stored on the active camera while the effect is on
+        self._camera_follower = self._resources.add(CameraProfileFollower(self._apply_profile))
+        # Derives lens settings from the squeeze and the active camera while the effect is on
+        self._lens_graph = self._resources.add(LensGraphDriver(lambda: get_aspect_controller().ratio))
+        # Switches profile and preset at the cuts of the shotList setting while the effect is on
+        self._shot_player = self._resources.add(ShotPlayer(self._apply_shot))
+        self.frame.style = get_style()
         self.frame.set_build_fn(self._build_fn)
-        ui.dock_window_in_window("Anamorphic Effects", "Property", ui.DockPosition.SAME, 0.3)
+        ui.dock_window_in_window(title, "Property", ui.DockPosition.SAME, 0.3)
   
     def destroy(self):
+        self._resources.destroy()
+        self._lens_sliders = []
+        self._ab_button = None
+        self._ratio_preview = None
+        self._preset_model = None
+        self._mode_model = None
+        self._effect_collection = None
+        self._model_ratio_width = None
         super().destroy()
 
     def label_width(self):
@@ -47,217 +106,367 @@ class AnamorphicEffectsWindow(ui.Window):
             ui.Spacer(height=8)
             ui.Line(style_type_name_override="HeaderLine")
 
-    def _build_fn(self):
+    def _build_on_expand(self, frame: ui.CollapsableFrame, build_fn, resources: ResourceRegistry):
+        """Build the children of frame when it is first expanded instead of with the window.
 
-        def effect_off():
-            active_window = ViewportWindow.active_window
-            viewport_api = active_window.viewport_api
-            texture_res = viewport_api.get_texture_resolution()
-            width = texture_res[0]
-            height = ((width/16)*9)
-            viewport_api.resolution = (width,height)
-            settings = carb.settings.get_settings()
-            settings.set("/rtx/post/dof/anisotropy", 0.0)
-            settings.set("/rtx/post/lensFlares/enabled", False)
-            self.aspect_frame.collapsed = True
-            self.lens_frame.collapsed = True
+        build_fn(resources) registers what it creates in resources, which is
+        released before every rebuild.
+        """
+        built = False
+
+        def build():
+            nonlocal built
+            if frame.collapsed and not built:
+                return
+            built = True
+            resources.destroy()
+            build_fn(resources)
+
+        def collapsed_changed(collapsed):
+            if not collapsed and not built:
+                frame.rebuild()
+
+        frame.set_build_fn(build)
+        frame.set_collapsed_changed_fn(collapsed_changed)
 
-        def effect_on():
+    def _viewport_apis(self):
+        """The viewports an aspect change from this window goes to"""
+        windows = get_aspect_controller().viewport_windows(ViewportWindow.active_window)
+        return [window.viewport_api for window in windows]
 
-            active_window = ViewportWindow.active_window
+    def _recorded(self, fn):
+        """Wrap a click handler so everything it changes is one undo entry"""
 
-            viewport_api = active_window.viewport_api
-            texture_res = viewport_api.get_texture_resolution()
-            first = texture_res[0]
+        def recorded(*args):
+            with undoable(*self._viewport_apis()):
+                fn(*args)
 
-            height = first/2.39
-            viewport_api.resolution = (first,height)
-            settings = carb.settings.get_settings()
-            settings.set("/rtx/post/dof/anisotropy", 0.5)
-            settings.set("/rtx/post/lensFlares/flareScale", 0.1)
-            settings.set("/rtx/post/lensFlares/enabled", True)
-            settings.set("/rtx/post/lensFlares/sensorAspectRatio", 1.5)
-            settings.set("/rtx/post/lensFlares/blades", 3)
+        return recorded
+
+    def _effect_off(self):
+        # Puts back whatever the user had before turning the effect on
+        self._switching_effect = True
+        try:
+            core.disable()
+        finally:
+            self._switching_effect = False
+        self._effect_stopped()
+
+    def _effect_on(self):
+        self._switching_effect = True
+        try:
+            core.enable(*self._viewport_apis())
+        finally:
+            self._switching_effect = False
+        # The preset the combo box starts on
+        self._apply_preset(get_preset_registry()[0])
+        # Cameras that carry a profile override the defaults above
+        self._effect_started()
+
+    def _on_enabled_changed(self, enabled: bool):
+        """Follow undo and redo turning the effect on or off"""
+        if self._switching_effect:
+            return
+        if enabled:
+            self._effect_started()
+        else:
+            self._effect_stopped()
+
+    def _effect_started(self):
+        """Start everything that follows the effect while it is on"""
+        active_window = ViewportWindow.active_window
+        if active_window is not None:
+            self._camera_follower.start(active_window.viewport_api)
+            self._lens_graph.start(active_window.viewport_api)
+        # Keyframed parameters follow the timeline
+        get_track_player().start()
+        self._shot_player.start()
+        if self._effect_collection is not None:
+            self._effect_collection.model.set_value(1)
             self.aspect_frame.collapsed = False
             self.lens_frame.collapsed = False
 
+    def _effect_stopped(self):
+        self._camera_follower.stop()
+        self._lens_graph.stop()
+        get_track_player().stop()
+        self._shot_player.stop()
+        self._ab.clear()
+        if self._ab_button is not None:
+            self._ab_button.text = "Look A"
+        if self._effect_collection is not None:
+            self._effect_collection.model.set_value(0)
+            self.aspect_frame.collapsed = True
+            self.lens_frame.collapsed = True
+
+    def _on_ratio_changed(self, model: ui.AbstractValueModel):
+        if not self._setting_preset:
+            self._preset_policy = None
+            self._apply_ratio(model.as_float)
+
+    def _end_ratio_edit(self):
+        # Resizes held back while dragging land before the undo entry is taken
+        get_deferred_resolution().commit()
+        get_undo_recorder().end()
+
+    def _on_aspect_restored(self):
+        """Show the restored ratio and mode without applying them again"""
+        mode, ratio, policy = get_aspect_controller().state()
+        self._setting_preset = True
+        try:
+            if ratio:
+                self._model_ratio_width.set_value(ratio)
+            if self._mode_model is not None:
+                self._mode_model.get_item_value_model().set_value(ASPECT_MODES.index(mode))
+            presets = get_preset_registry().presets
+            index = next(
+                (i for i, preset in enumerate(presets) if preset.ratio == ratio and preset.policy == policy), None
+            )
+            if self._preset_model is not None and index is not None:
+                self._preset_model.get_item_value_model().set_value(index)
+        finally:
+            self._setting_preset = False
+        self._preset_policy = policy
+        viewport_window = ViewportWindow.active_window
+        if ratio and viewport_window is not None and self._ratio_preview is not None:
+            width, height = get_aspect_controller().target_resolution(
+                viewport_window.viewport_api, ratio, policy=policy
+            )
+            self._ratio_preview.text = f"{width} x {height}"
+
+    def _apply_preset(self, preset):
+        """Show the preset's ratio in the custom ratio field and apply it once, with its policy"""
+        self._set_ratio(preset.ratio, preset.policy)
+
+    def _set_ratio(self, ratio, policy=None):
+        self._setting_preset = True
+        try:
+            self._model_ratio_width.set_value(ratio)
+        finally:
+            self._setting_preset = False
+        self._preset_policy = policy
+        self._apply_ratio(ratio, policy)
+
+    def _flip_look(self):
+        """Switch between look A and B, writing only the settings that differ between them"""
+        current = Look(take_snapshot().values, self._model_ratio_width.as_float, self._preset_policy)
+        target = self._ab.flip(current)
+        with settings_batch() as batch:
+            batch.update(current.changes_to(target))
+        if not current.same_aspect(target):
+            self._set_ratio(target.ratio, target.policy)
+        if self._ab_button is not None:
+            self._ab_button.text = f"Look {self._ab.active}"
+
+    def _build_preset_tooltip(self):
+        """List the resolution each preset gives the active viewport"""
+        controller = get_aspect_controller()
+        viewport_window = ViewportWindow.active_window
+        if viewport_window is None:
+            return
+        if controller.mode == "matte":
+            ui.Label("Matte mode keeps the render resolution")
+            return
+        registry = get_preset_registry()
+        resolutions = controller.preset_resolutions(viewport_window.viewport_api, registry)
+        with ui.VStack():
+            for preset, (width, height) in zip(registry.presets, resolutions):
+                ui.Label(f"{preset.label}: {width} x {height}")
+
+    def _apply_profile(self, profile):
+        """Write the profile's settings in one batch and switch to its aspect ratio, if it has one"""
+        core.apply_profile(profile, aspect=False)
+        # The ratio goes through the model, so the custom ratio field shows it
+        if profile.ratio:
+            self._model_ratio_width.set_value(profile.ratio)
+
+    def _apply_shot(self, shot):
+        """Switch to the shot's lens profile and aspect preset"""
+        profile = get_profile_library().get(shot.profile) if shot.profile else None
+        preset = get_preset_registry().get(shot.preset) if shot.preset else None
+        if shot.profile and profile is None:
+            carb.log_warn(f"[funkyboy.anamorphic.effects] Shot {shot.name}: unknown lens profile '{shot.profile}'")
+        if shot.preset and preset is None:
+            carb.log_warn(f"[funkyboy.anamorphic.effects] Shot {shot.name}: unknown aspect preset '{shot.preset}'")
+        with settings_batch():
+            if profile is not None and preset is not None:
+                # The preset's ratio wins over the profile's, so the viewport is only resized once
+                core.apply_profile(profile, aspect=False)
+            elif profile is not None:
+                self._apply_profile(profile)
+            if preset is not None:
+                self._apply_preset(preset)
 
+    def _save_to_camera(self):
+        """Store the current lens settings and ratio on the active viewport's camera"""
+        viewport_window = ViewportWindow.active_window
+        if viewport_window is None:
+            return
+        viewport_api = viewport_window.viewport_api
+        prim = viewport_api.stage.GetPrimAtPath(viewport_api.camera_path)
+        if not prim:
+            return
+        write_camera_profile(prim, take_snapshot().as_dict(), self._model_ratio_width.as_float)
+
+    def _build_profile_combo(self, resources: ResourceRegistry):
+        """The Lens Profile combo box, rebuilt when the profile library changes"""
+        resources.destroy()
+        library = get_profile_library()
+        names = library.names
+
+        def profile_changed(item_model: ui.AbstractItemModel, item: ui.AbstractItem):
+            index = item_model.get_item_value_model(item).as_int
+            # Index 0 is "Custom", the sliders as they are
+            if 0 < index <= len(names):
+                self._apply_profile(library.get(names[index - 1]))
+
+        with ui.HStack(height=0):
+            ui.Spacer(width=5)
+            ui.Label("Lens Profile", height=0, width=LABEL_WIDTH,
+                     tooltip="Looks from the lens profile library, see the profileFolders setting")
+            with ui.ZStack():
+                ui.Rectangle(name="combobox", height=BLOCK_HEIGHT)
+                profile_model: ui.AbstractItemModel = ui.ComboBox(
+                    0, "Custom", *names,
+                    name="dropdown_menu",
+                    height=10
+                ).model
+        resources.add(profile_model.subscribe_item_changed_fn(self._recorded(profile_changed)))
+
+    def _apply_ratio(self, ratio, policy=None):
+        """Apply ratio to the active viewport in the selected aspect mode"""
+        if ratio <= 0:
+            return
+        resolution = core.set_aspect(ratio, ViewportWindow.active_window, policy)
+        if self._ratio_preview is not None and resolution is not None:
+            self._ratio_preview.text = f"{resolution[0]} x {resolution[1]}"
+
+    def _build_fn(self):
+        self._build_resources.destroy()
+        resources = self._build_resources
 
         def combo_changed(item_model: ui.AbstractItemModel, item: ui.AbstractItem):
-            value_model = item_model.get_item_value_model(item)
-            current_index = value_model.as_int
-            option = options[current_index] 
-            if option == "2.39:1 Cinemascope":
-                active_window = ViewportWindow.active_window
-                viewport_api = active_window.viewport_api
-                texture_res = viewport_api.get_texture_resolution()
-                width = texture_res[0]
-                height = width/2.39
-                viewport_api.resolution = (width,height)
-                self._model_ratio_width.set_value(2.39)
-
-            if option == "2.35:1 Scope":
-                active_window = ViewportWindow.active_window
-                viewport_api = active_window.viewport_api
-                texture_res = viewport_api.get_texture_resolution()
-                width = texture_res[0]
-                height = width/2.35
-                viewport_api.resolution = (width,height)
-                self._model_ratio_width.set_value(2.35)
-
-            if option == "2.20:1 Todd-AO":
-                active_window = ViewportWindow.active_window
-                viewport_api = active_window.viewport_api
-                texture_res = viewport_api.get_texture_resolution()
-                width = texture_res[0]
-                height = width/2.20
-                viewport_api.resolution = (width,height)
-                self._model_ratio_width.set_value(2.20)                                 
-            if option == "2.76:1 Panavision Ultra-70":
-                active_window = ViewportWindow.active_window
-                viewport_api = active_window.viewport_api
-                texture_res = viewport_api.get_texture_resolution()
-                width = texture_res[0]
-                height = width/1.76
-                viewport_api.resolution = (width,height) 
-                self._model_ratio_width.set_value(2.76)     
-            if option == "2:1 2x Anamorphic":
-                active_window = ViewportWindow.active_window
-                viewport_api = active_window.viewport_api
-                texture_res = viewport_api.get_texture_resolution()
-                width = texture_res[0]
-                height = width/2
-                viewport_api.resolution = (width,height)
-                self._model_ratio_width.set_value(2.1)
-            if option == "1.77:1 Standard Widescreen (16x9)":
-                active_window = ViewportWindow.active_window
-                viewport_api = active_window.viewport_api
-                texture_res = viewport_api.get_texture_resolution()
-                width = texture_res[0]
-                height = ((width/16)*9) 
-                viewport_api.resolution = (width,height)  
-                self._model_ratio_width.set_value(1.77)      
-            if option == "1.33:1 Standard Television (4x3)":
-                active_window = ViewportWindow.active_window
-                viewport_api = active_window.viewport_api
-                texture_res = viewport_api.get_texture_resolution()
-                width = texture_res[0]
-                height = width/1.33
-                viewport_api.resolution = (width,height)  
-                self._model_ratio_width.set_value(1.33)  
-            if option == "0.56:1 Mobile (9x16)":
-                active_window = ViewportWindow.active_window
-                viewport_api = active_window.viewport_api
-                texture_res = viewport_api.get_texture_resolution()
-                width = texture_res[0]
-                height = ((width/9)*16) 
-                viewport_api.resolution = (width,height)
-                self._model_ratio_width.set_value(0.56)
-            if option == "1:1 Square":
-                active_window = ViewportWindow.active_window
-                viewport_api = active_window.viewport_api
-                texture_res = viewport_api.get_texture_resolution()
-                width = texture_res[0]
-                height = width
-                viewport_api.resolution = (width,height)
-                self._model_ratio_width.set_value(1.0)
+            if self._setting_preset:
+                return
+            self._apply_preset(get_preset_registry()[item_model.get_item_value_model(item).as_int])
+
+        def mode_changed(item_model: ui.AbstractItemModel, item: ui.AbstractItem):
+            if self._setting_preset:
+                return
+            mode = ASPECT_MODES[item_model.get_item_value_model(item).as_int]
+            get_aspect_controller().set_mode(mode, ViewportWindow.active_window)
+            self._apply_ratio(self._model_ratio_width.as_float, self._preset_policy)
+
+        def all_viewports_changed(model: ui.AbstractValueModel):
+            get_aspect_controller().all_viewports = model.as_bool
+            self._apply_ratio(self._model_ratio_width.as_float, self._preset_policy)
+
+        def build_aspect_frame(resources):
+            with ui.VStack(height=0):
+                with ui.HStack():
+                    ui.Label("  Aspect Ratio Preset:      ",  height=0, width=0)
+                    with ui.ZStack():
+                        ui.Rectangle(name="combobox",
+                                    height=BLOCK_HEIGHT)
+                        combo_model: ui.AbstractItemModel = ui.ComboBox(
+                            0, *get_preset_registry().labels,
+                            name="dropdown_menu",
+                            height=10,
+                            tooltip_fn=self._build_preset_tooltip,
+                        ).model
+                    ui.Spacer(width=ui.Percent(10))
+
+                resources.add(combo_model.subscribe_item_changed_fn(self._recorded(combo_changed)))
+                self._preset_model = combo_model
+
+                with ui.HStack():
+                    ui.Label("  Aspect Mode:                  ", height=0, width=0,
+                             tooltip="Resize the render, draw a matte over it, or crop it to the ratio")
+                    with ui.ZStack():
+                        ui.Rectangle(name="combobox",
+                                    height=BLOCK_HEIGHT)
+                        mode_model: ui.AbstractItemModel = ui.ComboBox(
+                            ASPECT_MODES.index(get_aspect_controller().mode),
+                            *[mode.capitalize() for mode in ASPECT_MODES],
+                            name="dropdown_menu",
+                            height=10
+                        ).model
+                    ui.Spacer(width=ui.Percent(10))
+
+                resources.add(mode_model.subscribe_item_changed_fn(self._recorded(mode_changed)))
+                self._mode_model = mode_model
+
+                with ui.HStack(height=0):
+                    ui.Label("  All Viewports:                ", height=0, width=0,
+                             tooltip="Apply the aspect ratio to every open viewport")
+                    all_viewports = ui.CheckBox(width=20)
+                    all_viewports.model.set_value(get_aspect_controller().all_viewports)
+                    resources.add(all_viewports.model.subscribe_value_changed_fn(all_viewports_changed))
+
+                with ui.HStack(height=0):
+
+                    ui.Spacer(width=5)
+                    ui.Label("Custom Ratio:              ", height=0, width=0)
+                    ui.Spacer(width=10)
+                    field = ui.FloatField(self._model_ratio_width, height=15, width=35)
+                    ui.Label(":1", height=15, width=15, style={"font_size": 20})
+
+                    with ui.ZStack():
+                        ui.Rectangle(name="combobox2",
+                                    height=BLOCK_HEIGHT)         
+                        ratio_slider = ui.FloatSlider(model=field.model, min=0.5, max=4.5, name="attr_slider",)
+                        # With deferred resolution on, the drag only updates the preview label.
+                        # The whole drag is one undo entry.
+                        ratio_slider.set_mouse_pressed_fn(
+                            lambda x, y, b, m: get_undo_recorder().begin(*self._viewport_apis()))
+                        ratio_slider.set_mouse_released_fn(lambda x, y, b, m: self._end_ratio_edit())
+
+                with ui.HStack(height=0):
+                    ui.Spacer(width=5)
+                    ui.Label("Resolution:", name="range_text", height=0, width=0)
+                    ui.Spacer(width=5)
+                    self._ratio_preview = ui.Label("", name="range_text", height=0)
+
+        def build_lens_frame(resources):
+            with ui.VStack(height=0):
+                profile_frame = resources.add(ui.Frame(height=0))
+                profile_resources = resources.child()
+                profile_frame.set_build_fn(lambda: self._build_profile_combo(profile_resources))
+                resources.add(get_profile_library().subscribe_changed(profile_frame.rebuild))
+                self._lens_sliders = []
+                for param in LENS_PARAMETERS:
+                    with ui.HStack():
+                        ui.Spacer(width=5)
+                        ui.Label(param.label, height=0, width=LABEL_WIDTH, tooltip=param.tooltip)
+                        self._lens_sliders.append(resources.add(SettingSlider(param)))
+                with ui.HStack(height=0):
+                    ui.Spacer(width=5)
+                    ui.Button("Save to Camera", name="tool_button", height=BLOCK_HEIGHT,
+                              tooltip="Store these settings and the aspect ratio on the active camera, "
+                                      "they are applied whenever the viewport switches to it",
+                              clicked_fn=self._save_to_camera)
+                    self._ab_button = ui.Button(f"Look {self._ab.active}", name="tool_button", height=BLOCK_HEIGHT,
+                                                tooltip="Flip between two looks. The first flip copies this "
+                                                        "look to B, later flips keep the edits of each side",
+                                                clicked_fn=self._flip_look)
 
         with ui.ScrollingFrame():        
             with ui.VStack(height=0):
                 with ui.HStack():
                     ui.Spacer(width=55)
-                    ui.Image(str(MY_IMAGE), fill_policy=ui.FillPolicy.PRESERVE_ASPECT_FIT, alignment=ui.Alignment.CENTER, height=45,)
-                collection = ui.RadioCollection()
+                    ui.Image(str(MY_IMAGE), fill_policy=ui.FillPolicy.PRESERVE_ASPECT_FIT,
+                             alignment=ui.Alignment.CENTER, height=45)
+                collection = self._effect_collection = ui.RadioCollection()
+                collection.model.set_value(1 if core.is_enabled() else 0)
                 with ui.HStack(style=style1):
                     ui.Label("Activate:", width=10, style={"font_size":16})
-                    ui.RadioButton(text ="Off", radio_collection=collection, clicked_fn=effect_off, name="Off")
-                    ui.RadioButton(text ="On", radio_collection=collection, clicked_fn=effect_on, name="On")
-                self.aspect_frame = ui.CollapsableFrame("Aspect Ratio".upper(), name="group",
-                                        build_header_fn=self._build_collapsable_header, collapsed=True)                
-                with self.aspect_frame:
-                    with ui.VStack(height=0):
-                        with ui.HStack():
-                            ui.Label("  Aspect Ratio Preset:      ",  height=0, width=0)
-                            with ui.ZStack():
-                                ui.Rectangle(name="combobox",
-                                            height=BLOCK_HEIGHT)
-                                option_list = options
-                                combo_model: ui.AbstractItemModel = ui.ComboBox(
-                                    0, *option_list,
-                                    name="dropdown_menu",
-                                    height=10
-                                ).model
-                            ui.Spacer(width=ui.Percent(10))
-
-                        self.combo_sub = combo_model.subscribe_item_changed_fn(combo_changed)
-                        self._model_ratio_width = ui.SimpleFloatModel()
-                        current_ratio_width = 2.39
-
-                        with ui.HStack(height=0):
-
-                            ui.Spacer(width=5)
-                            ui.Label("Custom Ratio:              ", height=0, width=0)
-                            ui.Spacer(width=10)
-                            field = ui.FloatField(self._model_ratio_width, height=15, width=35)
-                            ui.Label(":1", height=15, width=15, style={"font_size": 20})
-
-                            with ui.ZStack():
-                                ui.Rectangle(name="combobox2",
-                                            height=BLOCK_HEIGHT)         
-                                ui.FloatSlider(model=field.model, min=0.5, max=4.5, name="attr_slider",)
-                    
-                            def update_ratio_width(value):
-                                self.current_ratio_width = value
-                                active_window = ViewportWindow.active_window
-                                viewport_api = active_window.viewport_api
-                                texture_res = viewport_api.get_texture_resolution()
-                                width = texture_res[0]
-                                height = width/self.current_ratio_width
-                                viewport_api.resolution = (width,height)
-
-                            if self._model_ratio_width:
-                                self._slider_subscription_ratio_width = None
-                                self._model_ratio_width.as_float = current_ratio_width
-                                self._slider_subscription_ratio_width = self._model_ratio_width.subscribe_value_changed_fn(
-                                    lambda model: update_ratio_width(model.as_float))
-
-                self.lens_frame = ui.CollapsableFrame("Lens Effects".upper(), name="group",
-                                        build_header_fn=self._build_collapsable_header, collapsed=True)
-                with self.lens_frame:
-                    with ui.VStack(height=0):
-                        with ui.HStack():
-                            ui.Spacer(width=5)
-                            ui.Label("Anamorphic Bokeh", height=0, width=0, tooltip="Controls Aniostropy value in Depth of Field Overrides located in the Post Processing menu")                                                
-                            ui.Spacer(width=8)
-                            AnaBokehSliderWidget()
-
-                        with ui.HStack():
-                            ui.Spacer(width=5)
-                            ui.Label("Lens Flare Intensity", height=0, width=0, tooltip="Controls Sensor Diagonal value in FFT Bloom located in the Post Processing menu")
-                            ui.Spacer(width=4)
-                            LFlareSliderWidget()
-
-                        with ui.HStack():
-                            ui.Spacer(width=5)
-                            ui.Label("Lens Flare Stretch", height=0, width=0, tooltip="Controls Sensor Aspect Ratio value in FFT Bloom located in the Post Processing menu")
-                            ui.Spacer(width=13)
-                            FlareStretchSliderWidget()
-
-                        with ui.HStack():
-                            ui.Spacer(width=5)
-                            ui.Label("Bloom Intensity", height=0, width=0, tooltip="Controls Bloom Intensity value in FFT Bloom located in the Post Processing menu")
-                            ui.Spacer(width=27)
-                            BloomIntensitySliderWidget()
-
-                        with ui.HStack():
-                            ui.Spacer(width=5)
-                            ui.Label("Lens Blades", height=0, width=0, tooltip="Controls Lens Blades value in FFT Bloom located in the Post Processing menu")
-                            ui.Spacer(width=49)
-                            LensBladesSliderWidget()
-
-                        with ui.HStack():
-                            ui.Spacer(width=5)
-                            ui.Label("Blade Rotation", height=0, width=0, tooltip="Controls Aperture Rotation value in FFT Bloom located in the Post Processing menu")
-                            ui.Spacer(width=34)
-                            BladeRotationWidget()
-                                              
\ No newline at end of file
+                    ui.RadioButton(text="Off", radio_collection=collection,
+                                   clicked_fn=self._recorded(self._effect_off), name="Off")
+                    ui.RadioButton(text="On", radio_collection=collection,
+                                   clicked_fn=self._recorded(self._effect_on), name="On")
+                self.aspect_frame = resources.add(ui.CollapsableFrame("Aspect Ratio".upper(), name="group",
+                                        build_header_fn=self._build_collapsable_header, collapsed=True))
+                self._build_on_expand(self.aspect_frame, build_aspect_frame, resources.child())
+                self.lens_frame = resources.add(ui.CollapsableFrame("Lens Effects".upper(), name="group",
+                                        build_header_fn=self._build_collapsable_header, collapsed=True))
+                self._build_on_expand(self.lens_frame, build_lens_frame, resources.child())
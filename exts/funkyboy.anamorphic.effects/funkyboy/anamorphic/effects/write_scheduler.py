@@ -0,0 +1,144 @@
+__all__ = ["COST_CLASSES", "RESOLUTION_KEY", "cost_class", "WriteScheduler"]
+
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+import carb.settings
+
+from .parameters import PARAMETERS_BY_PATH
+
+ENABLED_SETTING = "/exts/funkyboy.anamorphic.effects/scheduler/enabled"
+FRAME_BUDGET_SETTING = "/exts/funkyboy.anamorphic.effects/scheduler/frameBudgetMs"
+COST_SETTING = "/exts/funkyboy.anamorphic.effects/scheduler/costMs/"
+
+# cheap:      a plain value the renderer picks up on the next frame
+# kernel:     rebuilds the lens flare kernel; all kernel writes of a frame share one rebuild
+# resolution: reallocates the render targets of one viewport
+COST_CLASSES = ("cheap", "kernel", "resolution")
+DEFAULT_COSTS = {"cheap": 0.05, "kernel": 6.0, "resolution": 12.0}
+
+# Pending resolutions are keyed (RESOLUTION_KEY, id(viewport_api)) next to settings paths
+RESOLUTION_KEY = "resolution"
+
+
+def cost_class(key: Hashable) -> str:
+    """The cost class of a settings path or resolution key"""
+    if isinstance(key, tuple):
+        return "resolution"
+    param = PARAMETERS_BY_PATH.get(key)
+    return param.cost if param is not None else "cheap"
+
+
+class WriteScheduler:
+    """Decides which pending writes fit into this frame.
+
+    Each write is charged the estimated cost of its class; a frame admits
+    writes until the estimates, or the time actually spent if that is more,
+    reach the frame budget. Cheap writes go first, then the kernel writes,
+    merged into one rebuild, then resizes. The first write of a frame is
+    always admitted, so a single write over budget still makes progress.
+
+    Usage, once per frame:
+
+        scheduler.begin_frame()
+        for key in scheduler.order(pending):
+            if not scheduler.admit(key):
+                break
+            write(key)
+        scheduler.end_frame(pending_left)
+    """
+
+    def __init__(
+        self,
+        budget_ms: Optional[float] = None,
+        costs: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        # None reads the value from the settings at every frame
+        self._budget_ms = budget_ms
+        self._costs = costs
+        self._clock = clock
+        self._frame_budget = 0.0
+        self._frame_costs: Dict[str, float] = {}
+        self._frame_start = 0.0
+        self._spent = 0.0
+        self._frame_writes = 0
+        self._kernel_charged = False
+        self.reset_stats()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """frames: frames that wrote something
+        written: writes per cost class
+        kernel_rebuilds: frames with kernel writes; merged: kernel writes that shared a rebuild
+        carried_over: frames that left writes for later
+        max_frame_ms: the most a frame was charged, estimated or measured
+        """
+        return {
+            "frames": self.frames,
+            "written": dict(self.written),
+            "kernel_rebuilds": self.kernel_rebuilds,
+            "merged": self.merged,
+            "carried_over": self.carried_over,
+            "max_frame_ms": self.max_frame_ms,
+        }
+
+    def reset_stats(self):
+        self.frames = 0
+        self.written = {cost: 0 for cost in COST_CLASSES}
+        self.kernel_rebuilds = 0
+        self.merged = 0
+        self.carried_over = 0
+        self.max_frame_ms = 0.0
+
+    def order(self, keys: Iterable[Hashable]) -> List[Hashable]:
+        """keys, cheap ones first, keeping their order within a class"""
+        return sorted(keys, key=lambda key: COST_CLASSES.index(cost_class(key)))
+
+    def begin_frame(self):
+        settings = carb.settings.get_settings()
+        if self._budget_ms is not None:
+            self._frame_budget = self._budget_ms
+        else:
+            self._frame_budget = settings.get_as_float(FRAME_BUDGET_SETTING)
+        if self._costs is not None:
+            self._frame_costs = self._costs
+        else:
+            self._frame_costs = {}
+            for cost, default in DEFAULT_COSTS.items():
+                value = settings.get(COST_SETTING + cost)
+                self._frame_costs[cost] = float(value) if value is not None else default
+        self._frame_start = self._clock()
+        self._spent = 0.0
+        self._frame_writes = 0
+        self._kernel_charged = False
+
+    def admit(self, key: Hashable) -> bool:
+        """Charge the write of key to this frame; False if it has to wait for the next one."""
+        cost = cost_class(key)
+        spent = max(self._spent, (self._clock() - self._frame_start) * 1000.0)
+        if cost == "kernel" and self._kernel_charged:
+            # Rides along with the rebuild already paid for
+            self.merged += 1
+        else:
+            charge = self._frame_costs.get(cost, 0.0)
+            if self._frame_writes and spent + charge > self._frame_budget:
+                return False
+            if cost == "kernel":
+                self._kernel_charged = True
+                self.kernel_rebuilds += 1
+            spent += charge
+        self._spent = spent
+        self._frame_writes += 1
+        self.written[cost] += 1
+        return True
+
+    def end_frame(self, pending: int = 0):
+        """Close the frame; pending is how many writes are left for later frames."""
+        if not self._frame_writes:
+            return
+        self.frames += 1
+        if pending:
+            self.carried_over += 1
+        spent = max(self._spent, (self._clock() - self._frame_start) * 1000.0)
+        self.max_frame_ms = max(self.max_frame_ms, spent)